@@ -16,7 +16,7 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'created_at')
     search_fields = ('name', 'description')
     prepopulated_fields = {'slug': ('name',)}
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('posts_count', 'created_at', 'updated_at')
 
     def color_display(self, obj):
         """Display color as a colored box."""
@@ -26,11 +26,6 @@ class CategoryAdmin(admin.ModelAdmin):
         )
     color_display.short_description = 'Color'
 
-    def posts_count(self, obj):
-        """Display the number of posts in this category."""
-        return obj.posts.filter(status='published', is_deleted=False).count()
-    posts_count.short_description = 'Posts Count'
-
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
@@ -40,12 +35,7 @@ class TagAdmin(admin.ModelAdmin):
     list_display = ('name', 'slug', 'posts_count', 'created_at')
     search_fields = ('name',)
     prepopulated_fields = {'slug': ('name',)}
-    readonly_fields = ('created_at', 'updated_at')
-
-    def posts_count(self, obj):
-        """Display the number of posts with this tag."""
-        return obj.posts.filter(status='published', is_deleted=False).count()
-    posts_count.short_description = 'Posts Count'
+    readonly_fields = ('posts_count', 'created_at', 'updated_at')
 
 
 @admin.register(BlogPost)
@@ -55,7 +45,7 @@ class BlogPostAdmin(admin.ModelAdmin):
     """
     list_display = (
         'title', 'author', 'category', 'status', 'is_featured',
-        'views_count', 'likes_count', 'published_at'
+        'views_count', 'unique_views_count', 'likes_count', 'comments_count', 'published_at'
     )
     list_filter = (
         'status', 'is_featured', 'category', 'created_at',
@@ -64,7 +54,9 @@ class BlogPostAdmin(admin.ModelAdmin):
     search_fields = ('title', 'excerpt', 'content')
     prepopulated_fields = {'slug': ('title',)}
     filter_horizontal = ('tags',)
-    readonly_fields = ('views_count', 'likes_count', 'created_at', 'updated_at')
+    readonly_fields = (
+        'views_count', 'unique_views_count', 'likes_count', 'comments_count', 'created_at', 'updated_at'
+    )
     
     fieldsets = (
         ('Basic Information', {
@@ -80,7 +72,7 @@ class BlogPostAdmin(admin.ModelAdmin):
             'fields': ('read_time', 'meta_title', 'meta_description')
         }),
         ('Statistics', {
-            'fields': ('views_count', 'likes_count'),
+            'fields': ('views_count', 'unique_views_count', 'likes_count', 'comments_count'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -9,6 +9,8 @@ app_name = 'blog_admin'
 urlpatterns = [
     # Dashboard
     path('dashboard/stats/', admin_views.dashboard_stats, name='dashboard-stats'),
+    path('dashboard/buffers/', admin_views.buffer_stats, name='dashboard-buffers'),
+    path('dashboard/unique-views/', admin_views.unique_view_stats, name='dashboard-unique-views'),
 
     # Blog Management
     path('blog/posts/', admin_views.AdminBlogPostListView.as_view(), name='admin-blog-list'),
@@ -6,15 +6,20 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
+from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.utils import timezone
-from .models import BlogPost, Category, Tag
+from datetime import timedelta
+from .models import BlogPost, BlogPostDailyViews, Category, Tag
 from reviews.models import Review
 from enquiries.models import Enquiry
 from offers.models import Offer
+from apps.common.buffers import all_buffers
+from .dashboard import MAX_DASHBOARD_DAYS, dashboard_days_default, get_dashboard_stats
+from .visitors import daily_unique_views, unique_visitor_periods
 from .serializers import (
     BlogPostDetailSerializer,
     BlogPostCreateSerializer,
@@ -39,23 +44,56 @@ class IsAdminUser(permissions.BasePermission):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def dashboard_stats(request):
-    """Get dashboard statistics."""
+    """Get dashboard statistics; "recent" counts cover the last `?days=` days (default 30)."""
+    days = request.GET.get('days', dashboard_days_default())
+    try:
+        days = int(days)
+    except (TypeError, ValueError):
+        days = 0
+    if not 1 <= days <= MAX_DASHBOARD_DAYS:
+        return Response(
+            {'error': f'days must be an integer between 1 and {MAX_DASHBOARD_DAYS}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(get_dashboard_stats(days))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def buffer_stats(request):
+    """Get depth and flush latency of this worker's write-behind buffers."""
+    return Response({'buffers': [buffer.metrics() for buffer in all_buffers()]})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def unique_view_stats(request):
+    """Get daily-unique post views and top posts; `?post=<id>` adds that post's distinct visitors."""
+    today = timezone.localdate()
+    month_start = today - timedelta(days=29)
+    top_posts = BlogPostDailyViews.objects.filter(day__gte=month_start).values(
+        'post_id', 'post__title', 'post__slug'
+    ).annotate(unique_views=Sum('unique_views')).order_by('-unique_views')[:10]
     stats = {
-        'total_users': User.objects.count(),
-        'total_posts': BlogPost.objects.filter(is_deleted=False).count(),
-        'total_enquiries': Enquiry.objects.filter(is_deleted=False).count(),
-        'total_reviews': Review.objects.filter(is_deleted=False).count(),
-        'total_offers': Offer.objects.filter(is_deleted=False).count(),
-        'recent_users': User.objects.filter(date_joined__gte='2024-01-01').count(),
-        'recent_posts': BlogPost.objects.filter(
-            created_at__gte='2024-01-01',
-            is_deleted=False
-        ).count(),
-        'recent_enquiries': Enquiry.objects.filter(
-            created_at__gte='2024-01-01',
-            is_deleted=False
-        ).count(),
+        'unique_views': {
+            'today': daily_unique_views(today, today),
+            'last_7_days': daily_unique_views(today - timedelta(days=6), today),
+            'last_30_days': daily_unique_views(month_start, today),
+        },
+        'top_posts': [
+            {
+                'id': row['post_id'],
+                'title': row['post__title'],
+                'slug': row['post__slug'],
+                'unique_views': row['unique_views'],
+            }
+            for row in top_posts
+        ],
     }
+    post_id = request.GET.get('post')
+    if post_id:
+        post = get_object_or_404(BlogPost, pk=post_id)
+        stats['post'] = {'id': post.pk, 'title': post.title, **unique_visitor_periods(post.pk, today)}
     return Response(stats)
 
 
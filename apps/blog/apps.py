@@ -7,4 +7,8 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     """Configuration for the blog app."""
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.blog'
\ No newline at end of file
+    name = 'apps.blog'
+
+    def ready(self):
+        """Register signal handlers."""
+        from . import signals  # noqa: F401
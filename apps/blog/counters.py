@@ -0,0 +1,127 @@
+"""
+Denormalized counters for the blog app.
+"""
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from apps.common.cache import model_label, touch
+from .models import BlogLike, BlogPost, Category, Comment, Tag
+
+# Posts updated per UPDATE ... CASE statement when applying buffered deltas
+DELTA_CHUNK_SIZE = 500
+
+
+def _count_subquery(queryset, group_by):
+    """Wrap a correlated queryset as a scalar COUNT that defaults to 0."""
+    counts = queryset.order_by().values(group_by).annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def comments_count_expression():
+    """Approved, non-deleted comments of the outer post as a scalar subquery."""
+    return _count_subquery(
+        Comment.objects.filter(post=OuterRef('pk'), is_approved=True, is_deleted=False),
+        'post'
+    )
+
+
+def likes_count_expression():
+    """Likes of the outer post as a scalar subquery."""
+    return _count_subquery(BlogLike.objects.filter(post=OuterRef('pk')), 'post')
+
+
+def category_posts_count_expression():
+    """Published, non-deleted posts of the outer category as a scalar subquery."""
+    return _count_subquery(
+        BlogPost.objects.filter(category=OuterRef('pk'), status='published', is_deleted=False),
+        'category'
+    )
+
+
+def tag_posts_count_expression():
+    """Published, non-deleted posts of the outer tag as a scalar subquery."""
+    return _count_subquery(
+        BlogPost.objects.filter(tags=OuterRef('pk'), status='published', is_deleted=False),
+        'tags'
+    )
+
+
+def _refresh(model, pks, **expressions):
+    """Recompute counters for the given rows in a single UPDATE."""
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return 0
+    return model.objects.filter(pk__in=pks).update(**expressions)
+
+
+def refresh_comments_count(post_ids):
+    """Recompute comments_count for the given posts."""
+    return _refresh(BlogPost, post_ids, comments_count=comments_count_expression())
+
+
+def refresh_category_posts_count(category_ids):
+    """Recompute posts_count for the given categories."""
+    return _refresh(Category, category_ids, posts_count=category_posts_count_expression())
+
+
+def refresh_tag_posts_count(tag_ids):
+    """Recompute posts_count for the given tags."""
+    return _refresh(Tag, tag_ids, posts_count=tag_posts_count_expression())
+
+
+def refresh_likes_count(post_ids):
+    """Recompute likes_count for the given posts."""
+    return _refresh(BlogPost, post_ids, likes_count=likes_count_expression())
+
+
+def apply_count_deltas(field, deltas):
+    """
+    Add a {post_id: delta} batch to a BlogPost counter in chunked
+    `UPDATE ... SET field = MAX(field + CASE ... END, 0)` statements.
+    """
+    items = sorted((pk, delta) for pk, delta in deltas.items() if delta)
+    for start in range(0, len(items), DELTA_CHUNK_SIZE):
+        chunk = items[start:start + DELTA_CHUNK_SIZE]
+        delta = Case(
+            *[When(pk=post_id, then=Value(amount)) for post_id, amount in chunk],
+            default=Value(0),
+            output_field=IntegerField()
+        )
+        BlogPost.objects.filter(pk__in=[post_id for post_id, _ in chunk]).update(
+            **{field: Greatest(F(field) + delta, Value(0))}
+        )
+
+
+def reconcile_likes_counts(post_ids=None):
+    """
+    Recompute likes_count from blog_likes wherever it has drifted, moving
+    the BlogPost change stamp if any post changed. Returns the number of
+    posts corrected.
+    """
+    posts = BlogPost.objects.all()
+    if post_ids is not None:
+        posts = posts.filter(pk__in=post_ids)
+    drifted = list(
+        posts.annotate(actual_likes=likes_count_expression())
+        .exclude(likes_count=F('actual_likes'))
+        .values_list('pk', flat=True)
+    )
+    for start in range(0, len(drifted), DELTA_CHUNK_SIZE):
+        refresh_likes_count(drifted[start:start + DELTA_CHUNK_SIZE])
+    if drifted:
+        touch(model_label(BlogPost))
+    return len(drifted)
+
+
+def rebuild_comments_counts():
+    """Recompute comments_count for every post in a single UPDATE."""
+    return BlogPost.objects.update(comments_count=comments_count_expression())
+
+
+def rebuild_category_posts_counts():
+    """Recompute posts_count for every category in a single UPDATE."""
+    return Category.objects.update(posts_count=category_posts_count_expression())
+
+
+def rebuild_tag_posts_counts():
+    """Recompute posts_count for every tag in a single UPDATE."""
+    return Tag.objects.update(posts_count=tag_posts_count_expression())
@@ -0,0 +1,70 @@
+"""
+Cached admin dashboard counts.
+"""
+import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
+from django.utils import timezone
+from apps.common.cache import get_or_fill, model_label, versioned_key
+from enquiries.models import Enquiry
+from offers.models import Offer
+from reviews.models import Review
+from .models import BlogPost
+
+DASHBOARD_STATS_KEY = 'blog:dashboard-stats:{}'
+
+# Longest ?days= window accepted
+MAX_DASHBOARD_DAYS = 3650
+
+
+def dashboard_days_default():
+    return getattr(settings, 'DASHBOARD_RECENT_DAYS', 30)
+
+
+def dashboard_cache_timeout():
+    return getattr(settings, 'DASHBOARD_STATS_CACHE_TIMEOUT', 60)
+
+
+def _counts(queryset, created_field, since):
+    """(total, created since `since`) in one conditional-aggregate query."""
+    counts = queryset.order_by().aggregate(
+        total=Count('pk'),
+        recent=Count('pk', filter=Q(**{f'{created_field}__gte': since})),
+    )
+    return counts['total'], counts['recent']
+
+
+def compute_dashboard_stats(days):
+    """Totals and counts created in the last `days` days, one query per table."""
+    since = timezone.now() - datetime.timedelta(days=days)
+    total_users, recent_users = _counts(get_user_model().objects.all(), 'date_joined', since)
+    total_posts, recent_posts = _counts(BlogPost.objects.filter(is_deleted=False), 'created_at', since)
+    total_enquiries, recent_enquiries = _counts(Enquiry.objects.all(), 'created_at', since)
+    total_reviews, recent_reviews = _counts(Review.objects.all(), 'created_at', since)
+    total_offers, recent_offers = _counts(Offer.objects.all(), 'created_at', since)
+    return {
+        'days': days,
+        'total_users': total_users,
+        'total_posts': total_posts,
+        'total_enquiries': total_enquiries,
+        'total_reviews': total_reviews,
+        'total_offers': total_offers,
+        'recent_users': recent_users,
+        'recent_posts': recent_posts,
+        'recent_enquiries': recent_enquiries,
+        'recent_reviews': recent_reviews,
+        'recent_offers': recent_offers,
+    }
+
+
+def get_dashboard_stats(days):
+    """
+    The dashboard counts for a window, cached briefly per window. The key is
+    versioned on the counted models' change stamps, so any write to them
+    starts a fresh entry.
+    """
+    labels = [model_label(model) for model in (get_user_model(), BlogPost, Enquiry, Review, Offer)]
+    key = versioned_key(DASHBOARD_STATS_KEY.format(days), labels)
+    return get_or_fill(key, lambda: compute_dashboard_stats(days), dashboard_cache_timeout())
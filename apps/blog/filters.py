@@ -2,7 +2,9 @@
 Filters for the blog app.
 """
 import django_filters
+from rest_framework import filters
 from .models import BlogPost, Category, Tag
+from .search import get_search_backend
 
 
 class BlogPostFilter(django_filters.FilterSet):
@@ -23,4 +25,39 @@ class BlogPostFilter(django_filters.FilterSet):
 
     class Meta:
         model = BlogPost
-        fields = ['category', 'tags', 'is_featured', 'author']
\ No newline at end of file
+        fields = ['category', 'tags', 'is_featured', 'author']
+
+
+class BlogPostSearchFilter(filters.SearchFilter):
+    """
+    Full-text search over title, excerpt and content.
+
+    Uses the database's search index when there is one and annotates each
+    match with `search_rank`; otherwise falls back to `search_fields` icontains.
+    """
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        backend = get_search_backend()
+        if not terms or backend is None:
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, terms)
+
+
+class BlogPostOrderingFilter(filters.OrderingFilter):
+    """
+    Ordering filter that sorts search results by relevance with `?rank=1`.
+
+    An explicit `?ordering=` still takes precedence.
+    """
+    rank_param = 'rank'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        wants_rank = request.query_params.get(self.rank_param) in ('1', 'true')
+        if (
+            wants_rank
+            and 'search_rank' in queryset.query.annotations
+            and self.ordering_param not in request.query_params
+        ):
+            return ['-search_rank'] + list(ordering or [])
+        return ordering
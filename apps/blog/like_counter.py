@@ -0,0 +1,36 @@
+"""
+Write-behind buffer for blog post like counts.
+"""
+from apps.common.buffers import BufferedCounter
+from apps.common.cache import model_label, touch
+from .counters import apply_count_deltas
+from .models import BlogPost
+
+
+class LikeCountBuffer(BufferedCounter):
+    """
+    Collects net like/unlike deltas in process and applies them to likes_count
+    in batched UPDATEs, so likers of a hot post no longer queue on its row
+    lock. `blog_likes` stays the source of truth; `reconcile_blog_likes`
+    repairs any drift (e.g. deltas lost when a worker is killed).
+
+    The UPDATEs send no signals, so every written batch moves the BlogPost
+    change stamp itself (at most once per flush) to expire cached responses
+    and validators that render likes_count.
+    """
+    name = 'blog-likes'
+    max_size_setting = 'BLOG_LIKE_BUFFER_MAX_SIZE'
+    flush_interval_setting = 'BLOG_LIKE_BUFFER_FLUSH_INTERVAL'
+    default_flush_interval = 5
+
+    def write(self, batch):
+        apply_count_deltas('likes_count', batch)
+        touch(model_label(BlogPost))
+
+
+like_count_buffer = LikeCountBuffer()
+
+
+def record_like(post_id, delta):
+    """Queue a +1 (like) or -1 (unlike) for the post's likes_count."""
+    like_count_buffer.add(post_id, delta)
@@ -0,0 +1,19 @@
+"""
+Delete daily blog view buckets older than the retention period.
+"""
+from django.core.management.base import BaseCommand
+from apps.blog.trending import prune_view_buckets, view_bucket_retention_days
+
+
+class Command(BaseCommand):
+    help = 'Delete daily blog view buckets older than BLOG_VIEW_BUCKET_RETENTION_DAYS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help=f'Keep this many days of buckets (default: {view_bucket_retention_days()}).'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_view_buckets(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} view buckets.'))
@@ -0,0 +1,26 @@
+"""
+Recompute the denormalized blog counters from their source tables.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.common.cache import model_label, touch
+from apps.blog.counters import (
+    rebuild_comments_counts,
+    rebuild_category_posts_counts,
+    rebuild_tag_posts_counts,
+)
+from apps.blog.models import BlogPost, Category, Tag
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized blog counters to repair drift.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            posts = rebuild_comments_counts()
+            categories = rebuild_category_posts_counts()
+            tags = rebuild_tag_posts_counts()
+        # The UPDATEs send no signals: expire responses rendering the counters
+        touch(model_label(BlogPost), model_label(Category), model_label(Tag))
+        self.stdout.write(self.style.SUCCESS(f'Recomputed comments_count for {posts} posts.'))
+        self.stdout.write(self.style.SUCCESS(f'Recomputed posts_count for {categories} categories and {tags} tags.'))
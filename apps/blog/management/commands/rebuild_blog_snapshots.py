@@ -0,0 +1,23 @@
+"""
+Re-render the pre-rendered JSON snapshots of published blog posts.
+"""
+from django.core.management.base import BaseCommand
+from apps.blog.snapshots import SNAPSHOT_BATCH_SIZE, rebuild_all_snapshots, rebuild_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Re-render blog post snapshots for every published post (or the given post ids).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('post_ids', nargs='*', type=int, help='Only rebuild these posts.')
+        parser.add_argument(
+            '--batch-size', type=int, default=SNAPSHOT_BATCH_SIZE,
+            help='Posts rendered per batch.'
+        )
+
+    def handle(self, *args, **options):
+        if options['post_ids']:
+            posts = rebuild_snapshots(options['post_ids'])
+        else:
+            posts = rebuild_all_snapshots(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt snapshots for {posts} posts.'))
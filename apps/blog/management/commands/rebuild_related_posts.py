@@ -0,0 +1,19 @@
+"""
+Rebuild the precomputed related-posts index.
+"""
+from django.core.management.base import BaseCommand
+from apps.blog.related import rebuild_all_related_posts, rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = 'Recompute related-post rankings for every published post (or the given post ids).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('post_ids', nargs='*', type=int, help='Only rebuild these posts.')
+
+    def handle(self, *args, **options):
+        if options['post_ids']:
+            posts = rebuild_related_posts(options['post_ids'])
+        else:
+            posts = rebuild_all_related_posts()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt related posts for {posts} posts.'))
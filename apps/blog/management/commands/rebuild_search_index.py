@@ -0,0 +1,19 @@
+"""
+Rebuild the blog full-text search index from the posts table.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the blog post full-text search index.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            self.stdout.write(self.style.WARNING('No full-text index on this database; search uses icontains.'))
+            return
+        with transaction.atomic():
+            posts = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Reindexed {posts} posts.'))
@@ -0,0 +1,18 @@
+"""
+Recompute blog post like counts from the blog_likes table.
+"""
+from django.core.management.base import BaseCommand
+from apps.blog.counters import reconcile_likes_counts
+from apps.blog.like_counter import like_count_buffer
+
+
+class Command(BaseCommand):
+    help = 'Recompute likes_count from blog_likes for every post (or the given post ids) to repair drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('post_ids', nargs='*', type=int, help='Only reconcile these posts.')
+
+    def handle(self, *args, **options):
+        like_count_buffer.flush()
+        posts = reconcile_likes_counts(options['post_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Corrected likes_count for {posts} posts.'))
@@ -0,0 +1,22 @@
+"""
+Recompute the materialized blog post lists (featured, latest) in the cache.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.blog.materialized import MATERIALIZED_LISTS, refresh_lists
+
+
+class Command(BaseCommand):
+    help = 'Recompute the cached featured/latest blog post lists (or only the named ones).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names', nargs='*', help=f'Only recompute these lists ({", ".join(MATERIALIZED_LISTS)}).'
+        )
+
+    def handle(self, *args, **options):
+        names = options['names'] or list(MATERIALIZED_LISTS)
+        unknown = set(names) - set(MATERIALIZED_LISTS)
+        if unknown:
+            raise CommandError(f'Unknown blog lists: {", ".join(sorted(unknown))}')
+        refresh_lists(names)
+        self.stdout.write(self.style.SUCCESS(f'Recomputed blog lists: {", ".join(names)}.'))
@@ -0,0 +1,107 @@
+"""
+Materialized post lists (featured, latest).
+
+Each list is kept in the cache as its ordered post ids plus their list-card
+representations. Lists are recomputed after commit when a post enters or
+leaves them (a change of `is_featured`, `status`, `published_at` or
+`is_deleted`), and cards are refreshed when a listed post, or the category,
+tags or author it embeds, changes. Counters and the requester's liked state
+are overlaid when serving, like snapshots.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from apps.common.cache import get_or_fill, refill
+from apps.common.projection import project_queryset
+from .models import BlogPost
+from .serializers import BlogPostListSerializer
+from .snapshots import VOLATILE_FIELDS, render_card
+
+LIST_KEY = 'blog:list:{}'
+
+# Post fields deciding which posts a materialized list holds
+MEMBERSHIP_FIELDS = ('is_featured', 'status', 'published_at', 'is_deleted')
+
+# name -> (filter on published posts, ordering)
+MATERIALIZED_LISTS = {
+    'featured': (Q(is_featured=True), ('-created_at',)),
+    'latest': (Q(), ('-published_at', '-pk')),
+}
+
+DEFAULT_LIST_LIMITS = {'featured': 6, 'latest': 6}
+
+
+def list_limit(name):
+    return getattr(settings, 'BLOG_LIST_LIMITS', {}).get(name, DEFAULT_LIST_LIMITS[name])
+
+
+def list_cache_timeout():
+    return getattr(settings, 'BLOG_LIST_CACHE_TIMEOUT', 3600)
+
+
+def list_queryset(name):
+    """The posts of a materialized list, queried in full."""
+    condition, ordering = MATERIALIZED_LISTS[name]
+    return BlogPost.objects.filter(
+        condition, status='published', is_deleted=False
+    ).select_related('author', 'category').prefetch_related('tags').order_by(*ordering)
+
+
+def compute_list(name):
+    """Return {'ids': [...], 'cards': {id: card}} for a materialized list."""
+    queryset = project_queryset(list_queryset(name), BlogPostListSerializer())
+    posts = list(queryset[:list_limit(name)])
+    return {
+        'ids': [post.pk for post in posts],
+        'cards': {post.pk: render_card(post) for post in posts},
+    }
+
+
+def get_list(name):
+    """The materialized list, computed at most once at a time on a miss."""
+    return get_or_fill(LIST_KEY.format(name), lambda: compute_list(name), list_cache_timeout())
+
+
+def refresh_lists(names=None):
+    """Recompute the given (default: all) materialized lists and store them."""
+    for name in names or MATERIALIZED_LISTS:
+        refill(LIST_KEY.format(name), lambda: compute_list(name), list_cache_timeout())
+
+
+def schedule_list_refresh(post_ids=None):
+    """
+    Refresh the materialized lists once the current transaction commits:
+    all of them if `post_ids` is None (membership may have changed), else
+    only the lists currently holding one of those posts.
+    """
+    if post_ids is not None:
+        post_ids = set(post_ids)
+        if not post_ids:
+            return
+
+    def refresh():
+        if post_ids is None:
+            names = list(MATERIALIZED_LISTS)
+        else:
+            names = [name for name in MATERIALIZED_LISTS if post_ids.intersection(get_list(name)['ids'])]
+        if names:
+            refresh_lists(names)
+
+    transaction.on_commit(refresh)
+
+
+def warm_lists():
+    """Fill any missing materialized list; used at worker boot and by warm_blog_lists."""
+    for name in MATERIALIZED_LISTS:
+        get_list(name)
+
+
+def live_rows(post_ids):
+    """{id: live values} for the given posts, for snapshots.overlay()."""
+    rows = BlogPost.objects.filter(pk__in=post_ids).values_list(
+        'id', *VOLATILE_FIELDS, 'category__posts_count'
+    )
+    return {
+        row[0]: dict(zip(VOLATILE_FIELDS + ('category_posts_count',), row[1:]))
+        for row in rows
+    }
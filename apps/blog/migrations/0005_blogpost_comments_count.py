@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:11
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    Comment = apps.get_model('blog', 'Comment')
+    comments = Comment.objects.filter(
+        post=OuterRef('pk'),
+        is_approved=True,
+        is_deleted=False
+    ).order_by().values('post').annotate(total=Count('id')).values('total')
+    BlogPost.objects.update(
+        comments_count=Coalesce(Subquery(comments, output_field=IntegerField()), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_delete_enquiry_delete_offer_delete_review'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, help_text='Approved, non-deleted comments (maintained by signals)'),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:12
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_posts_count(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    Category = apps.get_model('blog', 'Category')
+    Tag = apps.get_model('blog', 'Tag')
+    published = BlogPost.objects.filter(status='published', is_deleted=False).order_by()
+    for model, lookup in ((Category, 'category'), (Tag, 'tags')):
+        counts = published.filter(**{lookup: OuterRef('pk')}).values(lookup).annotate(
+            total=Count('id')
+        ).values('total')
+        model.objects.update(
+            posts_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blogpost_comments_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, help_text='Published, non-deleted posts (maintained by signals)'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, help_text='Published, non-deleted posts (maintained by signals)'),
+        ),
+        migrations.RunPython(backfill_posts_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:32
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION blog_posts_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.excerpt, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.content, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER blog_posts_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, excerpt, content ON blog_posts
+    FOR EACH ROW EXECUTE FUNCTION blog_posts_search_vector_update()
+    """,
+    # Fire the trigger once for existing rows
+    'UPDATE blog_posts SET title = title',
+    'CREATE INDEX blog_posts_search_vector_gin ON blog_posts USING GIN (search_vector)',
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS blog_posts_search_vector_gin',
+    'DROP TRIGGER IF EXISTS blog_posts_search_vector_trigger ON blog_posts',
+    'DROP FUNCTION IF EXISTS blog_posts_search_vector_update()',
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE blog_posts_fts USING fts5(
+        title, excerpt, content, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    INSERT INTO blog_posts_fts (rowid, title, excerpt, content)
+    SELECT id, title, excerpt, content FROM blog_posts
+    """,
+]
+
+SQLITE_REVERSE = [
+    'DROP TABLE IF EXISTS blog_posts_fts',
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+    elif vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # No FTS5: search keeps using icontains
+                return
+        _run(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_REVERSE)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_category_tag_posts_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_threads(apps, schema_editor):
+    Comment = apps.get_model('blog', 'Comment')
+    parents = dict(Comment.objects.values_list('id', 'parent_id'))
+    comments = []
+    for comment in Comment.objects.only('id', 'parent_id'):
+        depth, root_id, parent_id = 0, None, comment.parent_id
+        while parent_id is not None:
+            depth += 1
+            root_id = parent_id
+            parent_id = parents.get(parent_id)
+        comment.root_id = root_id
+        comment.depth = depth
+        comments.append(comment)
+    Comment.objects.bulk_update(comments, ['root', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_relatedpost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='root',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_comments', to='blog.comment'),
+        ),
+        migrations.RunPython(backfill_threads, migrations.RunPython.noop),
+    ]
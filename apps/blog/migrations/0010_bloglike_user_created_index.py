@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_comment_thread'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bloglike',
+            index=models.Index(fields=['user', '-created_at'], name='blog_likes_user_id_a33470_idx'),
+        ),
+    ]
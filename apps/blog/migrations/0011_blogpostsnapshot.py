@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_bloglike_user_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPostSnapshot',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='blog.blogpost')),
+                ('card', models.JSONField()),
+                ('detail', models.JSONField()),
+                ('source_updated_at', models.DateTimeField(help_text="The post's updated_at when rendered")),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Blog Post Snapshot',
+                'verbose_name_plural': 'Blog Post Snapshots',
+                'db_table': 'blog_post_snapshots',
+            },
+        ),
+    ]
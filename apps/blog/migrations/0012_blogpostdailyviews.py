@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_blogpostsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPostDailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='blog.blogpost')),
+            ],
+            options={
+                'verbose_name': 'Blog Post Daily Views',
+                'verbose_name_plural': 'Blog Post Daily Views',
+                'db_table': 'blog_post_daily_views',
+                'indexes': [models.Index(fields=['day'], name='blog_post_d_day_8c3e22_idx')],
+                'unique_together': {('post', 'day')},
+            },
+        ),
+    ]
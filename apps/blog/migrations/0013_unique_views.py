@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_blogpostdailyviews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='unique_views_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='blogpostdailyviews',
+            name='unique_views',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='blogpostdailyviews',
+            name='visitors',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
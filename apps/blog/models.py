@@ -1,10 +1,11 @@
 """
 Blog models for the Pestozap application.
 """
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
-from apps.common.models import BaseModel
+from apps.common.models import BaseModel, TrackedFieldsModel
 
 User = get_user_model()
 
@@ -19,6 +20,10 @@ class Category(BaseModel):
     color = models.CharField(max_length=7, default='#cc1f4a')  # Hex color
     icon = models.CharField(max_length=50, blank=True)  # Material icon name
     is_active = models.BooleanField(default=True)
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Published, non-deleted posts (maintained by signals)"
+    )
 
     class Meta:
         db_table = 'blog_categories'
@@ -42,6 +47,10 @@ class Tag(BaseModel):
     """
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True, blank=True)
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Published, non-deleted posts (maintained by signals)"
+    )
     
     class Meta:
         db_table = 'blog_tags'
@@ -59,7 +68,7 @@ class Tag(BaseModel):
         super().save(*args, **kwargs)
 
 
-class BlogPost(BaseModel):
+class BlogPost(TrackedFieldsModel, BaseModel):
     """
     Blog post model.
     """
@@ -102,7 +111,13 @@ class BlogPost(BaseModel):
         help_text="Estimated read time in minutes"
     )
     views_count = models.PositiveIntegerField(default=0)
+    # Sum of each day's distinct visitors (estimated, see visitors.py)
+    unique_views_count = models.PositiveIntegerField(default=0)
     likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Approved, non-deleted comments (maintained by signals)"
+    )
     
     # SEO fields
     meta_title = models.CharField(max_length=60, blank=True)
@@ -111,6 +126,13 @@ class BlogPost(BaseModel):
     # Publishing
     published_at = models.DateTimeField(null=True, blank=True)
 
+    # Full-text search (PostgreSQL only; maintained by a trigger, see search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Fields whose changes affect the category/tag post counters and the
+    # slug resolver
+    tracked_fields = ('category_id', 'status', 'is_deleted', 'slug', 'is_featured', 'published_at')
+
     class Meta:
         db_table = 'blog_posts'
         verbose_name = 'Blog Post'
@@ -136,7 +158,8 @@ class BlogPost(BaseModel):
         if not self.meta_description:
             self.meta_description = self.excerpt[:160]
             
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     @property
     def is_published(self):
@@ -166,6 +189,17 @@ class Comment(BaseModel):
         blank=True,
         related_name='replies'
     )
+    # Top-level comment of the thread (null for top-level comments) and
+    # nesting level, so a whole thread loads with one indexed query
+    root = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='thread_comments'
+    )
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     is_approved = models.BooleanField(default=True)
 
     class Meta:
@@ -177,6 +211,17 @@ class Comment(BaseModel):
     def __str__(self):
         return f"Comment by {self.author.full_name} on {self.post.title}"
 
+    def save(self, *args, **kwargs):
+        """Derive thread fields and save in the same transaction as the counter update."""
+        if self.parent_id:
+            self.root_id = self.parent.root_id or self.parent_id
+            self.depth = self.parent.depth + 1
+        else:
+            self.root_id = None
+            self.depth = 0
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class BlogLike(models.Model):
     """
@@ -197,6 +242,9 @@ class BlogLike(models.Model):
     class Meta:
         db_table = 'blog_likes'
         unique_together = ['post', 'user']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
         verbose_name = 'Blog Like'
         verbose_name_plural = 'Blog Likes'
 
@@ -204,3 +252,83 @@ class BlogLike(models.Model):
         return f"{self.user.full_name} likes {self.post.title}"
 
 
+class RelatedPost(models.Model):
+    """
+    Precomputed "related posts" entry, scored by shared tags, category and recency.
+    """
+    post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_entries'
+    )
+    related = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_to_entries'
+    )
+    score = models.FloatField()
+
+    class Meta:
+        db_table = 'blog_related_posts'
+        unique_together = ['post', 'related']
+        verbose_name = 'Related Post'
+        verbose_name_plural = 'Related Posts'
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['post', '-score']),
+        ]
+
+    def __str__(self):
+        return f"{self.related_id} related to {self.post_id} ({self.score:.3f})"
+
+
+class BlogPostSnapshot(models.Model):
+    """
+    Pre-rendered list-card and detail JSON of a published post.
+    """
+    post = models.OneToOneField(
+        BlogPost,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snapshot'
+    )
+    card = models.JSONField()
+    detail = models.JSONField()
+    source_updated_at = models.DateTimeField(help_text="The post's updated_at when rendered")
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'blog_post_snapshots'
+        verbose_name = 'Blog Post Snapshot'
+        verbose_name_plural = 'Blog Post Snapshots'
+
+    def __str__(self):
+        return f"Snapshot of {self.post_id}"
+
+
+class BlogPostDailyViews(models.Model):
+    """
+    Views of a post on one day, written in batches by the view counter buffer.
+    """
+    post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='daily_views'
+    )
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    # HyperLogLog sketch of the day's visitors and its estimate
+    visitors = models.BinaryField(null=True, blank=True, editable=False)
+    unique_views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'blog_post_daily_views'
+        unique_together = ['post', 'day']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+        verbose_name = 'Blog Post Daily Views'
+        verbose_name_plural = 'Blog Post Daily Views'
+
+    def __str__(self):
+        return f"{self.views} views of {self.post_id} on {self.day}"
@@ -0,0 +1,129 @@
+"""
+Pagination for the blog app.
+"""
+import base64
+import binascii
+import json
+
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class BlogPostPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    `?pagination=cursor` (or any `?cursor=`) switches to keyset pagination on
+    `(published_at, id)`, newest first. Keyset pages run no COUNT(*) and no
+    OFFSET scan, and their opaque cursors stay stable when new posts are
+    published. Cursor mode always uses that ordering and ignores `?ordering=`.
+    Page-number clients are unaffected.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.cursor_page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            ordering = (F('published_at').asc(nulls_first=True), 'id')
+        else:
+            ordering = (F('published_at').desc(nulls_last=True), '-id')
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(*position, reverse=reverse))
+
+        results = list(queryset[:self.cursor_page_size + 1])
+        has_more = len(results) > self.cursor_page_size
+        results = results[:self.cursor_page_size]
+        if reverse:
+            results.reverse()
+
+        # Moving backwards always leaves a page after this one, and moving
+        # forwards from a cursor always leaves one before it.
+        has_next = has_more if not reverse else position is not None
+        has_previous = has_more if reverse else position is not None
+        self.next_position = self._position(results[-1]) if results and has_next else None
+        self.previous_position = self._position(results[0]) if results and has_previous else None
+        return results
+
+    @staticmethod
+    def keyset_filter(published_at, pk, reverse=False):
+        """Rows strictly after (or, in reverse, before) the given position."""
+        if not reverse:
+            if published_at is None:
+                return Q(published_at__isnull=True, id__lt=pk)
+            return (
+                Q(published_at__lt=published_at)
+                | Q(published_at=published_at, id__lt=pk)
+                | Q(published_at__isnull=True)
+            )
+        if published_at is None:
+            return Q(published_at__isnull=False) | Q(published_at__isnull=True, id__gt=pk)
+        return Q(published_at__gt=published_at) | Q(published_at=published_at, id__gt=pk)
+
+    @staticmethod
+    def _position(post):
+        return (post.published_at, post.pk)
+
+    def decode_cursor(self, request):
+        """Return ((published_at, id), reverse) for the request's cursor."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            published_at = parse_datetime(data['p']) if data['p'] is not None else None
+            if data['p'] is not None and published_at is None:
+                raise ValueError(data['p'])
+            return (published_at, int(data['i'])), bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        published_at, pk = position
+        data = {
+            'p': published_at.isoformat() if published_at is not None else None,
+            'i': pk,
+            'r': 1 if reverse else 0,
+        }
+        encoded = base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode('ascii'))
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -0,0 +1,157 @@
+"""
+Precomputed related-post rankings.
+
+Each published post keeps its top BLOG_RELATED_POSTS_LIMIT candidates in
+`blog_related_posts`. A candidate must share the post's category or at least
+one tag. Its score combines tag overlap (Jaccard), same category, and the
+candidate's recency.
+"""
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import BlogPost, RelatedPost
+
+TAG_WEIGHT = 0.6
+CATEGORY_WEIGHT = 0.3
+RECENCY_WEIGHT = 0.1
+RECENCY_HALF_LIFE_DAYS = 180
+
+# Source posts scored per bulk insert during a full rebuild
+REBUILD_BATCH_SIZE = 200
+
+
+def related_posts_limit():
+    return getattr(settings, 'BLOG_RELATED_POSTS_LIMIT', 12)
+
+
+def _published():
+    return BlogPost.objects.filter(status='published', is_deleted=False)
+
+
+def _load_posts(queryset):
+    """Return {id: (category_id, published_at, tag_ids)} for the queryset."""
+    posts = {
+        pk: (category_id, published_at)
+        for pk, category_id, published_at in queryset.order_by().values_list(
+            'id', 'category_id', 'published_at'
+        )
+    }
+    tags = defaultdict(set)
+    through = BlogPost.tags.through.objects.filter(
+        blogpost__in=queryset.order_by().values('id')
+    ).values_list('blogpost_id', 'tag_id')
+    for post_id, tag_id in through:
+        tags[post_id].add(tag_id)
+    return {
+        pk: (category_id, published_at, frozenset(tags[pk]))
+        for pk, (category_id, published_at) in posts.items()
+    }
+
+
+def score_pair(source, candidate, now):
+    """Score a candidate for a source post, or None if they are unrelated."""
+    source_category, _, source_tags = source
+    category, published_at, tags = candidate
+    shared = len(source_tags & tags)
+    same_category = source_category is not None and source_category == category
+    if not shared and not same_category:
+        return None
+
+    union = len(source_tags | tags)
+    jaccard = shared / union if union else 0.0
+    age_days = max((now - (published_at or now)).total_seconds() / 86400, 0)
+    recency = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+    return TAG_WEIGHT * jaccard + CATEGORY_WEIGHT * same_category + RECENCY_WEIGHT * recency
+
+
+def _rank(sources, pool, now, limit):
+    """Build the top-`limit` RelatedPost rows for every source post."""
+    rows = []
+    for source_id, source in sources.items():
+        scored = []
+        for candidate_id, candidate in pool.items():
+            if candidate_id == source_id:
+                continue
+            score = score_pair(source, candidate, now)
+            if score is not None:
+                scored.append((score, candidate_id))
+        for score, candidate_id in heapq.nlargest(limit, scored):
+            rows.append(RelatedPost(post_id=source_id, related_id=candidate_id, score=score))
+    return rows
+
+
+def rebuild_related_posts(post_ids):
+    """
+    Recompute the related lists of the given posts.
+
+    Posts that are not published lose their list. Returns the number of
+    lists written.
+    """
+    post_ids = {pk for pk in post_ids if pk is not None}
+    if not post_ids:
+        return 0
+
+    sources = _load_posts(_published().filter(pk__in=post_ids))
+    category_ids = {category_id for category_id, _, _ in sources.values() if category_id}
+    tag_ids = set().union(*(tags for _, _, tags in sources.values()))
+    pool = {}
+    if category_ids or tag_ids:
+        pool = _load_posts(
+            _published().filter(Q(category_id__in=category_ids) | Q(tags__in=tag_ids)).distinct()
+        )
+
+    rows = _rank(sources, pool, timezone.now(), related_posts_limit())
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=post_ids).delete()
+        RelatedPost.objects.bulk_create(rows)
+    return len(sources)
+
+
+def rebuild_all_related_posts():
+    """Recompute every related list from scratch (cold start)."""
+    pool = _load_posts(_published())
+    source_ids = sorted(pool)
+    now = timezone.now()
+    limit = related_posts_limit()
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        for start in range(0, len(source_ids), REBUILD_BATCH_SIZE):
+            batch = {pk: pool[pk] for pk in source_ids[start:start + REBUILD_BATCH_SIZE]}
+            RelatedPost.objects.bulk_create(_rank(batch, pool, now, limit))
+    return len(source_ids)
+
+
+def affected_posts(post_ids=(), category_ids=(), tag_ids=()):
+    """
+    Posts whose related lists may change when the given posts, categories or
+    tags change: the posts themselves, every published post sharing one of the
+    categories or tags, and every post that currently lists one of the posts.
+    """
+    post_ids = {pk for pk in post_ids if pk is not None}
+    category_ids = {pk for pk in category_ids if pk is not None}
+    tag_ids = {pk for pk in tag_ids if pk is not None}
+    affected = set(post_ids)
+    if category_ids or tag_ids:
+        affected.update(
+            _published().filter(
+                Q(category_id__in=category_ids) | Q(tags__in=tag_ids)
+            ).values_list('id', flat=True).distinct()
+        )
+    if post_ids:
+        affected.update(
+            RelatedPost.objects.filter(related_id__in=post_ids).values_list('post_id', flat=True)
+        )
+    return affected
+
+
+def schedule_related_rebuild(post_ids=(), category_ids=(), tag_ids=()):
+    """Rebuild the affected related lists once the current transaction commits."""
+    post_ids, category_ids, tag_ids = set(post_ids), set(category_ids), set(tag_ids)
+    transaction.on_commit(
+        lambda: rebuild_related_posts(affected_posts(post_ids, category_ids, tag_ids))
+    )
@@ -0,0 +1,139 @@
+"""
+Full-text search backends for blog posts.
+
+PostgreSQL keeps a weighted tsvector in `blog_posts.search_vector`, maintained
+by a trigger and served by a GIN index. SQLite keeps an FTS5 table
+(`blog_posts_fts`) that is synced from signals. Other databases, or a SQLite
+build without FTS5, fall back to DRF's icontains search.
+
+Every term is matched as a word prefix ("term" finds "termite", "wood"
+finds "wooden"), the closest the indexes get to the icontains contract.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from .models import BlogPost
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'blog_posts_fts'
+
+# Relative weight of title, excerpt and content matches
+SQLITE_BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+
+def weighted_search_vector():
+    """The tsvector expression the PostgreSQL trigger stores for each post."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('excerpt', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('content', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+class PostgresSearchBackend:
+    """tsvector/GIN search; the index is kept current by a database trigger."""
+
+    @staticmethod
+    def tsquery(terms):
+        """
+        `word:* & ...` for every word in the terms; only word characters are
+        kept, so user input is never parsed as tsquery syntax.
+        """
+        words = [word for term in terms for word in re.findall(r'\w+', term)]
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def search(self, queryset, terms):
+        """Filter to posts matching every term as a prefix and annotate `search_rank`."""
+        tsquery = self.tsquery(terms)
+        if not tsquery:
+            return queryset.none()
+        query = SearchQuery(tsquery, search_type='raw', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+
+    def index_posts(self, posts):
+        """Nothing to do: the trigger updates search_vector on write."""
+
+    def remove_posts(self, post_ids):
+        """Nothing to do: the vector is deleted with the row."""
+
+    def rebuild(self):
+        """Recompute every post's search vector."""
+        return BlogPost.objects.update(search_vector=weighted_search_vector())
+
+
+class SQLiteSearchBackend:
+    """FTS5 search over a shadow table keyed by the post id (rowid)."""
+
+    @staticmethod
+    def match_expression(terms):
+        """
+        Quote each term so user input is never parsed as FTS5 syntax, and
+        match it as a prefix (`"term"*`).
+        """
+        return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+    def search(self, queryset, terms):
+        """Filter to posts matching every term as a prefix and annotate `search_rank`."""
+        match = self.match_expression(terms)
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        matching_ids = RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match]
+        )
+        # bm25() is lower for better matches; negate it so higher ranks first
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {BlogPost._meta.db_table}.id',
+            [match]
+        )
+        return queryset.filter(pk__in=matching_ids).annotate(search_rank=rank)
+
+    def index_posts(self, posts):
+        """Replace the FTS rows of the given posts."""
+        rows = [(post.pk, post.title, post.excerpt, post.content) for post in posts]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)',
+                rows
+            )
+
+    def remove_posts(self, post_ids):
+        """Drop the FTS rows of deleted posts."""
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in post_ids])
+
+    def rebuild(self):
+        """Re-copy every post into the FTS table."""
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) '
+                f'SELECT id, title, excerpt, content FROM {BlogPost._meta.db_table}'
+            )
+            return cursor.rowcount
+
+
+# Whether the SQLite FTS table exists; None until first checked
+_sqlite_fts_available = None
+
+
+def get_search_backend():
+    """Return the backend for the default database, or None to use icontains."""
+    global _sqlite_fts_available
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if connection.vendor == 'sqlite':
+        if _sqlite_fts_available is None:
+            # The migration skips the FTS table when SQLite lacks FTS5
+            _sqlite_fts_available = FTS_TABLE in connection.introspection.table_names()
+        if _sqlite_fts_available:
+            return SQLiteSearchBackend()
+    return None
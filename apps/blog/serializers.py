@@ -3,30 +3,26 @@ Serializers for the blog app.
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from apps.common.serializers import DynamicFieldsMixin
 from .models import Category, Tag, BlogPost, Comment, BlogLike
 
 User = get_user_model()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for blog categories.
     """
-    posts_count = serializers.SerializerMethodField()
-
     class Meta:
         model = Category
         fields = (
             'id', 'name', 'slug', 'description', 'color',
             'icon', 'is_active', 'posts_count'
         )
-
-    def get_posts_count(self, obj):
-        """Get the number of published posts in this category."""
-        return obj.posts.filter(status='published', is_deleted=False).count()
+        read_only_fields = ('posts_count',)
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for blog tags.
     """
@@ -35,7 +31,7 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'slug')
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for blog post authors.
     """
@@ -46,30 +42,46 @@ class AuthorSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'first_name', 'last_name', 'full_name', 'profile_picture')
 
 
-class BlogPostListSerializer(serializers.ModelSerializer):
+def is_liked_by_requester(context, obj):
+    """
+    Whether the requesting user liked the post. Views pass the liked ids of
+    the whole page as `liked_post_ids`; otherwise this costs one EXISTS query.
+    """
+    liked_post_ids = context.get('liked_post_ids')
+    if liked_post_ids is not None:
+        return obj.pk in liked_post_ids
+    request = context.get('request')
+    if request and request.user.is_authenticated:
+        return BlogLike.objects.filter(post=obj, user=request.user).exists()
+    return False
+
+
+class BlogPostListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for blog post list view.
     """
     author = AuthorSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    is_liked = serializers.SerializerMethodField()
 
     class Meta:
         model = BlogPost
         fields = (
             'id', 'title', 'slug', 'excerpt', 'featured_image',
             'author', 'category', 'tags', 'status', 'is_featured',
-            'read_time', 'views_count', 'likes_count', 'comments_count',
-            'published_at', 'created_at'
+            'read_time', 'views_count', 'unique_views_count', 'likes_count', 'comments_count',
+            'published_at', 'created_at', 'is_liked', 'content'
         )
+        # Only rendered with ?expand=content
+        expandable_fields = ('content',)
 
-    def get_comments_count(self, obj):
-        """Get the number of approved comments."""
-        return obj.comments.filter(is_approved=True, is_deleted=False).count()
+    def get_is_liked(self, obj):
+        """Check if the current user has liked this post."""
+        return is_liked_by_requester(self.context, obj)
 
 
-class BlogPostDetailSerializer(serializers.ModelSerializer):
+class BlogPostDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for blog post detail view.
     """
@@ -77,7 +89,6 @@ class BlogPostDetailSerializer(serializers.ModelSerializer):
     category_detail = CategorySerializer(source='category', read_only=True)
     category = serializers.IntegerField(required=False, write_only=True)
     tags = TagSerializer(many=True, read_only=True)
-    comments_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
 
     class Meta:
@@ -85,21 +96,15 @@ class BlogPostDetailSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'title', 'slug', 'excerpt', 'content', 'featured_image',
             'author', 'category', 'category_detail', 'tags', 'status', 'is_featured',
-            'read_time', 'views_count', 'likes_count', 'comments_count',
+            'read_time', 'views_count', 'unique_views_count', 'likes_count', 'comments_count',
             'meta_title', 'meta_description', 'published_at', 'created_at',
             'updated_at', 'is_liked'
         )
-
-    def get_comments_count(self, obj):
-        """Get the number of approved comments."""
-        return obj.comments.filter(is_approved=True, is_deleted=False).count()
+        read_only_fields = ('comments_count', 'unique_views_count')
 
     def get_is_liked(self, obj):
         """Check if the current user has liked this post."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return BlogLike.objects.filter(post=obj, user=request.user).exists()
-        return False
+        return is_liked_by_requester(self.context, obj)
     
     def update(self, instance, validated_data):
         """Update blog post and set published_at if status changes to published."""
@@ -200,29 +205,46 @@ class BlogPostCreateSerializer(serializers.ModelSerializer):
         return blog_post
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for blog comments.
     """
     author = AuthorSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
+    replies_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
         fields = (
             'id', 'content', 'author', 'parent', 'is_approved',
-            'created_at', 'replies'
+            'created_at', 'replies', 'replies_count'
         )
 
+    def _visible_replies(self, obj):
+        """Approved replies, from the preloaded thread when the view supplies one."""
+        reply_map = self.context.get('reply_map')
+        if reply_map is None:
+            if not hasattr(obj, '_approved_replies'):
+                obj._approved_replies = list(
+                    obj.replies.filter(is_approved=True, is_deleted=False).select_related('author')
+                )
+            return obj._approved_replies
+        return reply_map.get(obj.pk, [])
+
     def get_replies(self, obj):
-        """Get replies to this comment."""
-        if obj.replies.exists():
-            return CommentSerializer(
-                obj.replies.filter(is_approved=True, is_deleted=False),
-                many=True,
-                context=self.context
-            ).data
-        return []
+        """Get replies to this comment, up to the configured depth and count."""
+        depth_limit = self.context.get('reply_depth_limit')
+        if depth_limit is not None and obj.depth >= depth_limit:
+            return []
+        replies = self._visible_replies(obj)
+        max_replies = self.context.get('max_replies')
+        if max_replies is not None:
+            replies = replies[:max_replies]
+        return CommentSerializer(replies, many=True, context=self.context).data
+
+    def get_replies_count(self, obj):
+        """Get the number of approved direct replies, including ones not inlined."""
+        return len(self._visible_replies(obj))
 
 
 class CommentCreateSerializer(serializers.ModelSerializer):
@@ -236,7 +258,7 @@ class CommentCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Create a new comment."""
         validated_data['author'] = self.context['request'].user
-        validated_data['post'] = self.context['post']
+        validated_data['post_id'] = self.context['post_id']
         return Comment.objects.create(**validated_data)
 
 
@@ -0,0 +1,220 @@
+"""
+Signal handlers for the blog app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from apps.common.cache import model_label, touch
+from .models import BlogPost, Category, Comment, RelatedPost, Tag
+from .counters import (
+    refresh_comments_count,
+    refresh_category_posts_count,
+    refresh_tag_posts_count,
+)
+from .materialized import MEMBERSHIP_FIELDS, schedule_list_refresh
+from .related import schedule_related_rebuild
+from .search import get_search_backend
+from .stats import invalidate_blog_stats
+from .slugs import slug_resolver
+from .snapshots import schedule_snapshot_rebuild
+
+User = get_user_model()
+
+# User fields rendered in post snapshots (AuthorSerializer)
+SNAPSHOT_AUTHOR_FIELDS = {'username', 'first_name', 'last_name', 'profile_picture'}
+
+
+def _was_published(instance, changes):
+    """Whether the post was published before the save that produced `changes`."""
+    return (
+        changes.get('status', instance.status) == 'published'
+        and not changes.get('is_deleted', instance.is_deleted)
+    )
+
+
+@receiver(post_save, sender=Comment, dispatch_uid='blog_comment_saved_counter')
+def comment_saved(sender, instance, **kwargs):
+    """Keep the post's comments_count in step with created/approved/soft-deleted comments."""
+    refresh_comments_count([instance.post_id])
+
+
+@receiver(post_delete, sender=Comment, dispatch_uid='blog_comment_deleted_counter')
+def comment_deleted(sender, instance, **kwargs):
+    """Keep the post's comments_count in step with hard-deleted comments."""
+    refresh_comments_count([instance.post_id])
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved_counter')
+def blog_post_saved(sender, instance, created, **kwargs):
+    """Refresh category/tag post counts when status, category or is_deleted change."""
+    changes = instance.tracked_changes()
+    if not created and not changes:
+        return
+    refresh_category_posts_count([instance.category_id, changes.get('category_id')])
+    if not created and ('status' in changes or 'is_deleted' in changes):
+        refresh_tag_posts_count(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved_related')
+def blog_post_saved_related(sender, instance, created, **kwargs):
+    """Re-rank related posts when a post's category or visibility changes."""
+    changes = instance.tracked_changes()
+    if not created and not changes:
+        return
+    if not instance.is_published and (created or not _was_published(instance, changes)):
+        return
+    schedule_related_rebuild(
+        post_ids=[instance.pk],
+        category_ids=[instance.category_id, changes.get('category_id')],
+        tag_ids=[] if created else instance.tags.values_list('pk', flat=True)
+    )
+
+
+@receiver(pre_delete, sender=BlogPost, dispatch_uid='blog_post_deleting')
+def blog_post_deleting(sender, instance, **kwargs):
+    """Remember what the cascade is about to remove."""
+    instance._previous_tag_ids = list(instance.tags.values_list('pk', flat=True))
+    instance._listed_by_ids = list(
+        RelatedPost.objects.filter(related=instance).values_list('post_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=BlogPost, dispatch_uid='blog_post_deleted')
+def blog_post_deleted(sender, instance, **kwargs):
+    """Refresh counters and related lists after a post is hard-deleted."""
+    tag_ids = getattr(instance, '_previous_tag_ids', ())
+    refresh_category_posts_count([instance.category_id])
+    refresh_tag_posts_count(tag_ids)
+    schedule_related_rebuild(
+        post_ids=getattr(instance, '_listed_by_ids', ()),
+        category_ids=[instance.category_id],
+        tag_ids=tag_ids
+    )
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through, dispatch_uid='blog_post_tags_changed')
+def blog_post_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh tag counts, related lists and snapshots when tags are added to or removed from posts."""
+    if action == 'pre_clear':
+        # Remember the rows clear() is about to delete
+        if reverse:
+            instance._previous_post_ids = list(instance.posts.values_list('pk', flat=True))
+        else:
+            instance._previous_tag_ids = list(instance.tags.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        # tag.posts.add/remove/clear(): only this tag's count can change
+        tag_ids = [instance.pk]
+        post_ids = pk_set if action != 'post_clear' else getattr(instance, '_previous_post_ids', ())
+        category_ids = BlogPost.objects.filter(pk__in=post_ids).values_list('category_id', flat=True)
+    else:
+        tag_ids = pk_set if action != 'post_clear' else getattr(instance, '_previous_tag_ids', ())
+        post_ids = [instance.pk]
+        category_ids = [instance.category_id]
+
+    refresh_tag_posts_count(tag_ids)
+    if reverse or instance.is_published:
+        schedule_related_rebuild(post_ids=post_ids, category_ids=category_ids, tag_ids=tag_ids)
+        schedule_snapshot_rebuild(post_ids)
+        schedule_list_refresh(post_ids)
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved_search')
+def blog_post_indexed(sender, instance, **kwargs):
+    """Keep the full-text index in step with the post's text."""
+    backend = get_search_backend()
+    if backend is not None:
+        backend.index_posts([instance])
+
+
+@receiver(post_delete, sender=BlogPost, dispatch_uid='blog_post_deleted_search')
+def blog_post_unindexed(sender, instance, **kwargs):
+    """Drop a hard-deleted post from the full-text index."""
+    backend = get_search_backend()
+    if backend is not None:
+        backend.remove_posts([instance.pk])
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved_stats')
+@receiver(post_delete, sender=BlogPost, dispatch_uid='blog_post_deleted_stats')
+@receiver(post_save, sender=Category, dispatch_uid='blog_category_saved_stats')
+@receiver(post_delete, sender=Category, dispatch_uid='blog_category_deleted_stats')
+@receiver(post_save, sender=Tag, dispatch_uid='blog_tag_saved_stats')
+@receiver(post_delete, sender=Tag, dispatch_uid='blog_tag_deleted_stats')
+@receiver(post_save, sender=Comment, dispatch_uid='blog_comment_saved_stats')
+@receiver(post_delete, sender=Comment, dispatch_uid='blog_comment_deleted_stats')
+def blog_stats_changed(sender, **kwargs):
+    """Drop the cached blog statistics when any counted row changes."""
+    invalidate_blog_stats()
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved_slug')
+@receiver(post_delete, sender=BlogPost, dispatch_uid='blog_post_deleted_slug')
+def blog_post_slug_changed(sender, instance, **kwargs):
+    """Drop the post's current and previous slug from the slug resolver."""
+    slugs = (instance.slug, instance.tracked_changes().get('slug'))
+    slug_resolver.invalidate(*slugs)
+    # Again after commit, in case a concurrent request cached the old row
+    transaction.on_commit(lambda: slug_resolver.invalidate(*slugs))
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved_snapshot')
+def blog_post_snapshot_saved(sender, instance, **kwargs):
+    """Re-render the post's snapshot (or drop it if unpublished)."""
+    schedule_snapshot_rebuild([instance.pk])
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved_lists')
+def blog_post_lists_saved(sender, instance, created, **kwargs):
+    """Recompute the materialized lists the post may enter or leave, or refresh its card."""
+    changes = instance.tracked_changes()
+    if created or any(field in changes for field in MEMBERSHIP_FIELDS):
+        schedule_list_refresh()
+    else:
+        schedule_list_refresh([instance.pk])
+
+
+@receiver(post_delete, sender=BlogPost, dispatch_uid='blog_post_deleted_lists')
+def blog_post_lists_deleted(sender, instance, **kwargs):
+    """Drop a hard-deleted post from the materialized lists holding it."""
+    schedule_list_refresh([instance.pk])
+
+
+@receiver(post_save, sender=Category, dispatch_uid='blog_category_saved_snapshot')
+@receiver(pre_delete, sender=Category, dispatch_uid='blog_category_deleting_snapshot')
+def category_snapshot_changed(sender, instance, **kwargs):
+    """Re-render the snapshots and list cards embedding the category."""
+    post_ids = list(instance.posts.values_list('pk', flat=True))
+    schedule_snapshot_rebuild(post_ids)
+    schedule_list_refresh(post_ids)
+
+
+@receiver(post_save, sender=Tag, dispatch_uid='blog_tag_saved_snapshot')
+@receiver(pre_delete, sender=Tag, dispatch_uid='blog_tag_deleting_snapshot')
+def tag_snapshot_changed(sender, instance, **kwargs):
+    """Re-render the snapshots and list cards embedding the tag."""
+    post_ids = list(instance.posts.values_list('pk', flat=True))
+    schedule_snapshot_rebuild(post_ids)
+    schedule_list_refresh(post_ids)
+
+
+@receiver(post_save, sender=User, dispatch_uid='blog_author_saved_snapshot')
+def author_snapshot_changed(sender, instance, update_fields=None, **kwargs):
+    """
+    Re-render the snapshots and list cards of an author's posts when their
+    public fields change, then move the BlogPost stamp: the post views do
+    not version on User, so their cached responses would keep the old author.
+    """
+    if update_fields is not None and not SNAPSHOT_AUTHOR_FIELDS.intersection(update_fields):
+        # e.g. the last_login update on every login
+        return
+    post_ids = list(instance.blog_posts.values_list('pk', flat=True))
+    if not post_ids:
+        return
+    schedule_snapshot_rebuild(post_ids)
+    schedule_list_refresh(post_ids)
+    transaction.on_commit(lambda: touch(model_label(BlogPost)))
@@ -0,0 +1,104 @@
+"""
+Slug-to-post resolution shared by the slug-based blog endpoints.
+
+Lookups go through a small per-process LRU (short TTL) and then the shared
+cache before reaching the database. Saving or deleting a post drops its
+entries from this process's LRU and from the shared cache; other workers
+see the change once their local entry expires.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from .models import BlogPost
+
+SLUG_KEY = 'blog:slug:{}'
+
+# Cached marker for slugs that match no post
+MISSING = 'missing'
+
+
+class ResolvedPost(namedtuple('ResolvedPost', ('id', 'status', 'is_deleted', 'updated_at'))):
+    """
+    The fields of a post needed to route a slug-based request.
+    """
+    __slots__ = ()
+
+    @property
+    def is_published(self):
+        return self.status == 'published' and not self.is_deleted
+
+
+class SlugResolver:
+    """
+    Two-tier slug → ResolvedPost cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+
+    @property
+    def local_size(self):
+        return getattr(settings, 'BLOG_SLUG_CACHE_SIZE', 1024)
+
+    @property
+    def local_ttl(self):
+        return getattr(settings, 'BLOG_SLUG_CACHE_LOCAL_TTL', 5)
+
+    @property
+    def shared_ttl(self):
+        return getattr(settings, 'BLOG_SLUG_CACHE_TIMEOUT', 300)
+
+    def resolve(self, slug):
+        """Return the ResolvedPost for the slug, or None if no post has it."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(slug)
+            if entry is not None and entry[1] > now:
+                self._local.move_to_end(slug)
+                return entry[0]
+
+        value = cache.get(SLUG_KEY.format(slug))
+        if value is None:
+            row = BlogPost.objects.filter(slug=slug).values_list(
+                'id', 'status', 'is_deleted', 'updated_at'
+            ).first()
+            value = ResolvedPost(*row) if row else MISSING
+            cache.set(SLUG_KEY.format(slug), tuple(value) if row else MISSING, self.shared_ttl)
+        elif value != MISSING:
+            value = ResolvedPost(*value)
+
+        post = None if value == MISSING else value
+        with self._lock:
+            self._local[slug] = (post, now + self.local_ttl)
+            self._local.move_to_end(slug)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+        return post
+
+    def invalidate(self, *slugs):
+        """Forget the given slugs in this process and in the shared cache."""
+        slugs = [slug for slug in slugs if slug]
+        with self._lock:
+            for slug in slugs:
+                self._local.pop(slug, None)
+        cache.delete_many([SLUG_KEY.format(slug) for slug in slugs])
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+
+slug_resolver = SlugResolver()
+
+
+def get_published_post_or_404(slug):
+    """Resolve a slug to a published, non-deleted post or raise Http404."""
+    post = slug_resolver.resolve(slug)
+    if post is None or not post.is_published:
+        raise Http404('No BlogPost matches the given query.')
+    return post
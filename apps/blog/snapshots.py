@@ -0,0 +1,201 @@
+"""
+Materialized JSON snapshots of serialized blog posts.
+
+Each published post keeps its list-card and detail representations, rendered
+by the regular serializers, in `blog_post_snapshots`. Views splice them into
+responses instead of running the serializers, overlaying the values that
+change without a save of the post (counters, the requester's `is_liked`)
+and making image URLs absolute for the request's host.
+
+Snapshots are rebuilt after commit whenever the post, its category, its tags
+or its author change. A snapshot whose `source_updated_at` no longer matches
+the post is treated as missing; reads that find one queue the post for a
+rebuild by a background flush instead of writing on the request path.
+"""
+from django.db import transaction
+from apps.common.buffers import BufferedCounter
+from apps.common.serializers import prune_representation
+from .models import BlogPost, BlogPostSnapshot
+from .serializers import BlogPostDetailSerializer, BlogPostListSerializer
+
+# Counters written with UPDATE (no save), overlaid at splice time
+VOLATILE_FIELDS = ('views_count', 'unique_views_count', 'likes_count', 'comments_count')
+
+# Representation keys holding the nested category, per snapshot kind
+CATEGORY_KEYS = {'card': 'category', 'detail': 'category_detail'}
+
+
+def _snapshot_fields(serializer_class):
+    expandable = getattr(serializer_class.Meta, 'expandable_fields', ())
+    return tuple(name for name in serializer_class.Meta.fields if name not in expandable)
+
+
+# Serializer field order per kind (jsonb does not keep key order); fields
+# that are only rendered on ?expand= are not part of the snapshot
+FIELD_ORDER = {
+    'card': _snapshot_fields(BlogPostListSerializer),
+    'detail': _snapshot_fields(BlogPostDetailSerializer),
+}
+
+# Posts rendered per bulk insert during a full rebuild
+SNAPSHOT_BATCH_SIZE = 200
+
+
+def _published():
+    return BlogPost.objects.filter(status='published', is_deleted=False)
+
+
+def _strip(data):
+    data = dict(data)
+    for field in VOLATILE_FIELDS + ('is_liked',):
+        data.pop(field, None)
+    return data
+
+
+def render_card(post):
+    """The post's list-card representation without live values."""
+    return _strip(BlogPostListSerializer(post).data)
+
+
+def render_snapshot(post):
+    """Render a post (with author, category and tags loaded) into a snapshot row."""
+    return BlogPostSnapshot(
+        post=post,
+        card=render_card(post),
+        detail=_strip(BlogPostDetailSerializer(post).data),
+        source_updated_at=post.updated_at
+    )
+
+
+def rebuild_snapshots(post_ids):
+    """
+    Re-render the snapshots of the given posts. Posts that are not published
+    lose theirs. Returns the number of snapshots written.
+    """
+    post_ids = {pk for pk in post_ids if pk is not None}
+    if not post_ids:
+        return 0
+    posts = _published().filter(pk__in=post_ids).select_related(
+        'author', 'category'
+    ).prefetch_related('tags')
+    snapshots = [render_snapshot(post) for post in posts]
+    with transaction.atomic():
+        # Upsert, so concurrent rebuilds never collide and readers never see a gap
+        BlogPostSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['post'],
+            update_fields=['card', 'detail', 'source_updated_at', 'rendered_at']
+        )
+        BlogPostSnapshot.objects.filter(post_id__in=post_ids).exclude(
+            post_id__in=[snapshot.post_id for snapshot in snapshots]
+        ).delete()
+    return len(snapshots)
+
+
+def rebuild_all_snapshots(batch_size=SNAPSHOT_BATCH_SIZE):
+    """Re-render every published post's snapshot in batches."""
+    post_ids = list(_published().order_by('pk').values_list('pk', flat=True))
+    BlogPostSnapshot.objects.exclude(post_id__in=_published().values('pk')).delete()
+    written = 0
+    for start in range(0, len(post_ids), batch_size):
+        written += rebuild_snapshots(post_ids[start:start + batch_size])
+    return written
+
+
+def schedule_snapshot_rebuild(post_ids):
+    """Re-render the given posts' snapshots once the current transaction commits."""
+    post_ids = set(post_ids)
+    if post_ids:
+        transaction.on_commit(lambda: rebuild_snapshots(post_ids))
+
+
+class SnapshotRebuildBuffer(BufferedCounter):
+    """
+    Collects ids of posts read without a current snapshot and re-renders
+    them from the flush thread only.
+    """
+    name = 'blog-snapshots'
+    background_flush = True
+
+    def write(self, batch):
+        rebuild_snapshots(batch)
+
+
+snapshot_rebuild_buffer = SnapshotRebuildBuffer()
+
+
+def queue_snapshot_rebuild(post_ids):
+    """Re-render the given posts' snapshots in the background; for read requests."""
+    for post_id in set(post_ids):
+        snapshot_rebuild_buffer.add(post_id)
+
+
+def snapshot_queryset(queryset, kind):
+    """Narrow a post queryset to the columns needed to splice `kind` snapshots."""
+    return queryset.select_related(None).prefetch_related(None).select_related(
+        'snapshot', 'category'
+    ).only(
+        'id', 'published_at', 'updated_at', 'category', 'category__posts_count',
+        *VOLATILE_FIELDS,
+        f'snapshot__{kind}', 'snapshot__source_updated_at'
+    )
+
+
+def snapshot_covers(kind, fields):
+    """Whether `kind` snapshots hold every field in `fields`."""
+    return set(fields) <= set(FIELD_ORDER[kind]) | {'is_liked'} | set(VOLATILE_FIELDS)
+
+
+def fresh_snapshot(post):
+    """The post's snapshot if it is current, else None."""
+    try:
+        snapshot = post.snapshot
+    except BlogPostSnapshot.DoesNotExist:
+        return None
+    if snapshot.source_updated_at != post.updated_at:
+        return None
+    return snapshot
+
+
+def _absolute(request, url):
+    if request is not None and url and url.startswith('/'):
+        return request.build_absolute_uri(url)
+    return url
+
+
+def live_values(post):
+    """The values overlaid on a post's snapshot, read from a snapshot-queryset post."""
+    values = {field: getattr(post, field) for field in VOLATILE_FIELDS}
+    values['category_posts_count'] = post.category.posts_count if post.category is not None else None
+    return values
+
+
+def overlay(data, kind, live, request=None, liked_post_ids=(), fields=None):
+    """
+    Complete a stored `kind` representation with `live` values (see
+    live_values()) and the requester's liked state, restricted to `fields`
+    (the requesting serializer's bound fields) if given.
+    """
+    data = dict(data)
+    for field in VOLATILE_FIELDS:
+        data[field] = live[field]
+    data['is_liked'] = data['id'] in liked_post_ids
+
+    category_key = CATEGORY_KEYS[kind]
+    if data.get(category_key) and live['category_posts_count'] is not None:
+        data[category_key] = {**data[category_key], 'posts_count': live['category_posts_count']}
+    data['featured_image'] = _absolute(request, data.get('featured_image'))
+    if data.get('author'):
+        data['author'] = {
+            **data['author'],
+            'profile_picture': _absolute(request, data['author'].get('profile_picture')),
+        }
+    if fields is not None:
+        return prune_representation(data, fields)
+    return {field: data[field] for field in FIELD_ORDER[kind] if field in data}
+
+
+def splice(post, kind, request=None, liked_post_ids=(), fields=None):
+    """Return the post's `kind` representation from its snapshot plus live values."""
+    return overlay(getattr(post.snapshot, kind), kind, live_values(post), request, liked_post_ids, fields)
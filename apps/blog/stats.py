@@ -0,0 +1,54 @@
+"""
+Cached public blog statistics.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Value
+from apps.common.cache import get_or_fill
+from .models import BlogPost, Category, Comment, Tag
+
+STATS_CACHE_KEY = 'blog:stats'
+
+
+def stats_cache_timeout():
+    return getattr(settings, 'BLOG_STATS_CACHE_TIMEOUT', 300)
+
+
+def _keyed_count(queryset, key):
+    """COUNT(*) of the queryset as a single (key, total) row."""
+    return queryset.order_by().annotate(key=Value(key)).values('key').annotate(
+        total=Count('pk')
+    ).values_list('key', 'total')
+
+
+def compute_blog_stats():
+    """Compute the figures in two queries: one over posts, one UNION ALL for the rest."""
+    published = Q(status='published', is_deleted=False)
+    stats = BlogPost.objects.order_by().aggregate(
+        total_posts=Count('pk', filter=published),
+        featured_posts=Count('pk', filter=published & Q(is_featured=True)),
+    )
+    stats.update({'total_categories': 0, 'total_tags': 0, 'total_comments': 0})
+    counts = _keyed_count(
+        Category.objects.filter(is_active=True, is_deleted=False), 'total_categories'
+    ).union(
+        _keyed_count(Tag.objects.filter(is_deleted=False), 'total_tags'),
+        _keyed_count(Comment.objects.filter(is_approved=True, is_deleted=False), 'total_comments'),
+        all=True
+    )
+    stats.update(dict(counts))
+    return {
+        key: stats[key]
+        for key in ('total_posts', 'total_categories', 'total_tags', 'total_comments', 'featured_posts')
+    }
+
+
+def get_blog_stats():
+    """Return the cached statistics; concurrent misses compute them once."""
+    return get_or_fill(
+        STATS_CACHE_KEY, compute_blog_stats, stats_cache_timeout(), stale_timeout=stats_cache_timeout()
+    )
+
+
+def invalidate_blog_stats():
+    cache.delete(STATS_CACHE_KEY)
@@ -0,0 +1,768 @@
+"""
+Tests for the blog app.
+"""
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .like_counter import like_count_buffer
+from .materialized import get_list
+from .models import BlogLike, BlogPost, BlogPostDailyViews, BlogPostSnapshot, Category, Comment, Tag
+from .pagination import BlogPostPagination
+from .search import PostgresSearchBackend, get_search_backend
+from .slugs import slug_resolver
+from .snapshots import rebuild_snapshots
+from .trending import add_daily_views, compute_trending, decay_weight
+from .view_counter import view_count_buffer
+from .visitors import unique_visitors
+
+
+class UniqueViewsTests(TestCase):
+    """
+    Post detail views feed per-day visitor sketches and unique_views_count.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.reader = User.objects.create_user(email='reader@example.com', username='reader', password='x')
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=author, status='published'
+        )
+
+    def setUp(self):
+        cache.clear()
+        slug_resolver.clear()
+        view_count_buffer.flush()
+
+    def view(self, client=None, **headers):
+        response = (client or self.client).get(f'/api/v1/blog/posts/{self.post.slug}/', **headers)
+        self.assertEqual(response.status_code, 200)
+
+    def test_repeat_views_count_once(self):
+        for _ in range(3):
+            self.view(REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT='Firefox')
+        self.view(REMOTE_ADDR='10.0.0.2', HTTP_USER_AGENT='Firefox')
+        reader = APIClient()
+        reader.force_authenticate(self.reader)
+        self.view(reader)
+        self.view(reader)
+        self.view(REMOTE_ADDR='10.0.0.3', HTTP_USER_AGENT='Googlebot/2.1')
+        view_count_buffer.flush()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 7)
+        self.assertEqual(self.post.unique_views_count, 3)
+        bucket = BlogPostDailyViews.objects.get(post=self.post)
+        self.assertEqual((bucket.views, bucket.unique_views), (7, 3))
+        self.assertEqual(len(bytes(bucket.visitors)), 4096)
+
+        # Later flushes merge into the same sketch
+        self.view(REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT='Firefox')
+        self.view(REMOTE_ADDR='10.0.0.4', HTTP_USER_AGENT='Firefox')
+        view_count_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.unique_views_count, 4)
+
+    def test_forwarded_for_only_trusted_behind_proxies(self):
+        # Forged X-Forwarded-For entries do not create new visitors
+        for forged in ('1.1.1.1', '2.2.2.2'):
+            self.view(REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT='Firefox', HTTP_X_FORWARDED_FOR=forged)
+        with override_settings(TRUSTED_PROXY_COUNT=1):
+            # Behind one proxy the client is the last forwarded entry
+            for forged in ('1.1.1.1', '2.2.2.2'):
+                self.view(
+                    REMOTE_ADDR='10.0.0.9', HTTP_USER_AGENT='Firefox',
+                    HTTP_X_FORWARDED_FOR=f'{forged}, 203.0.113.5'
+                )
+        view_count_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.unique_views_count, 2)
+
+    def test_flush_expires_cached_lists(self):
+        self.view(REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT='Firefox')
+        response = self.client.get('/api/v1/blog/posts/')
+        self.assertEqual(response.json()['results'][0]['views_count'], 0)
+        view_count_buffer.flush()
+
+        response = self.client.get('/api/v1/blog/posts/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['views_count'], 1)
+
+    def test_detail_etag_covers_view_counts(self):
+        url = f'/api/v1/blog/posts/{self.post.slug}/'
+        etag = self.client.get(url)['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        view_count_buffer.flush()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['views_count'], 2)
+
+    def test_daily_sketches_merge_across_days(self):
+        today = timezone.localdate()
+        for address in ('10.0.0.1', '10.0.0.2'):
+            self.view(REMOTE_ADDR=address, HTTP_USER_AGENT='Firefox')
+        view_count_buffer.flush()
+        # Yesterday: one returning visitor and one new one
+        yesterday = BlogPostDailyViews.objects.get(post=self.post)
+        yesterday.day = today - datetime.timedelta(days=1)
+        yesterday.save()
+        for address in ('10.0.0.2', '10.0.0.3'):
+            self.view(REMOTE_ADDR=address, HTTP_USER_AGENT='Firefox')
+        view_count_buffer.flush()
+
+        self.assertEqual(unique_visitors(self.post.pk, today, today), 2)
+        self.assertEqual(unique_visitors(self.post.pk, today - datetime.timedelta(days=6), today), 3)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.unique_views_count, 4)
+
+
+class CounterTests(TestCase):
+    """
+    Denormalized counters follow the rows they count.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=cls.author, status='published'
+        )
+
+    def comments_count(self):
+        self.post.refresh_from_db()
+        return self.post.comments_count
+
+    def test_comments_count_follows_visibility(self):
+        comment = Comment.objects.create(post=self.post, author=self.author, content='First')
+        Comment.objects.create(post=self.post, author=self.author, content='Reply', parent=comment)
+        self.assertEqual(self.comments_count(), 2)
+        comment.is_approved = False
+        comment.save()
+        self.assertEqual(self.comments_count(), 1)
+        comment.is_approved = True
+        comment.is_deleted = True
+        comment.save()
+        self.assertEqual(self.comments_count(), 1)
+        Comment.objects.filter(is_deleted=False).get().delete()
+        self.assertEqual(self.comments_count(), 0)
+
+    def test_rebuild_command_repairs_drift(self):
+        Comment.objects.create(post=self.post, author=self.author, content='First')
+        BlogPost.objects.filter(pk=self.post.pk).update(comments_count=7)
+        call_command('rebuild_blog_counters', stdout=StringIO())
+        self.assertEqual(self.comments_count(), 1)
+
+
+class PostsCountTests(TestCase):
+    """
+    Category and tag posts_count follow status, category and tag transitions.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.termites = Category.objects.create(name='Termites')
+        cls.rodents = Category.objects.create(name='Rodents')
+        cls.wood = Tag.objects.create(name='Wood')
+
+    def counts(self):
+        return [
+            model.objects.get(pk=instance.pk).posts_count
+            for model, instance in ((Category, self.termites), (Category, self.rodents), (Tag, self.wood))
+        ]
+
+    def test_transitions(self):
+        post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=self.author, category=self.termites
+        )
+        post.tags.add(self.wood)
+        self.assertEqual(self.counts(), [0, 0, 0])
+
+        post.status = 'published'
+        post.save()
+        self.assertEqual(self.counts(), [1, 0, 1])
+
+        post.category = self.rodents
+        post.save()
+        self.assertEqual(self.counts(), [0, 1, 1])
+
+        post.tags.remove(self.wood)
+        self.assertEqual(self.counts(), [0, 1, 0])
+        self.wood.posts.add(post)
+        self.assertEqual(self.counts(), [0, 1, 1])
+
+        post.is_deleted = True
+        post.save()
+        self.assertEqual(self.counts(), [0, 0, 0])
+        post.is_deleted = False
+        post.save()
+        post.delete()
+        self.assertEqual(self.counts(), [0, 0, 0])
+
+    def test_rebuild_command_repairs_drift(self):
+        post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=self.author,
+            category=self.termites, status='published'
+        )
+        post.tags.add(self.wood)
+        Category.objects.update(posts_count=5)
+        Tag.objects.update(posts_count=5)
+        call_command('rebuild_blog_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), [1, 0, 1])
+
+
+class LikeCountTests(TestCase):
+    """
+    Buffered likes reach likes_count, and the responses that render it, on flush.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.reader = User.objects.create_user(email='reader@example.com', username='reader', password='x')
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=author, status='published'
+        )
+
+    def setUp(self):
+        cache.clear()
+        slug_resolver.clear()
+        like_count_buffer.discard()
+        self.reader_client = APIClient()
+        self.reader_client.force_authenticate(self.reader)
+
+    def toggle_like(self):
+        return self.reader_client.post(f'/api/v1/blog/posts/{self.post.slug}/like/')
+
+    def get_posts(self, **headers):
+        return self.client.get('/api/v1/blog/posts/', **headers)
+
+    def test_flush_expires_cached_lists(self):
+        self.assertEqual(self.toggle_like().status_code, 201)
+        # Cached and validated before the buffered count is written
+        response = self.get_posts()
+        etag = response['ETag']
+        self.assertEqual(response.json()['results'][0]['likes_count'], 0)
+        self.assertEqual(self.get_posts()['X-Cache'], 'HIT')
+
+        self.assertEqual(like_count_buffer.flush(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        response = self.get_posts(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['likes_count'], 1)
+
+        # Unlike then like again nets out to no change
+        self.toggle_like()
+        self.toggle_like()
+        like_count_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_reconcile_repairs_drift(self):
+        BlogLike.objects.create(post=self.post, user=self.reader)
+        BlogPost.objects.filter(pk=self.post.pk).update(likes_count=5)
+        call_command('reconcile_blog_likes', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+
+@mock.patch.object(BlogPostPagination, 'page_size', 2)
+class CursorPaginationTests(TestCase):
+    """
+    ?pagination=cursor pages through published posts by (published_at, id).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        published_at = timezone.now()
+        for index in range(5):
+            BlogPost.objects.create(
+                title=f'Post {index}', excerpt='Excerpt', content='Body', author=author, status='published',
+                # Posts 1 and 3, and 0 and 4, share a timestamp: the id breaks the tie
+                published_at=published_at + datetime.timedelta(minutes=min(index, 4 - index))
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [post['title'] for post in data['results']], data['next'], data['previous']
+
+    def test_forward_and_back(self):
+        first, next_url, previous_url = self.get('/api/v1/blog/posts/?pagination=cursor')
+        self.assertEqual(first, ['Post 2', 'Post 3'])
+        self.assertIsNone(previous_url)
+        second, next_url, previous_url = self.get(next_url)
+        self.assertEqual(second, ['Post 1', 'Post 4'])
+        last, end, back_url = self.get(next_url)
+        self.assertEqual((last, end), (['Post 0'], None))
+
+        self.assertEqual(self.get(back_url)[0], second)
+        self.assertEqual(self.get(previous_url)[0], first)
+
+    def test_bad_cursor_is_not_found(self):
+        for cursor in ('not-a-cursor', 'eyJwIjoieCJ9', '%%%'):
+            response = self.client.get('/api/v1/blog/posts/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class RelatedPostsTests(TestCase):
+    """
+    Related posts come from the scored index, which follows post changes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        termites = Category.objects.create(name='Termites')
+        rodents = Category.objects.create(name='Rodents')
+        wood, damp = Tag.objects.create(name='Wood'), Tag.objects.create(name='Damp')
+
+        def post(title, category, tags, status='published'):
+            post = BlogPost.objects.create(
+                title=title, excerpt='Excerpt', content='Body', author=author, category=category, status=status
+            )
+            post.tags.set(tags)
+            return post
+
+        cls.post = post('Source', termites, [wood, damp])
+        post('Same category and tags', termites, [wood, damp])
+        post('Shared tag', rodents, [wood])
+        post('Unrelated', rodents, [])
+        cls.draft = post('Draft', termites, [wood], status='draft')
+
+    def setUp(self):
+        cache.clear()
+        slug_resolver.clear()
+
+    def related(self):
+        response = self.client.get(f'/api/v1/blog/posts/{self.post.slug}/related/')
+        self.assertEqual(response.status_code, 200)
+        return [post['title'] for post in response.json()['results']]
+
+    def test_ranked_from_index(self):
+        self.assertEqual(self.related(), [])
+        call_command('rebuild_related_posts', stdout=StringIO())
+        self.assertEqual(self.related(), ['Same category and tags', 'Shared tag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.draft.status = 'published'
+            self.draft.save()
+        self.assertEqual(self.related(), ['Same category and tags', 'Draft', 'Shared tag'])
+
+
+class BlogStatsTests(TestCase):
+    """
+    /stats/ is computed in two queries, cached, and dropped on writes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        Category.objects.create(name='Termites')
+        Category.objects.create(name='Hidden', is_active=False)
+        Tag.objects.create(name='Wood')
+        post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=cls.author,
+            status='published', is_featured=True
+        )
+        BlogPost.objects.create(title='Draft', excerpt='Excerpt', content='Body', author=cls.author)
+        Comment.objects.create(post=post, author=cls.author, content='First')
+        Comment.objects.create(post=post, author=cls.author, content='Pending', is_approved=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def stats(self):
+        response = self.client.get('/api/v1/blog/stats/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_counts_cached_until_write(self):
+        with self.assertNumQueries(2):
+            stats = self.stats()
+        self.assertEqual(stats, {
+            'total_posts': 1, 'total_categories': 1, 'total_tags': 1, 'total_comments': 1, 'featured_posts': 1,
+        })
+        with self.assertNumQueries(0):
+            self.stats()
+        Tag.objects.create(name='Damp')
+        self.assertEqual(self.stats()['total_tags'], 2)
+
+
+class SearchTests(TestCase):
+    """
+    ?search= matches every term as a word prefix through the full-text index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        for title in ('Termite season', 'Wooden decks', 'Ant colonies'):
+            BlogPost.objects.create(
+                title=title, excerpt='Excerpt', content='Body', author=author, status='published'
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, terms):
+        response = self.client.get('/api/v1/blog/posts/', {'search': terms})
+        self.assertEqual(response.status_code, 200)
+        return sorted(post['title'] for post in response.json()['results'])
+
+    def test_terms_match_word_prefixes(self):
+        self.assertIsNotNone(get_search_backend())
+        self.assertEqual(self.search('term'), ['Termite season'])
+        self.assertEqual(self.search('wood'), ['Wooden decks'])
+        self.assertEqual(self.search('wood deck'), ['Wooden decks'])
+        self.assertEqual(self.search('wood ant'), [])
+        self.assertEqual(self.search('"ant*'), ['Ant colonies'])
+
+    def test_postgres_tsquery_quotes_input(self):
+        self.assertEqual(PostgresSearchBackend.tsquery(['wood', "deck's", '&|!']), 'wood:* & deck:* & s:*')
+
+
+class LikedStateTests(TestCase):
+    """
+    is_liked is resolved for a whole page at once; /posts/liked/ lists a user's likes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.reader = User.objects.create_user(email='reader@example.com', username='reader', password='x')
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.posts = [
+            BlogPost.objects.create(
+                title=f'Post {index}', excerpt='Excerpt', content='Body', author=author, status='published'
+            )
+            for index in range(3)
+        ]
+        for post in cls.posts[:2]:
+            BlogLike.objects.create(post=post, user=cls.reader)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def test_page_resolved_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/blog/posts/')
+        liked = {post['title']: post['is_liked'] for post in response.json()['results']}
+        self.assertEqual(liked, {'Post 0': True, 'Post 1': True, 'Post 2': False})
+        like_queries = [query for query in queries if 'FROM "blog_likes"' in query['sql']]
+        self.assertEqual(len(like_queries), 1)
+
+    def test_liked_posts(self):
+        BlogLike.objects.filter(post=self.posts[0]).update(created_at=timezone.now() + datetime.timedelta(1))
+        response = self.client.get('/api/v1/blog/posts/liked/')
+        self.assertEqual([post['title'] for post in response.json()['results']], ['Post 0', 'Post 1'])
+        self.assertEqual(APIClient().get('/api/v1/blog/posts/liked/').status_code, 401)
+
+
+class SlugResolverTests(TestCase):
+    """
+    Slugs resolve through the local and shared caches and follow post saves.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=author, status='published'
+        )
+
+    def setUp(self):
+        cache.clear()
+        slug_resolver.clear()
+
+    def test_tiers_and_invalidation(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(slug_resolver.resolve(self.post.slug).id, self.post.pk)
+            self.assertIsNone(slug_resolver.resolve('no-such-post'))
+        with self.assertNumQueries(0):
+            slug_resolver.resolve(self.post.slug)
+            slug_resolver.clear()
+            # Shared cache, including the cached miss
+            self.assertTrue(slug_resolver.resolve(self.post.slug).is_published)
+            self.assertIsNone(slug_resolver.resolve('no-such-post'))
+
+        old_slug = self.post.slug
+        self.post.slug = 'termites'
+        self.post.status = 'draft'
+        self.post.save()
+        self.assertIsNone(slug_resolver.resolve(old_slug))
+        self.assertFalse(slug_resolver.resolve('termites').is_published)
+        self.assertEqual(self.client.get('/api/v1/blog/posts/termites/').status_code, 404)
+
+
+class MaterializedListTests(TestCase):
+    """
+    Featured and latest lists are served from cache and refreshed after commit.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        now = timezone.now()
+        cls.featured, cls.plain = [
+            BlogPost.objects.create(
+                title=title, excerpt='Excerpt', content='Body', author=author, status='published',
+                is_featured=is_featured, published_at=now - datetime.timedelta(hours=hours)
+            )
+            for title, is_featured, hours in (('Featured', True, 2), ('Plain', False, 1))
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self, name):
+        response = self.client.get(f'/api/v1/blog/posts/{name}/')
+        self.assertEqual(response.status_code, 200)
+        return [post['title'] for post in response.json()['results']]
+
+    def test_lists_follow_membership_and_cards(self):
+        self.assertEqual(self.titles('featured'), ['Featured'])
+        self.assertEqual(self.titles('latest'), ['Plain', 'Featured'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plain.is_featured = True
+            self.plain.save()
+        self.assertEqual(get_list('featured')['ids'], [self.plain.pk, self.featured.pk])
+        self.assertEqual(self.titles('featured'), ['Plain', 'Featured'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.featured.title = 'Renamed'
+            self.featured.save()
+        self.assertEqual(self.titles('featured'), ['Plain', 'Renamed'])
+        self.assertEqual(self.titles('latest'), ['Plain', 'Renamed'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.featured.is_deleted = True
+            self.featured.save()
+        self.assertEqual(self.titles('latest'), ['Plain'])
+
+
+@override_settings(BLOG_TRENDING_WINDOW_DAYS=7, BLOG_TRENDING_HALF_LIFE_DAYS=2)
+class TrendingTests(TestCase):
+    """
+    Trending ranks posts by daily views weighted by exponential decay.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.posts = {
+            title: BlogPost.objects.create(
+                title=title, excerpt='Excerpt', content='Body', author=author, status=status
+            )
+            for title, status in (('Fresh', 'published'), ('Old', 'published'), ('Draft', 'draft'))
+        }
+
+    def setUp(self):
+        cache.clear()
+
+    def test_decay(self):
+        today = timezone.localdate()
+        add_daily_views({
+            (self.posts['Fresh'].pk, today): 10,
+            # Four days back at a two-day half-life: worth a quarter
+            (self.posts['Old'].pk, today - datetime.timedelta(days=4)): 60,
+            (self.posts['Old'].pk, today - datetime.timedelta(days=7)): 1000,
+            (self.posts['Draft'].pk, today): 500,
+        })
+        add_daily_views({(self.posts['Fresh'].pk, today): 2})
+        self.assertEqual(decay_weight(4, 2), 0.25)
+
+        ranking = compute_trending(today)
+        self.assertEqual(
+            [(post_id, round(score, 6)) for post_id, score in ranking],
+            [(self.posts['Old'].pk, 15.0), (self.posts['Fresh'].pk, 12.0)]
+        )
+        # Four days on, the old views have left the window
+        self.assertEqual(compute_trending(today + datetime.timedelta(days=4)), [(self.posts['Fresh'].pk, 3.0)])
+        response = self.client.get('/api/v1/blog/posts/trending/')
+        self.assertEqual([post['title'] for post in response.json()['results']], ['Old', 'Fresh'])
+
+
+class SnapshotTests(TestCase):
+    """
+    Post snapshots are upserted, dropped when unpublished, and follow author edits.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create_user(
+            email='author@example.com', username='author', password='x', first_name='Ada'
+        )
+        cls.post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=cls.author, status='published'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def list_authors(self):
+        response = self.client.get('/api/v1/blog/posts/')
+        return [post['author']['first_name'] for post in response.json()['results']], response
+
+    def test_rebuild_upserts_and_drops_unpublished(self):
+        self.assertEqual(rebuild_snapshots([self.post.pk]), 1)
+        self.assertEqual(rebuild_snapshots([self.post.pk]), 1)
+        snapshot = BlogPostSnapshot.objects.get()
+        self.assertEqual(snapshot.card['title'], 'Termite season')
+        self.assertEqual(snapshot.source_updated_at, self.post.updated_at)
+
+        BlogPost.objects.filter(pk=self.post.pk).update(status='draft')
+        self.assertEqual(rebuild_snapshots([self.post.pk]), 0)
+        self.assertFalse(BlogPostSnapshot.objects.exists())
+
+    def test_author_edit_rebuilds_and_expires_lists(self):
+        rebuild_snapshots([self.post.pk])
+        self.assertEqual(self.list_authors()[0], ['Ada'])
+        self.assertEqual(self.list_authors()[1]['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.first_name = 'Grace'
+            self.author.save()
+        self.assertEqual(BlogPostSnapshot.objects.get().card['author']['first_name'], 'Grace')
+        names, response = self.list_authors()
+        self.assertEqual(names, ['Grace'])
+        self.assertFalse(response.has_header('X-Cache'))
+
+
+class CommentThreadTests(TestCase):
+    """
+    Comment threads are inlined three levels deep and load without per-node queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        cls.post = BlogPost.objects.create(
+            title='Termite season', excerpt='Excerpt', content='Body', author=author, status='published'
+        )
+
+        def reply(parent, content):
+            return Comment.objects.create(post=cls.post, author=author, parent=parent, content=content)
+
+        cls.root = reply(None, 'root')
+        cls.first = reply(cls.root, 'first')
+        parent = cls.first
+        for level in range(2, 7):
+            parent = reply(parent, f'level {level}')
+        second = reply(cls.root, 'second')
+        for index in range(5):
+            reply(second, f'second {index}')
+
+    def setUp(self):
+        cache.clear()
+        slug_resolver.clear()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def chain(self, comment):
+        """Contents along the first inlined reply at each level."""
+        contents = [comment['content']]
+        while comment['replies']:
+            comment = comment['replies'][0]
+            contents.append(comment['content'])
+        return contents, comment['replies_count']
+
+    def test_depth_capped_at_three(self):
+        self.get(f'/api/v1/blog/posts/{self.post.slug}/comments/')
+        with self.assertNumQueries(3):
+            comments = self.get(f'/api/v1/blog/posts/{self.post.slug}/comments/')
+        self.assertEqual([reply['content'] for reply in comments[0]['replies']], ['second', 'first'])
+        first = next(reply for reply in comments[0]['replies'] if reply['content'] == 'first')
+        self.assertEqual(self.chain(first), (['first', 'level 2', 'level 3'], 1))
+
+    def test_replies_load_only_their_subtrees(self):
+        url = f'/api/v1/blog/posts/{self.post.slug}/comments/{self.first.pk}/replies/'
+        self.get(url)
+        # Parent, page count and rows, then one query per level below them
+        with self.assertNumQueries(7):
+            replies = self.get(url)
+        self.assertEqual(self.chain(replies[0]), (['level 2', 'level 3', 'level 4', 'level 5'], 1))
+
+        replies = self.get(f'/api/v1/blog/posts/{self.post.slug}/comments/{self.root.pk}/replies/')
+        self.assertEqual([reply['content'] for reply in replies], ['second', 'first'])
+        self.assertEqual(replies[0]['replies_count'], 5)
+
+
+class DashboardStatsTests(TestCase):
+    """
+    Admin dashboard counts over a rolling ?days= window.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='x', is_staff=True
+        )
+        cls.author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        old = BlogPost.objects.create(title='Old post', excerpt='Excerpt', content='Body', author=cls.author)
+        BlogPost.objects.filter(pk=old.pk).update(created_at=timezone.now() - datetime.timedelta(days=45))
+        BlogPost.objects.create(title='New post', excerpt='Excerpt', content='Body', author=cls.author)
+        BlogPost.objects.create(
+            title='Deleted post', excerpt='Excerpt', content='Body', author=cls.author, is_deleted=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def stats(self, **params):
+        response = self.client.get('/api/v1/admin/dashboard/stats/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_rolling_window(self):
+        with self.assertNumQueries(5):
+            stats = self.stats()
+        self.assertEqual((stats['days'], stats['total_posts'], stats['recent_posts']), (30, 2, 1))
+        self.assertEqual(self.stats(days=60)['recent_posts'], 2)
+        self.assertEqual(self.client.get('/api/v1/admin/dashboard/stats/', {'days': 'x'}).status_code, 400)
+
+    def test_cached_until_write(self):
+        self.stats()
+        with self.assertNumQueries(0):
+            self.stats()
+        BlogPost.objects.create(title='Another post', excerpt='Excerpt', content='Body', author=self.author)
+        self.assertEqual(self.stats()['recent_posts'], 2)
@@ -0,0 +1,80 @@
+"""
+In-memory assembly of comment threads.
+
+Every comment stores its thread root and depth, so the visible replies below a
+page of top-level comments load with one indexed query on `root_id` and are
+grouped by parent in Python instead of being queried node by node. Below a
+page of replies, only their own subtrees are loaded, one `parent_id IN (...)`
+query per inlined level.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+
+from apps.common.serializers import readable_field_names
+from .models import Comment
+
+
+def max_reply_depth():
+    """Reply levels inlined below a listed comment; deeper ones use the replies endpoint."""
+    return getattr(settings, 'BLOG_COMMENT_MAX_DEPTH', 3)
+
+
+def max_inline_replies():
+    """Replies inlined per comment; the rest are paginated via the replies endpoint."""
+    return getattr(settings, 'BLOG_COMMENT_MAX_REPLIES', 10)
+
+
+def visible_comments():
+    return Comment.objects.filter(is_approved=True, is_deleted=False)
+
+
+def build_reply_map(comments):
+    """Group comments by parent id, keeping their query order."""
+    reply_map = defaultdict(list)
+    for comment in comments:
+        reply_map[comment.parent_id].append(comment)
+    return reply_map
+
+
+def _subtree_levels(parent_ids, levels):
+    """Visible descendants of the given comments, `levels` deep, one query per level."""
+    descendants = []
+    for _ in range(levels):
+        if not parent_ids:
+            break
+        level = list(visible_comments().filter(parent_id__in=parent_ids).select_related('author'))
+        descendants.extend(level)
+        parent_ids = [comment.pk for comment in level]
+    return descendants
+
+
+def thread_context(comments, base_depth):
+    """
+    Serializer context that lets CommentSerializer render replies without queries.
+
+    `comments` are the listed comments, all at `base_depth`. Descendants are
+    loaded one level beyond the inline depth so that replies_count is also
+    correct on the deepest level shown: with one query on `root_id` when the
+    listed comments are thread roots, else level by level below them.
+    """
+    depth_limit = base_depth + max_reply_depth()
+    if not comments:
+        descendants = []
+    elif base_depth == 0:
+        descendants = visible_comments().filter(
+            root_id__in=[comment.pk for comment in comments],
+            depth__lte=depth_limit + 1
+        ).select_related('author')
+    else:
+        descendants = _subtree_levels([comment.pk for comment in comments], max_reply_depth() + 1)
+    return {
+        'reply_map': build_reply_map(descendants),
+        'reply_depth_limit': depth_limit,
+        'max_replies': max_inline_replies(),
+    }
+
+
+def needs_thread(serializer):
+    """Whether the serializer outputs replies, so thread_context is worth loading."""
+    return bool({'replies', 'replies_count'} & set(readable_field_names(serializer)))
@@ -0,0 +1,105 @@
+"""
+Daily view buckets and trending posts.
+
+The view counter buffer writes each flushed batch into one row per post per
+day (`blog_post_daily_views`) alongside `views_count`, so collecting buckets
+adds no write to the request path. Trending posts are ranked by their
+bucketed views over a recent window, each day weighted by an exponential
+decay with a configurable half-life; the ranking is cached.
+"""
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.utils import timezone
+from apps.common.cache import get_or_fill
+from apps.common.counters import increment_rows
+from .models import BlogPost, BlogPostDailyViews
+
+TRENDING_KEY = 'blog:trending'
+
+
+def trending_window_days():
+    return getattr(settings, 'BLOG_TRENDING_WINDOW_DAYS', 14)
+
+
+def trending_half_life_days():
+    return getattr(settings, 'BLOG_TRENDING_HALF_LIFE_DAYS', 2)
+
+
+def trending_limit():
+    return getattr(settings, 'BLOG_TRENDING_LIMIT', 10)
+
+
+def trending_cache_timeout():
+    return getattr(settings, 'BLOG_TRENDING_CACHE_TIMEOUT', 300)
+
+
+def view_bucket_retention_days():
+    return getattr(settings, 'BLOG_VIEW_BUCKET_RETENTION_DAYS', 90)
+
+
+def add_daily_views(deltas):
+    """
+    Add a {(post_id, day): views} batch to the daily buckets, one
+    increment_rows() pass per day.
+    """
+    post_ids = {post_id for post_id, _ in deltas}
+    # Posts deleted since the view was recorded would violate the foreign key
+    existing = set(BlogPost.objects.filter(pk__in=post_ids).values_list('pk', flat=True))
+
+    by_day = defaultdict(dict)
+    for (post_id, day), amount in deltas.items():
+        if amount and post_id in existing:
+            by_day[day][(post_id,)] = by_day[day].get((post_id,), 0) + amount
+
+    for day, amounts in by_day.items():
+        increment_rows(BlogPostDailyViews, 'views', amounts, ('post_id',), day=day)
+
+
+def decay_weight(age_days, half_life_days):
+    """Weight of views `age_days` old: halves every `half_life_days`."""
+    return 0.5 ** (age_days / half_life_days)
+
+
+def compute_trending(today=None, limit=None):
+    """
+    Return [(post_id, score)] for published posts, highest score first. The
+    score is the sum of each day's views times its decay weight, computed in
+    a single grouped query over the window's buckets.
+    """
+    today = today or timezone.localdate()
+    window = trending_window_days()
+    half_life = trending_half_life_days()
+    weight = Case(
+        *[
+            When(day=today - datetime.timedelta(days=age), then=Value(decay_weight(age, half_life)))
+            for age in range(window)
+        ],
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+    rows = BlogPostDailyViews.objects.filter(
+        day__gt=today - datetime.timedelta(days=window),
+        day__lte=today,
+        post__status='published',
+        post__is_deleted=False
+    ).values('post_id').annotate(
+        score=Sum(F('views') * weight, output_field=FloatField())
+    ).order_by('-score', '-post_id').values_list('post_id', 'score')
+    return list(rows[:limit or trending_limit()])
+
+
+def get_trending():
+    """The cached trending ranking, recomputed at most once at a time."""
+    return get_or_fill(TRENDING_KEY, compute_trending, trending_cache_timeout())
+
+
+def prune_view_buckets(retention_days=None, today=None):
+    """Delete buckets older than the retention period. Returns the rows deleted."""
+    today = today or timezone.localdate()
+    retention_days = retention_days if retention_days is not None else view_bucket_retention_days()
+    cutoff = today - datetime.timedelta(days=retention_days)
+    deleted, _ = BlogPostDailyViews.objects.filter(day__lt=cutoff).delete()
+    return deleted
@@ -15,11 +15,19 @@ urlpatterns = [
     path('posts/', views.BlogPostListView.as_view(), name='post-list'),
     path('posts/create/', views.BlogPostCreateView.as_view(), name='post-create'),
     path('posts/featured/', views.FeaturedBlogPostsView.as_view(), name='featured-posts'),
+    path('posts/latest/', views.LatestBlogPostsView.as_view(), name='latest-posts'),
+    path('posts/trending/', views.TrendingBlogPostsView.as_view(), name='trending-posts'),
+    path('posts/liked/', views.LikedBlogPostsView.as_view(), name='liked-posts'),
     path('posts/<slug:slug>/', views.BlogPostDetailView.as_view(), name='post-detail'),
     path('posts/<slug:slug>/related/', views.RelatedBlogPostsView.as_view(), name='related-posts'),
     
     # Comments
     path('posts/<slug:slug>/comments/', views.BlogPostCommentsView.as_view(), name='post-comments'),
+    path(
+        'posts/<slug:slug>/comments/<int:pk>/replies/',
+        views.CommentRepliesView.as_view(),
+        name='comment-replies'
+    ),
     
     # Likes
     path('posts/<slug:slug>/like/', views.toggle_blog_like, name='toggle-like'),
@@ -0,0 +1,56 @@
+"""
+Write-behind buffer for blog post view counts.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from apps.common.buffers import BufferedCounter
+from apps.common.cache import model_label, touch
+from .counters import apply_count_deltas
+from .models import BlogPost
+from .trending import add_daily_views
+from .visitors import add_daily_visitors
+
+
+class ViewCountBuffer(BufferedCounter):
+    """
+    Collects post views in process, keyed by (post_id, day, visitor_hash),
+    and writes each batch in one transaction: batched `UPDATE ... SET
+    views_count = views_count + CASE ... END` statements, the daily view
+    buckets and the buckets' visitor sketches (plus unique_views_count).
+    Batches are only written from the flush thread, never by a request.
+    After each batch commits the BlogPost change stamp is moved, since the
+    UPDATEs send no signals, so the flush interval also bounds how often
+    view counts expire cached post responses.
+    """
+    name = 'blog-views'
+    max_size_setting = 'BLOG_VIEW_BUFFER_MAX_SIZE'
+    flush_interval_setting = 'BLOG_VIEW_BUFFER_FLUSH_INTERVAL'
+    background_flush = True
+
+    def write(self, batch):
+        totals = Counter()
+        daily = Counter()
+        visitors = defaultdict(set)
+        for (post_id, day, visitor), amount in batch.items():
+            totals[post_id] += amount
+            daily[post_id, day] += amount
+            if visitor is not None:
+                visitors[post_id, day].add(visitor)
+        with transaction.atomic():
+            apply_count_deltas('views_count', totals)
+            add_daily_views(daily)
+            apply_count_deltas('unique_views_count', add_daily_visitors(visitors))
+        touch(model_label(BlogPost))
+
+
+view_count_buffer = ViewCountBuffer()
+
+
+def record_view(post_id, visitor=None):
+    """
+    Count a view of the given post without writing on the request path.
+    `visitor` is a visitors.visitor_hash() value; None counts no visitor.
+    """
+    view_count_buffer.add((post_id, timezone.localdate(), visitor))
@@ -1,12 +1,15 @@
 """
 Views for the blog app.
 """
-from rest_framework import generics, status, permissions, filters
+from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, F
+from django.http import Http404
+from apps.common.cache import get_change_stamps, model_label
+from apps.common.mixins import CachedResponseMixin, ConditionalGetMixin, ProjectionMixin
+from apps.common.serializers import readable_field_names
 from .models import Category, Tag, BlogPost, Comment, BlogLike
 from .serializers import (
     CategorySerializer,
@@ -18,38 +21,127 @@ from .serializers import (
     CommentCreateSerializer,
     BlogLikeSerializer
 )
-from .filters import BlogPostFilter
+from .filters import BlogPostFilter, BlogPostSearchFilter, BlogPostOrderingFilter
+from .pagination import BlogPostPagination
+from .threads import needs_thread, thread_context, visible_comments
+from .view_counter import record_view
+from .visitors import visitor_hash
+from .like_counter import record_like
+from .materialized import get_list, list_limit, list_queryset, live_rows
+from .slugs import get_published_post_or_404, slug_resolver
+from .snapshots import (
+    VOLATILE_FIELDS,
+    fresh_snapshot,
+    overlay,
+    queue_snapshot_rebuild,
+    snapshot_covers,
+    snapshot_queryset,
+    splice,
+)
+from .stats import get_blog_stats
+from .trending import get_trending
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
     """
     List all active blog categories.
     """
+    change_stamp_models = (Category, BlogPost)
     queryset = Category.objects.filter(is_active=True, is_deleted=False)
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
 
 
-class TagListView(generics.ListAPIView):
+class TagListView(CachedResponseMixin, ConditionalGetMixin, generics.ListAPIView):
     """
     List all blog tags.
     """
+    change_stamp_models = (Tag,)
     queryset = Tag.objects.filter(is_deleted=False)
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
 
 
-class BlogPostListView(generics.ListAPIView):
+class LikedPostsMixin:
+    """
+    Resolve the requester's liked state for every serialized post in one
+    `post_id IN (...)` query and pass it to the serializer as `liked_post_ids`.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if args and self.request.method == 'GET' and 'is_liked' in readable_field_names(serializer):
+            serializer.context['liked_post_ids'] = self.get_liked_post_ids(args[0])
+        return serializer
+
+    def get_liked_post_ids(self, posts):
+        """Ids of the given posts (instances or ids) liked by the requesting user."""
+        user = self.request.user
+        if not user.is_authenticated:
+            return set()
+        if isinstance(posts, BlogPost):
+            posts = [posts]
+        return set(
+            BlogLike.objects.filter(
+                user=user,
+                post_id__in=[getattr(post, 'pk', post) for post in posts]
+            ).values_list('post_id', flat=True)
+        )
+
+
+class PostSnapshotMixin(LikedPostsMixin):
+    """
+    Build post representations from pre-rendered snapshots.
+
+    Posts without a current snapshot are serialized normally (and queued for
+    a background snapshot rebuild), so responses never depend on the
+    snapshot table being complete.
+    """
+    snapshot_kind = 'card'
+
+    def serialize_posts(self, posts):
+        """Representations of the given snapshot-queryset posts, in order."""
+        fields = self.get_serializer().fields
+        names = readable_field_names(fields)
+        liked_post_ids = self.get_liked_post_ids(posts) if 'is_liked' in names else set()
+        stale_ids = [post.pk for post in posts if fresh_snapshot(post) is None]
+        # Expanded fields are not in the snapshots: serialize the whole page
+        render_ids = stale_ids if snapshot_covers(self.snapshot_kind, names) else [post.pk for post in posts]
+        rendered = {}
+        if render_ids:
+            full_posts = list(self.filter_queryset(self.get_queryset()).filter(pk__in=render_ids))
+            serializer = super(LikedPostsMixin, self).get_serializer(full_posts, many=True)
+            serializer.context['liked_post_ids'] = liked_post_ids
+            rendered = dict(zip((post.pk for post in full_posts), serializer.data))
+        queue_snapshot_rebuild(stale_ids)
+        return [
+            rendered[post.pk] if post.pk in rendered
+            else splice(post, self.snapshot_kind, self.request, liked_post_ids, fields)
+            for post in posts
+        ]
+
+
+# Models rendered by the post list serializers. Buffered view and like counts
+# are written with UPDATE; their buffers touch BlogPost after each flush.
+POST_LIST_STAMP_MODELS = (BlogPost, Category, Tag, Comment, BlogLike)
+
+
+class BlogPostListView(
+    CachedResponseMixin, ConditionalGetMixin, PostSnapshotMixin, ProjectionMixin, generics.ListAPIView
+):
     """
     List all published blog posts with filtering and search.
     """
+    change_stamp_models = POST_LIST_STAMP_MODELS
+    vary_on_user = True
     serializer_class = BlogPostListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, BlogPostSearchFilter, BlogPostOrderingFilter]
     filterset_class = BlogPostFilter
     search_fields = ['title', 'excerpt', 'content']
-    ordering_fields = ['created_at', 'published_at', 'views_count', 'likes_count']
+    ordering_fields = ['created_at', 'published_at', 'views_count', 'unique_views_count', 'likes_count']
     ordering = ['-published_at']
+    pagination_class = BlogPostPagination
 
     def get_queryset(self):
         """Get published blog posts."""
@@ -58,14 +150,60 @@ class BlogPostListView(generics.ListAPIView):
             is_deleted=False
         ).select_related('author', 'category').prefetch_related('tags')
 
+    def list(self, request, *args, **kwargs):
+        """List a page of posts spliced from their snapshots."""
+        queryset = snapshot_queryset(self.filter_queryset(self.get_queryset()), self.snapshot_kind)
+        page = self.paginate_queryset(queryset)
+        posts = page if page is not None else list(queryset)
+        data = self.serialize_posts(posts)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
 
-class BlogPostDetailView(generics.RetrieveAPIView):
+class BlogPostDetailView(ConditionalGetMixin, PostSnapshotMixin, generics.RetrieveAPIView):
     """
     Retrieve a single blog post by slug.
     """
     serializer_class = BlogPostDetailSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug'
+    change_stamp_models = (Category, Tag)
+    vary_on_user = True
+    snapshot_kind = 'detail'
+
+    def get_validator_parts(self, request):
+        """
+        Version the post on its own row, including every counter the body
+        shows, its author's row and its category's posts_count, plus the
+        stamps of the models it embeds. Counters carry no timestamp, so the
+        post's Last-Modified is the BlogPost stamp, which every post save
+        and counter flush moves.
+        """
+        post_id = get_published_post_or_404(self.kwargs['slug']).id
+        row = BlogPost.objects.filter(pk=post_id).values_list(
+            'updated_at', 'author__updated_at', 'category__posts_count', *VOLATILE_FIELDS
+        ).first()
+        if row is None:
+            raise Http404
+        self.conditional_post_id = post_id
+        post_stamp = get_change_stamps([model_label(BlogPost)])[model_label(BlogPost)]
+        parts = [
+            ('post', ':'.join([str(post_id), *map(str, row)]), max(row[0].timestamp(), post_stamp)),
+        ]
+        parts.extend(super().get_validator_parts(request))
+        if request.user.is_authenticated:
+            parts.extend(self._like_stamp(request))
+        return parts
+
+    def _like_stamp(self, request):
+        """`is_liked` changes with BlogLike rows."""
+        stamps = get_change_stamps([model_label(BlogLike)])
+        return [(label, repr(stamp), None) for label, stamp in stamps.items()]
+
+    def not_modified(self, request):
+        """A revalidated read is still a view."""
+        record_view(self.conditional_post_id, visitor_hash(request))
 
     def get_queryset(self):
         """Get published blog posts."""
@@ -74,17 +212,19 @@ class BlogPostDetailView(generics.RetrieveAPIView):
             is_deleted=False
         ).select_related('author', 'category').prefetch_related('tags')
 
+    def get_object(self):
+        """Fetch the post (snapshot columns only) by the id its slug resolves to."""
+        post = get_published_post_or_404(self.kwargs['slug'])
+        return get_object_or_404(snapshot_queryset(self.get_queryset(), self.snapshot_kind), pk=post.id)
+
     def retrieve(self, request, *args, **kwargs):
         """Retrieve blog post and increment view count."""
         instance = self.get_object()
-        
-        # Increment view count
-        BlogPost.objects.filter(id=instance.id).update(
-            views_count=F('views_count') + 1
-        )
-        
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+
+        # Increment view and unique-visitor counts (buffered, flushed in batches)
+        record_view(instance.id, visitor_hash(request))
+
+        return Response(self.serialize_posts([instance])[0])
 
 
 class BlogPostCreateView(generics.CreateAPIView):
@@ -95,23 +235,86 @@ class BlogPostCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class FeaturedBlogPostsView(generics.ListAPIView):
+class MaterializedPostListView(
+    CachedResponseMixin, ConditionalGetMixin, LikedPostsMixin, ProjectionMixin, generics.ListAPIView
+):
+    """
+    List the posts of a materialized list (see materialized.py) from cache.
+    """
+    materialized_list = None
+    change_stamp_models = POST_LIST_STAMP_MODELS
+    vary_on_user = True
+    serializer_class = BlogPostListSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        """The list's posts queried in full, for fields the cached cards lack."""
+        return list_queryset(self.materialized_list)[:list_limit(self.materialized_list)]
+
+    def list(self, request, *args, **kwargs):
+        """List the cached cards with live counters and liked state overlaid."""
+        fields = self.get_serializer().fields
+        names = readable_field_names(fields)
+        if not snapshot_covers('card', names):
+            return super().list(request, *args, **kwargs)
+
+        materialized = get_list(self.materialized_list)
+        page = self.paginate_queryset(materialized['ids'])
+        post_ids = page if page is not None else materialized['ids']
+        live = live_rows(post_ids)
+        liked_post_ids = self.get_liked_post_ids(post_ids) if 'is_liked' in names else set()
+        data = [
+            overlay(materialized['cards'][pk], 'card', live[pk], request, liked_post_ids, fields)
+            for pk in post_ids if pk in live
+        ]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class FeaturedBlogPostsView(MaterializedPostListView):
     """
     List featured blog posts.
     """
+    materialized_list = 'featured'
+
+
+class LatestBlogPostsView(MaterializedPostListView):
+    """
+    List the most recently published blog posts.
+    """
+    materialized_list = 'latest'
+
+
+class TrendingBlogPostsView(PostSnapshotMixin, ProjectionMixin, generics.ListAPIView):
+    """
+    List published posts ranked by recent, time-decayed views.
+    """
     serializer_class = BlogPostListSerializer
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
-        """Get featured published blog posts."""
+        """Get published blog posts."""
         return BlogPost.objects.filter(
             status='published',
-            is_featured=True,
             is_deleted=False
-        ).select_related('author', 'category').prefetch_related('tags')[:6]
-
+        ).select_related('author', 'category').prefetch_related('tags')
 
-class RelatedBlogPostsView(generics.ListAPIView):
+    def list(self, request, *args, **kwargs):
+        """List the cached ranking, spliced from snapshots, in rank order."""
+        ranked_ids = [post_id for post_id, _ in get_trending()]
+        page = self.paginate_queryset(ranked_ids)
+        post_ids = page if page is not None else ranked_ids
+        posts = snapshot_queryset(
+            self.filter_queryset(self.get_queryset()).filter(pk__in=post_ids), self.snapshot_kind
+        ).in_bulk()
+        data = self.serialize_posts([posts[pk] for pk in post_ids if pk in posts])
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class RelatedBlogPostsView(LikedPostsMixin, ProjectionMixin, generics.ListAPIView):
     """
     Get related blog posts based on category and tags.
     """
@@ -119,23 +322,35 @@ class RelatedBlogPostsView(generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
-        """Get related blog posts."""
-        slug = self.kwargs.get('slug')
-        try:
-            current_post = BlogPost.objects.get(slug=slug, status='published', is_deleted=False)
-        except BlogPost.DoesNotExist:
+        """Get the best-ranked related posts from the precomputed index."""
+        post = slug_resolver.resolve(self.kwargs.get('slug'))
+        if post is None or not post.is_published:
             return BlogPost.objects.none()
-
-        # Get posts from same category or with similar tags
         related_posts = BlogPost.objects.filter(
-            Q(category=current_post.category) | Q(tags__in=current_post.tags.all()),
+            related_to_entries__post_id=post.id,
             status='published',
             is_deleted=False
-        ).exclude(id=current_post.id).distinct()
+        ).order_by('-related_to_entries__score')
 
         return related_posts.select_related('author', 'category').prefetch_related('tags')[:4]
 
 
+class LikedBlogPostsView(LikedPostsMixin, ProjectionMixin, generics.ListAPIView):
+    """
+    List the published posts the current user liked, most recent like first.
+    """
+    serializer_class = BlogPostListSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """Get published posts liked by the user (uses the (user, created_at) index)."""
+        return BlogPost.objects.filter(
+            likes__user=self.request.user,
+            status='published',
+            is_deleted=False
+        ).order_by('-likes__created_at').select_related('author', 'category').prefetch_related('tags')
+
+
 class BlogPostCommentsView(generics.ListCreateAPIView):
     """
     List and create comments for a blog post.
@@ -150,25 +365,30 @@ class BlogPostCommentsView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         """Get approved comments for the blog post."""
-        slug = self.kwargs.get('slug')
         return Comment.objects.filter(
-            post__slug=slug,
-            post__status='published',
+            post_id=get_published_post_or_404(self.kwargs.get('slug')).id,
             is_approved=True,
             is_deleted=False,
             parent=None  # Only top-level comments
-        ).select_related('author', 'post').prefetch_related('replies')
+        ).select_related('author')
+
+    def list(self, request, *args, **kwargs):
+        """List a page of top-level comments with their replies loaded in one query."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        comments = page if page is not None else list(queryset)
+
+        serializer = self.get_serializer(comments, many=True)
+        if needs_thread(serializer):
+            serializer.context.update(thread_context(comments, base_depth=0))
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     def get_serializer_context(self):
-        """Add post to serializer context."""
+        """Add the post id to serializer context."""
         context = super().get_serializer_context()
-        slug = self.kwargs.get('slug')
-        context['post'] = get_object_or_404(
-            BlogPost,
-            slug=slug,
-            status='published',
-            is_deleted=False
-        )
+        context['post_id'] = get_published_post_or_404(self.kwargs.get('slug')).id
         return context
 
     def create(self, request, *args, **kwargs):
@@ -181,44 +401,73 @@ class BlogPostCommentsView(generics.ListCreateAPIView):
         return super().create(request, *args, **kwargs)
 
 
+class CommentRepliesView(generics.ListAPIView):
+    """
+    List the direct replies of a comment, with their own replies inlined.
+    """
+    serializer_class = CommentSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_parent_comment(self):
+        """Get the approved comment whose replies are listed."""
+        return get_object_or_404(
+            Comment,
+            pk=self.kwargs.get('pk'),
+            post_id=get_published_post_or_404(self.kwargs.get('slug')).id,
+            is_approved=True,
+            is_deleted=False
+        )
+
+    def get_queryset(self):
+        """Get approved direct replies of the comment."""
+        return visible_comments().filter(parent=self.parent_comment).select_related('author')
+
+    def list(self, request, *args, **kwargs):
+        """List a page of replies with their own subtrees loaded level by level."""
+        self.parent_comment = self.get_parent_comment()
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        replies = page if page is not None else list(queryset)
+
+        serializer = self.get_serializer(replies, many=True)
+        if needs_thread(serializer):
+            serializer.context.update(thread_context(replies, base_depth=self.parent_comment.depth + 1))
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+
 @api_view(['POST', 'DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def toggle_blog_like(request, slug):
     """
     Toggle like status for a blog post.
     """
-    try:
-        blog_post = BlogPost.objects.get(
-            slug=slug,
-            status='published',
-            is_deleted=False
-        )
-    except BlogPost.DoesNotExist:
+    blog_post = slug_resolver.resolve(slug)
+    if blog_post is None or not blog_post.is_published:
         return Response(
             {'error': 'Blog post not found'},
             status=status.HTTP_404_NOT_FOUND
         )
 
+    # get_or_create absorbs the IntegrityError of a concurrent double tap
     like, created = BlogLike.objects.get_or_create(
-        post=blog_post,
+        post_id=blog_post.id,
         user=request.user
     )
 
     if not created:
-        # Unlike the post
-        like.delete()
-        BlogPost.objects.filter(id=blog_post.id).update(
-            likes_count=F('likes_count') - 1
-        )
+        # Unlike the post; only the request that removed the row counts it
+        deleted, _ = BlogLike.objects.filter(pk=like.pk).delete()
+        if deleted:
+            record_like(blog_post.id, -1)
         return Response(
             {'message': 'Post unliked', 'is_liked': False},
             status=status.HTTP_200_OK
         )
     else:
-        # Like the post
-        BlogPost.objects.filter(id=blog_post.id).update(
-            likes_count=F('likes_count') + 1
-        )
+        # Like the post (likes_count is updated in batches)
+        record_like(blog_post.id, 1)
         return Response(
             {'message': 'Post liked', 'is_liked': True},
             status=status.HTTP_201_CREATED
@@ -231,15 +480,5 @@ def blog_stats(request):
     """
     Get blog statistics.
     """
-    stats = {
-        'total_posts': BlogPost.objects.filter(status='published', is_deleted=False).count(),
-        'total_categories': Category.objects.filter(is_active=True, is_deleted=False).count(),
-        'total_tags': Tag.objects.filter(is_deleted=False).count(),
-        'total_comments': Comment.objects.filter(is_approved=True, is_deleted=False).count(),
-        'featured_posts': BlogPost.objects.filter(
-            status='published',
-            is_featured=True,
-            is_deleted=False
-        ).count(),
-    }
+    stats = get_blog_stats()
     return Response(stats, status=status.HTTP_200_OK)
\ No newline at end of file
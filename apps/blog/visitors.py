@@ -0,0 +1,95 @@
+"""
+Unique-visitor counting with per-post, per-day HyperLogLog sketches.
+
+Post detail views identify the visitor (user id, else client address and
+user agent) and pass a 64-bit hash of it through the view counter buffer.
+On flush, each (post, day) bucket row's sketch absorbs that day's visitors
+and stores its new estimate in `unique_views`; the change is added to the
+post's `unique_views_count`. Refreshes and repeat visits on the same day
+therefore count once, and known crawlers are not counted at all. Sketches of
+several days merge into weekly or monthly distinct-visitor counts.
+"""
+import datetime
+import re
+from collections import defaultdict
+
+from django.db.models import Sum
+from django.utils import timezone
+from apps.common.hyperloglog import HyperLogLog, hash_value
+from apps.common.network import client_ip
+from .models import BlogPostDailyViews
+
+# User agents of crawlers, link previewers and uptime checks
+BOT_USER_AGENT = re.compile(
+    r'bot|crawl|spider|slurp|preview|facebookexternalhit|monitor|curl|wget|python-requests',
+    re.IGNORECASE
+)
+
+
+def visitor_hash(request):
+    """Hash identifying the requesting visitor, or None for crawlers."""
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    if BOT_USER_AGENT.search(user_agent):
+        return None
+    if request.user.is_authenticated:
+        return hash_value(f'user:{request.user.pk}')
+    return hash_value(f'anon:{client_ip(request)}|{user_agent}')
+
+
+def add_daily_visitors(visitors):
+    """
+    Merge a {(post_id, day): {visitor_hash, ...}} batch into the bucket rows'
+    sketches (rows must exist). Returns {post_id: change in unique views}.
+    """
+    by_day = defaultdict(dict)
+    for (post_id, day), hashes in visitors.items():
+        if hashes:
+            by_day[day][post_id] = hashes
+
+    deltas = defaultdict(int)
+    for day, hashes_by_post in by_day.items():
+        rows = list(
+            BlogPostDailyViews.objects.select_for_update().filter(
+                day=day, post_id__in=hashes_by_post
+            ).only('pk', 'post_id', 'visitors', 'unique_views')
+        )
+        changed = []
+        for row in rows:
+            sketch = HyperLogLog.from_bytes(row.visitors) if row.visitors else HyperLogLog()
+            if not any([sketch.add_hash(hashed) for hashed in hashes_by_post[row.post_id]]):
+                continue
+            unique_views = sketch.count()
+            deltas[row.post_id] += unique_views - row.unique_views
+            row.visitors = sketch.to_bytes()
+            row.unique_views = unique_views
+            changed.append(row)
+        BlogPostDailyViews.objects.bulk_update(changed, ['visitors', 'unique_views'])
+    return dict(deltas)
+
+
+def unique_visitors(post_id, start, end):
+    """Estimated distinct visitors of a post between two dates (inclusive)."""
+    sketch = HyperLogLog()
+    sketches = BlogPostDailyViews.objects.filter(
+        post_id=post_id, day__gte=start, day__lte=end, visitors__isnull=False
+    ).values_list('visitors', flat=True)
+    for data in sketches:
+        sketch.merge(HyperLogLog.from_bytes(bytes(data)))
+    return sketch.count()
+
+
+def unique_visitor_periods(post_id, today=None):
+    """Distinct visitors of a post today, over the last 7 days and over the last 30 days."""
+    today = today or timezone.localdate()
+    return {
+        'today': unique_visitors(post_id, today, today),
+        'last_7_days': unique_visitors(post_id, today - datetime.timedelta(days=6), today),
+        'last_30_days': unique_visitors(post_id, today - datetime.timedelta(days=29), today),
+    }
+
+
+def daily_unique_views(start, end):
+    """Sum of every post's daily distinct visitors between two dates (inclusive)."""
+    return BlogPostDailyViews.objects.filter(day__gte=start, day__lte=end).aggregate(
+        total=Sum('unique_views')
+    )['total'] or 0
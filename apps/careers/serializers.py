@@ -1,14 +1,15 @@
 from rest_framework import serializers
+from apps.common.serializers import DynamicFieldsMixin
 from .models import Job, JobApplication
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at')
 
 
-class JobApplicationSerializer(serializers.ModelSerializer):
+class JobApplicationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     job_details = JobSerializer(source='job', read_only=True)
 
     class Meta:
@@ -4,11 +4,16 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from apps.common.mixins import CachedResponseMixin, ProjectionMixin
+from apps.common.projection import project_queryset
 from .models import Job, JobApplication
 from .serializers import JobSerializer, JobApplicationSerializer
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(CachedResponseMixin, ProjectionMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
+    change_stamp_models = (Job,)
+    cache_actions = ('active',)
+    projection_actions = ('list',)
     serializer_class = JobSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'employment_type']
@@ -22,13 +27,13 @@ class JobViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def active(self, request):
-        active_jobs = self.queryset.filter(status='active')
+        active_jobs = project_queryset(self.queryset.filter(status='active'), self.get_serializer())
         serializer = self.get_serializer(active_jobs, many=True)
         return Response(serializer.data)
 
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
-    queryset = JobApplication.objects.all()
+class JobApplicationViewSet(ProjectionMixin, viewsets.ModelViewSet):
+    queryset = JobApplication.objects.select_related('job')
     serializer_class = JobApplicationSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['job']
@@ -7,4 +7,8 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     """Configuration for the common app."""
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.common'
\ No newline at end of file
+    name = 'apps.common'
+
+    def ready(self):
+        """Register signal handlers and system checks."""
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,193 @@
+"""
+In-process write-behind buffers for hot counters.
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_buffers = []
+
+
+def autoflush_enabled():
+    return getattr(settings, 'BUFFERED_COUNTER_AUTOFLUSH', True)
+
+
+class BufferedCounter:
+    """
+    Thread-safe counter buffer that writes accumulated increments in batches.
+
+    Increments are summed per key in memory and handed to `write()` when the
+    number of pending keys reaches the size threshold, every flush interval
+    (from a daemon thread), and at worker shutdown. A failed write puts its
+    batch back so every increment is written at least once.
+
+    Subclasses implement `write(batch)` and name the settings that hold the
+    thresholds. A flush interval of 0 disables buffering: every increment is
+    written immediately. With BUFFERED_COUNTER_AUTOFLUSH off (the test runner)
+    increments are only held until an explicit flush() or discard(). Buffers
+    with `background_flush` set never write on the caller's thread: a full
+    buffer wakes the flush thread instead, and a flush interval of 0 means
+    flushing as often as the thread can.
+    """
+    name = 'counter'
+    max_size_setting = None
+    flush_interval_setting = None
+    default_max_size = 500
+    default_flush_interval = 10
+    background_flush = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = Counter()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self.flush_count = 0
+        self.flushed_keys = 0
+        self.flushed_total = 0
+        self.failed_flushes = 0
+        self.last_flush_at = None
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        _buffers.append(self)
+
+    @property
+    def max_size(self):
+        return getattr(settings, self.max_size_setting or '', self.default_max_size)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, self.flush_interval_setting or '', self.default_flush_interval)
+
+    def write(self, batch):
+        """Persist a {key: amount} batch. Must be implemented by subclasses."""
+        raise NotImplementedError
+
+    def add(self, key, amount=1):
+        """Record an increment, flushing if the buffer is full."""
+        if not autoflush_enabled():
+            with self._lock:
+                self._pending[key] += amount
+            return
+
+        if self.flush_interval <= 0 and not self.background_flush:
+            self._write_batch({key: amount})
+            return
+
+        with self._lock:
+            self._pending[key] += amount
+            depth = len(self._pending)
+
+        self._ensure_flusher()
+        if depth >= self.max_size:
+            if self.background_flush:
+                self._wakeup.set()
+            else:
+                self.flush()
+
+    def flush(self):
+        """Write every pending increment. Returns the number of keys written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+            if not batch:
+                return 0
+            return self._write_batch(batch)
+
+    def discard(self):
+        """
+        Drop every pending increment without writing it. Returns the number
+        of keys dropped.
+        """
+        with self._lock:
+            dropped, self._pending = len(self._pending), Counter()
+        return dropped
+
+    def _write_batch(self, batch):
+        started = time.monotonic()
+        try:
+            self.write(dict(batch))
+        except Exception:
+            # Put the batch back so the next flush retries it
+            with self._lock:
+                self._pending.update(batch)
+            self.failed_flushes += 1
+            logger.exception('Flushing %s buffer failed; %d keys re-queued', self.name, len(batch))
+            return 0
+
+        elapsed = time.monotonic() - started
+        self.flush_count += 1
+        self.flushed_keys += len(batch)
+        self.flushed_total += sum(batch.values())
+        self.last_flush_at = time.time()
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        logger.debug('Flushed %d keys from %s buffer in %.1f ms', len(batch), self.name, elapsed * 1000)
+        return len(batch)
+
+    def _ensure_flusher(self):
+        """Start the periodic flush thread once per process (also after fork)."""
+        if self._thread_pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run_flusher,
+                name=f'{self.name}-flusher',
+                daemon=True
+            )
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _run_flusher(self):
+        while True:
+            self._wakeup.wait(max(self.flush_interval, 0.1))
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def metrics(self):
+        """Buffer depth and flush latency for this worker process."""
+        with self._lock:
+            depth = len(self._pending)
+            pending = sum(self._pending.values())
+        return {
+            'name': self.name,
+            'pid': os.getpid(),
+            'buffer_depth': depth,
+            'pending_increments': pending,
+            'max_size': self.max_size,
+            'flush_interval': self.flush_interval,
+            'flush_count': self.flush_count,
+            'flushed_keys': self.flushed_keys,
+            'flushed_increments': self.flushed_total,
+            'failed_flushes': self.failed_flushes,
+            'last_flush_at': self.last_flush_at,
+            'last_flush_ms': round(self.last_flush_seconds * 1000, 2),
+            'max_flush_ms': round(self.max_flush_seconds * 1000, 2),
+        }
+
+
+def all_buffers():
+    """Every buffer created in this process."""
+    return list(_buffers)
+
+
+def flush_all():
+    """Flush every buffer; called from gunicorn's worker_exit hook."""
+    for buffer in _buffers:
+        try:
+            buffer.flush()
+        except Exception:
+            logger.exception('Flushing %s buffer at shutdown failed', buffer.name)
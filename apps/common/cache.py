@@ -0,0 +1,164 @@
+"""
+Cache helpers shared across apps.
+
+Every model has a change stamp: the time of its last write, kept in the
+default cache and bumped by the post_save, post_delete and m2m_changed
+handlers in apps.common.signals. Views version their conditional-GET
+validators (and cached payloads) on the stamps of the models they render.
+Writes through QuerySet.update() do not send signals, so code issuing them
+(e.g. the blog counter buffers) must touch() the model itself. Stamps must live in a cache shared by every worker (Redis): with a
+process-local cache a write only moves the stamp of the worker that handled
+it, so the others keep answering 304 and serving cached bodies for stale
+content (see the common.E001 check and gunicorn.conf.py).
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+STAMP_KEY = 'changestamp:{}'
+RESPONSE_KEY = 'response:{}'
+LOCK_KEY = 'fill-lock:{}'
+
+# Seconds a fill lock is held before another worker may take over, how long
+# a worker without the lock waits for the fill, and how often it polls
+FILL_LOCK_TIMEOUT = 30
+FILL_WAIT_TIMEOUT = 5
+FILL_POLL_INTERVAL = 0.05
+
+
+# Cache backends whose entries are private to one process
+PROCESS_LOCAL_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def cache_is_process_local():
+    """Whether the default cache is not shared between worker processes."""
+    return settings.CACHES.get('default', {}).get('BACKEND') in PROCESS_LOCAL_BACKENDS
+
+
+def response_cache_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+
+def response_cache_stale_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_STALE_TIMEOUT', 30)
+
+
+def model_label(model):
+    """Stable stamp name for a model class or instance, e.g. 'blog.blogpost'."""
+    return model._meta.label_lower
+
+
+def touch(*labels):
+    """Record that the given models changed now."""
+    now = time.time()
+    cache.set_many({STAMP_KEY.format(label): now for label in labels}, timeout=None)
+
+
+def get_change_stamps(labels):
+    """
+    Return {label: timestamp} for the given model labels.
+
+    A model with no stamp yet (cold cache) is stamped now, so stale copies
+    held by clients are treated as outdated.
+    """
+    keys = {label: STAMP_KEY.format(label) for label in labels}
+    found = cache.get_many(list(keys.values()))
+    stamps = {}
+    for label, key in keys.items():
+        if key in found:
+            stamps[label] = found[key]
+            continue
+        now = time.time()
+        # add() keeps a stamp another worker set in the meantime
+        if not cache.add(key, now, timeout=None):
+            now = cache.get(key, now)
+        stamps[label] = now
+    return stamps
+
+
+def versioned_key(name, labels):
+    """Cache key for `name`, versioned by the current change stamps of the given models."""
+    stamps = get_change_stamps(labels)
+    tokens = [f'{label}={stamps[label]!r}' for label in sorted(stamps)]
+    return f'{name}:{hashlib.md5("|".join(tokens).encode()).hexdigest()}'
+
+
+def response_cache_key(request, labels):
+    """
+    Cache key for a GET response: host, path, query params sorted by name,
+    Accept header, and the current change stamps of the given models.
+    """
+    stamps = get_change_stamps(labels)
+    query = sorted(request.GET.lists())
+    tokens = [
+        request.get_host(),
+        request.path,
+        repr(query),
+        request.META.get('HTTP_ACCEPT', ''),
+    ]
+    tokens.extend(f'{label}={stamps[label]!r}' for label in sorted(stamps))
+    return RESPONSE_KEY.format(hashlib.md5('|'.join(tokens).encode()).hexdigest())
+
+
+def _read_envelope(key):
+    """Return (value, is_fresh) for a cached envelope, or None on a miss."""
+    envelope = cache.get(key)
+    if not isinstance(envelope, dict) or 'expires_at' not in envelope:
+        return None
+    return envelope['value'], time.time() < envelope['expires_at']
+
+
+def _fill(key, compute, timeout, stale_timeout):
+    value = compute()
+    if value is not None:
+        envelope = {'value': value, 'expires_at': time.time() + timeout}
+        cache.set(key, envelope, timeout + stale_timeout)
+    return value
+
+
+def refill(key, compute, timeout, stale_timeout=0):
+    """Recompute the get_or_fill() entry for `key` now, replacing any cached value."""
+    return _fill(key, compute, timeout, stale_timeout)
+
+
+def get_or_fill(key, compute, timeout, stale_timeout=0,
+                lock_timeout=FILL_LOCK_TIMEOUT, wait_timeout=FILL_WAIT_TIMEOUT):
+    """
+    Return the cached value for `key`, computing it at most once at a time.
+
+    Values are stored in an envelope that stays readable for `stale_timeout`
+    seconds after it goes stale. When an entry is stale, the worker that takes
+    the fill lock recomputes it while every other worker is served the stale
+    value. On a miss, workers without the lock poll for up to `wait_timeout`
+    seconds for the fill, then compute it themselves. A `compute` returning
+    None is not cached.
+    """
+    cached = _read_envelope(key)
+    if cached is not None and cached[1]:
+        return cached[0]
+
+    lock_key = LOCK_KEY.format(key)
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            return _fill(key, compute, timeout, stale_timeout)
+        finally:
+            cache.delete(lock_key)
+
+    if cached is not None:
+        return cached[0]
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(FILL_POLL_INTERVAL)
+        cached = _read_envelope(key)
+        if cached is not None:
+            return cached[0]
+        if cache.get(lock_key) is None:
+            # The fill finished (possibly without caching) or died
+            cached = _read_envelope(key)
+            if cached is not None:
+                return cached[0]
+            break
+    return _fill(key, compute, timeout, stale_timeout)
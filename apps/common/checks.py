@@ -0,0 +1,22 @@
+"""
+System checks for the common app.
+"""
+from django.core.checks import Error, Tags, register
+from .cache import cache_is_process_local
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Change stamps, conditional GETs and cached responses need a cache shared by all workers."""
+    if not cache_is_process_local():
+        return []
+    return [
+        Error(
+            'The default cache is process-local (LocMemCache).',
+            hint=(
+                'Set REDIS_URL. Change stamps, 304 responses and cached response '
+                'bodies must be shared by every worker, or workers serve stale content.'
+            ),
+            id='common.E001',
+        )
+    ]
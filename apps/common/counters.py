@@ -0,0 +1,37 @@
+"""
+Batched increments of counter rows.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+# Rows inserted and updated per statement
+DELTA_CHUNK_SIZE = 500
+
+
+def increment_rows(model, field, deltas, key_fields, chunk_size=DELTA_CHUNK_SIZE, **fixed):
+    """
+    Add a {key: amount} batch to `field` of the rows whose `key_fields` equal
+    the key tuple (and whose other fields equal `fixed`): missing rows are
+    inserted empty (ignoring conflicts), then incremented in chunked
+    `UPDATE ... SET field = field + CASE ... END` statements.
+    """
+    items = sorted((key, amount) for key, amount in deltas.items() if amount)
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        model._default_manager.bulk_create(
+            [model(**fixed, **dict(zip(key_fields, key))) for key, _ in chunk],
+            ignore_conflicts=True
+        )
+        conditions = [Q(**dict(zip(key_fields, key))) for key, _ in chunk]
+        delta = Case(
+            *[When(condition, then=Value(amount)) for condition, (_, amount) in zip(conditions, chunk)],
+            default=Value(0),
+            output_field=IntegerField()
+        )
+        if len(key_fields) == 1:
+            matching = Q(**{f'{key_fields[0]}__in': [key[0] for key, _ in chunk]})
+        else:
+            matching = reduce(or_, conditions)
+        model._default_manager.filter(matching, **fixed).update(**{field: F(field) + delta})
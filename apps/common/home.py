@@ -0,0 +1,133 @@
+"""
+Homepage aggregate payload.
+
+The landing page sections (featured posts, categories, home reviews, active
+offers and open jobs) are cached per site root, one entry per section keyed
+by the change stamps of the models it renders and its item limit. A request
+re-queries only the sections whose stamps moved, so a new review does not
+re-serialize the blog posts, and each section is filled single-flight
+(get_or_fill), so a stamp bump is re-rendered by one worker at a time.
+"""
+import hashlib
+from collections import namedtuple
+
+from django.conf import settings
+from rest_framework import serializers
+from apps.blog.materialized import list_queryset
+from apps.blog.models import BlogLike, BlogPost, Category, Comment, Tag
+from apps.blog.serializers import BlogPostListSerializer, CategorySerializer
+from apps.careers.models import Job
+from apps.careers.serializers import JobSerializer
+from offers.models import Offer
+from offers.serializers import OfferSerializer
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from .cache import get_change_stamps, get_or_fill, model_label
+from .projection import project_queryset
+
+HOME_KEY = 'home:section:{}'
+
+# Items per section when HOME_SECTION_LIMITS does not name it
+DEFAULT_SECTION_LIMIT = 6
+
+
+class HomeSection(namedtuple('HomeSection', ('name', 'models', 'get_queryset', 'serializer_class'))):
+    """
+    One section of the homepage payload.
+    """
+    __slots__ = ()
+
+    @property
+    def labels(self):
+        return [model_label(model) for model in self.models]
+
+    @property
+    def limit(self):
+        return home_section_limits().get(self.name, DEFAULT_SECTION_LIMIT)
+
+
+SECTIONS = (
+    HomeSection(
+        'featured_posts',
+        (BlogPost, Category, Tag, Comment, BlogLike),
+        # Same posts and order as /api/v1/blog/posts/featured/
+        lambda: list_queryset('featured'),
+        BlogPostListSerializer,
+    ),
+    HomeSection(
+        'categories',
+        (Category, BlogPost),
+        lambda: Category.objects.filter(is_active=True, is_deleted=False),
+        CategorySerializer,
+    ),
+    HomeSection(
+        'reviews',
+        (Review,),
+        lambda: Review.objects.filter(
+            is_approved=True, display_location__in=['home', 'both']
+        ).order_by('-is_featured', '-created_at'),
+        ReviewSerializer,
+    ),
+    HomeSection(
+        'offers',
+        (Offer,),
+        lambda: Offer.objects.filter(status='active'),
+        OfferSerializer,
+    ),
+    HomeSection(
+        'jobs',
+        (Job,),
+        lambda: Job.objects.filter(status='active'),
+        JobSerializer,
+    ),
+)
+
+HOME_MODELS = tuple(dict.fromkeys(model for section in SECTIONS for model in section.models))
+
+
+class HomeSerializer(serializers.Serializer):
+    """
+    Shape of the homepage payload (documentation only; sections are rendered by render_section).
+    """
+    featured_posts = BlogPostListSerializer(many=True)
+    categories = CategorySerializer(many=True)
+    reviews = ReviewSerializer(many=True)
+    offers = OfferSerializer(many=True)
+    jobs = JobSerializer(many=True)
+
+
+def home_section_limits():
+    return getattr(settings, 'HOME_SECTION_LIMITS', {})
+
+
+def home_cache_timeout():
+    return getattr(settings, 'HOME_CACHE_TIMEOUT', 300)
+
+
+def render_section(section, request):
+    """Serialize a section's first `limit` items, loading only the columns it outputs."""
+    # Shared by every requester: is_liked is overlaid per user by the view
+    context = {'request': request, 'fields_from_request': False, 'liked_post_ids': frozenset()}
+    queryset = project_queryset(section.get_queryset(), section.serializer_class(context=context))
+    return section.serializer_class(queryset[:section.limit], many=True, context=context).data
+
+
+def section_key(section, root, stamps):
+    """Cache key of a section for a site root, versioned by its models' stamps and its limit."""
+    tokens = [root, section.name, str(section.limit)]
+    tokens.extend(f'{label}={stamps[label]!r}' for label in sorted(section.labels))
+    return HOME_KEY.format(hashlib.md5('|'.join(tokens).encode()).hexdigest())
+
+
+def get_home_payload(request):
+    """Return {section name: items}, re-rendering only sections that changed."""
+    root = request.build_absolute_uri('/')
+    stamps = get_change_stamps([model_label(model) for model in HOME_MODELS])
+    return {
+        section.name: get_or_fill(
+            section_key(section, root, stamps),
+            lambda section=section: render_section(section, request),
+            home_cache_timeout()
+        )
+        for section in SECTIONS
+    }
@@ -0,0 +1,181 @@
+"""
+Reusable view mixins.
+"""
+import hashlib
+import math
+import time
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from .cache import (
+    get_change_stamps,
+    get_or_fill,
+    model_label,
+    response_cache_key,
+    response_cache_stale_timeout,
+    response_cache_timeout,
+)
+from .projection import project_queryset
+
+# Response headers stored alongside cached bytes
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Vary', 'Allow')
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GETs (If-None-Match / If-Modified-Since) with 304.
+
+    The validators are computed before the queryset is evaluated or anything
+    is serialized. By default they come from the change stamps of the models
+    in `change_stamp_models`, which costs a single cache round trip. Views can
+    add their own parts (e.g. a row's `updated_at`) via `get_validator_parts()`.
+    Views whose payload depends on the user set `vary_on_user`. The ETag is
+    weak: it versions the state the body is rendered from, not its bytes,
+    so the parts must cover every value the body exposes. Last-Modified has
+    one-second resolution: it is rounded up and left out until that second
+    has passed, and the ETag remains the authoritative validator.
+    """
+    change_stamp_models = ()
+    vary_on_user = False
+
+    def get_validator_parts(self, request):
+        """Return [(name, value, modified_timestamp)] versioning the response."""
+        labels = [model_label(model) for model in self.change_stamp_models]
+        stamps = get_change_stamps(labels)
+        return [(label, repr(stamps[label]), stamps[label]) for label in labels]
+
+    def get_validators(self, request):
+        """Return (weak ETag, Last-Modified timestamp) for the request."""
+        parts = self.get_validator_parts(request)
+        tokens = [request.get_host(), request.get_full_path(), request.accepted_renderer.format]
+        tokens.extend(f'{name}={value}' for name, value, _ in parts)
+        if self.vary_on_user and request.user.is_authenticated:
+            tokens.append(f'user={request.user.pk}')
+        etag = 'W/"%s"' % hashlib.md5('|'.join(tokens).encode()).hexdigest()
+        modified = [timestamp for _, _, timestamp in parts if timestamp is not None]
+        last_modified = math.ceil(max(modified)) if modified else None
+        if last_modified is not None and last_modified > time.time():
+            # The second is not over: a later edit in it would not move the
+            # date, so If-Modified-Since-only clients could get a false 304
+            last_modified = None
+        return etag, last_modified
+
+    def not_modified(self, request):
+        """Hook run when a 304 is returned instead of the full response."""
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None and response.status_code == 304:
+            self.not_modified(request)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            if self.vary_on_user:
+                patch_vary_headers(response, ('Authorization',))
+        return response
+
+
+class CachedResponseMixin:
+    """
+    Cache rendered GET responses for anonymous requests.
+
+    Entries are keyed by path, normalized query params, Accept header and the
+    change stamps of `change_stamp_models`; any save or delete of one of those
+    models moves its stamp, so stale entries are never read again and simply
+    expire. On viewsets only the actions in `cache_actions` are cached.
+    Requests carrying credentials always run the full view.
+
+    Fills are single-flight: when an entry is missing or past its timeout,
+    one request renders it while concurrent requests wait for it or, during
+    the `cache_stale_timeout` grace period, get the previous bytes.
+    """
+    change_stamp_models = ()
+    cache_actions = None
+    cache_timeout = None
+    cache_stale_timeout = None
+
+    def should_cache_response(self, request):
+        """Only anonymous GETs of cacheable actions are served from cache."""
+        if request.method != 'GET' or 'HTTP_AUTHORIZATION' in request.META:
+            return False
+        if self.cache_actions is None:
+            return True
+        action = getattr(self, 'action_map', {}).get('get')
+        return action in self.cache_actions
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.should_cache_response(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = response_cache_key(
+            request, [model_label(model) for model in self.change_stamp_models]
+        )
+        computed = {}
+
+        def compute():
+            response = super(CachedResponseMixin, self).dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            computed['response'] = response
+            return self.freeze_response(response) if response.status_code == 200 else None
+
+        timeout = self.cache_timeout if self.cache_timeout is not None else response_cache_timeout()
+        stale_timeout = (
+            self.cache_stale_timeout if self.cache_stale_timeout is not None
+            else response_cache_stale_timeout()
+        )
+        cached = get_or_fill(key, compute, timeout, stale_timeout)
+        if 'response' in computed:
+            return computed['response']
+        return self.cached_response(request, cached)
+
+    @staticmethod
+    def freeze_response(response):
+        """Picklable (content, headers) form of a rendered response."""
+        headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+        return response.content, headers
+
+    def cached_response(self, request, cached):
+        """Rebuild a response from cache, honouring conditional headers."""
+        content, headers = cached
+        response = HttpResponse(content)
+        for name, value in headers.items():
+            response[name] = value
+        response['X-Cache'] = 'HIT'
+        return get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(headers.get('Last-Modified', '')),
+            response=response
+        )
+
+
+class ProjectionMixin:
+    """
+    Load only the columns the serializer outputs on read requests.
+
+    The queryset, its select_related joins and its plain prefetch_related
+    lookups are restricted with `.only()` to the fields declared by the
+    serializer (nested serializers included). Values computed by properties
+    or SerializerMethodFields must only read declared fields, or they trigger
+    a deferred-field query per row. On viewsets only `projection_actions`
+    are projected, so writes always work on fully loaded instances.
+    """
+    projection_actions = ('list',)
+
+    def should_project(self):
+        if self.request.method != 'GET':
+            return False
+        action = getattr(self, 'action', None)
+        return action is None or action in self.projection_actions
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.should_project():
+            queryset = project_queryset(queryset, self.get_serializer())
+        return queryset
@@ -39,6 +39,45 @@ class SoftDeleteModel(models.Model):
         self.save()
 
 
+class TrackedFieldsModel(models.Model):
+    """
+    Abstract base model that remembers the loaded values of `tracked_fields`.
+
+    `tracked_fields` holds attribute names (e.g. 'category_id'). Receivers of
+    post_save can call `tracked_changes()` to see what a save changed.
+    """
+    tracked_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self):
+        """Remember the current value of every loaded tracked field."""
+        self._tracked_initial = {
+            name: self.__dict__[name]
+            for name in self.tracked_fields
+            if name in self.__dict__
+        }
+
+    def tracked_changes(self):
+        """Return {field: old_value} for tracked fields changed since load or last save."""
+        initial = getattr(self, '_tracked_initial', {})
+        return {
+            name: old for name, old in initial.items()
+            if self.__dict__.get(name, old) != old
+        }
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+
 class BaseModel(TimeStampedModel, SoftDeleteModel):
     """
     Base model that combines timestamp and soft delete functionality.
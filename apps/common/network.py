@@ -0,0 +1,28 @@
+"""
+Client address helpers.
+"""
+from django.conf import settings
+
+
+def trusted_proxy_count():
+    return getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+
+
+def client_ip(request):
+    """
+    The requesting client's address.
+
+    X-Forwarded-For is only read behind TRUSTED_PROXY_COUNT reverse proxies,
+    each of which appends the address it received the request from; entries
+    further left were sent by the client and may be forged.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR', '')
+    proxies = trusted_proxy_count()
+    if proxies <= 0:
+        return remote_addr
+    forwarded = [
+        address.strip() for address in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if address.strip()
+    ]
+    chain = forwarded + [remote_addr]
+    return chain[max(len(chain) - 1 - proxies, 0)]
@@ -0,0 +1,115 @@
+"""
+Column projection (QuerySet.only) derived from serializer fields.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _readable_fields(serializer):
+    return [field for field in serializer.fields.values() if not field.write_only]
+
+
+def _nested(field):
+    """The nested serializer behind a field, or None."""
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def _collect(serializer, model, prefix, joined, only, prefetches):
+    """
+    Add the column paths `serializer` reads from `model` to `only`, following
+    forward relations that are in `joined` (a select_related tree). To-many
+    relations rendered by nested serializers are added to `prefetches`.
+    """
+    only.add(prefix + model._meta.pk.name)
+    for field in _readable_fields(serializer):
+        nested = _nested(field)
+        if field.source == '*':
+            if nested is not None:
+                _collect(nested, model, prefix, joined, only, prefetches)
+            continue
+        if not field.source_attrs:
+            continue
+        name = field.source_attrs[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Properties and methods; they read fields declared alongside them
+            continue
+
+        if model_field.many_to_many or model_field.one_to_many:
+            if nested is not None and not prefix:
+                prefetches[name] = (model_field.related_model, nested)
+            continue
+        if not model_field.concrete:
+            continue
+        only.add(prefix + name)
+        if model_field.is_relation and nested is not None and name in joined:
+            _collect(nested, model_field.related_model, f'{prefix}{name}__', joined[name], only, prefetches)
+
+
+def _dropped_relations(serializer):
+    """
+    Relation names whose nested serializers were declared on the serializer
+    class but removed from this instance (e.g. by sparse fieldsets).
+    """
+    declared = getattr(type(serializer), '_declared_fields', {})
+    used = {field.source_attrs[0] for field in _readable_fields(serializer) if field.source_attrs}
+    dropped = set()
+    for name, field in declared.items():
+        if name in serializer.fields or _nested(field) is None or field.source == '*':
+            continue
+        source = (field.source or name).split('.')[0]
+        if source not in used:
+            dropped.add(source)
+    return dropped
+
+
+def _join_paths(joined, prefix=''):
+    for name, children in joined.items():
+        yield prefix + name
+        yield from _join_paths(children, f'{prefix}{name}__')
+
+
+def serializer_projection(serializer, model, joined=None):
+    """Return (only_paths, {prefetch_name: (model, child_serializer)})."""
+    only, prefetches = set(), {}
+    _collect(serializer, model, '', joined or {}, only, prefetches)
+    return only, prefetches
+
+
+def project_queryset(queryset, serializer):
+    """
+    Restrict the queryset, its select_related joins and its plain prefetches
+    to the columns `serializer` outputs. Joins and prefetches of nested
+    serializers the instance no longer has are dropped.
+    """
+    dropped = _dropped_relations(serializer)
+    joined = queryset.query.select_related
+    if not isinstance(joined, dict):
+        # select_related() without arguments: joins are not known up front
+        joined = {}
+    elif dropped & set(joined):
+        joined = {name: children for name, children in joined.items() if name not in dropped}
+        queryset = queryset.select_related(None)
+        if joined:
+            queryset = queryset.select_related(*_join_paths(joined))
+    only, prefetches = serializer_projection(serializer, queryset.model, joined)
+    queryset = queryset.only(*only)
+
+    lookups = []
+    for lookup in queryset._prefetch_related_lookups:
+        if isinstance(lookup, str) and lookup.split('__')[0] in dropped:
+            continue
+        if isinstance(lookup, str) and lookup in prefetches:
+            related_model, child = prefetches[lookup]
+            child_only, _ = serializer_projection(child, related_model)
+            lookup = Prefetch(lookup, queryset=related_model._default_manager.only(*child_only))
+        lookups.append(lookup)
+    if lookups != list(queryset._prefetch_related_lookups):
+        queryset = queryset.prefetch_related(None).prefetch_related(*lookups)
+    return queryset
@@ -0,0 +1,110 @@
+"""
+Reusable serializer mixins.
+"""
+from rest_framework import serializers
+
+
+def parse_field_paths(value):
+    """Parse 'title,author.username,author.full_name' into a nested dict tree."""
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for part in (part.strip() for part in path.split('.')):
+            if not part:
+                break
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _nested(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets for GET requests: `?fields=`, `?omit=` and `?expand=`.
+
+    `fields` and `omit` take comma-separated names; dotted names address
+    nested serializers that use this mixin too (`fields=title,author.full_name`).
+    Fields listed in `Meta.expandable_fields` are left out unless named in
+    `expand`. Dropped fields are removed before binding, so views that build
+    querysets from `serializer.fields` (see ProjectionMixin) also skip their
+    joins and lookups. A `fields_from_request: False` context entry keeps the
+    full representation regardless of the query string.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    expand_query_param = 'expand'
+
+    def _is_response_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _get_field_selection(self):
+        """Return (only, omit, expand) trees for this serializer."""
+        selection = getattr(self, '_field_selection', None)
+        if selection is not None:
+            return selection
+        request = self.context.get('request')
+        if (
+            request is None or request.method != 'GET' or not self._is_response_root()
+            or not self.context.get('fields_from_request', True)
+        ):
+            return {}, {}, {}
+        params = request.query_params
+        return (
+            parse_field_paths(params.get(self.fields_query_param)),
+            parse_field_paths(params.get(self.omit_query_param)),
+            parse_field_paths(params.get(self.expand_query_param)),
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, omit, expand = self._get_field_selection()
+
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expand:
+                fields.pop(name, None)
+
+        for name in list(fields):
+            if (only and name not in only) or (name in omit and not omit[name]):
+                del fields[name]
+                continue
+            nested = _nested(fields[name])
+            sub_selection = (only.get(name, {}), omit.get(name, {}), expand.get(name, {}))
+            if nested is not None and any(sub_selection):
+                nested._field_selection = sub_selection
+        return fields
+
+
+def readable_field_names(serializer):
+    """Names of the fields a serializer (many=True or not) or a fields dict outputs."""
+    fields = _nested(serializer).fields if isinstance(serializer, serializers.BaseSerializer) else serializer
+    return [name for name, field in fields.items() if not field.write_only]
+
+
+def prune_representation(data, fields):
+    """
+    Restrict an already rendered representation to `fields` (a serializer's
+    bound fields), recursing into nested serializers, in field order.
+    """
+    pruned = {}
+    for name, field in fields.items():
+        if field.write_only or name not in data:
+            continue
+        value, nested = data[name], _nested(field)
+        if nested is not None and isinstance(value, dict):
+            value = prune_representation(value, nested.fields)
+        elif nested is not None and isinstance(value, list):
+            value = [
+                prune_representation(item, nested.fields) if isinstance(item, dict) else item
+                for item in value
+            ]
+        pruned[name] = value
+    return pruned
@@ -0,0 +1,20 @@
+"""
+Signal handlers that keep per-model change stamps current.
+"""
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .cache import model_label, touch
+
+
+@receiver(post_save, dispatch_uid='common_touch_on_save')
+@receiver(post_delete, dispatch_uid='common_touch_on_delete')
+def touch_model(sender, **kwargs):
+    """Bump the change stamp of the saved or deleted model."""
+    touch(model_label(sender))
+
+
+@receiver(m2m_changed, dispatch_uid='common_touch_on_m2m')
+def touch_m2m(sender, instance, action, model, **kwargs):
+    """Bump the change stamps of both sides of a many-to-many change."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        touch(model_label(instance), model_label(model), model_label(sender))
@@ -0,0 +1,50 @@
+"""
+Test runner for the project.
+"""
+import unittest
+
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from .buffers import all_buffers
+
+
+class BufferDiscardingMixin:
+    """
+    Drops the increments a test left in the write-behind buffers, so they
+    never reach the next test or a database outside the test run.
+    """
+
+    def stopTest(self, test):
+        for buffer in all_buffers():
+            buffer.discard()
+        super().stopTest(test)
+
+
+class BufferDiscardingResult(BufferDiscardingMixin, unittest.TextTestResult):
+    """
+    The default result class with buffer discarding.
+    """
+
+
+class ProjectTestRunner(DiscoverRunner):
+    """
+    Keeps the write-behind buffers from writing on their own during tests:
+    no flush threads or size-triggered flushes, only explicit flush() calls
+    inside a test, and pending increments are dropped after each test.
+    """
+
+    def get_resultclass(self):
+        # --debug-sql and --pdb pick their own result class: extend it
+        resultclass = super().get_resultclass()
+        if resultclass is None:
+            return BufferDiscardingResult
+        return type(f'BufferDiscarding{resultclass.__name__}', (BufferDiscardingMixin, resultclass), {})
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._buffer_settings = override_settings(BUFFERED_COUNTER_AUTOFLUSH=False)
+        self._buffer_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._buffer_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,448 @@
+"""
+Tests for the common app.
+"""
+import io
+import re
+import threading
+import time
+import unittest
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.runner import DebugSQLTextTestResult
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from apps.blog.like_counter import like_count_buffer
+from apps.blog.materialized import warm_lists
+from apps.blog.models import BlogLike, BlogPost, Category, RelatedPost, Tag
+from apps.blog.serializers import BlogPostListSerializer
+from apps.careers.models import Job, JobApplication
+from apps.careers.serializers import JobApplicationSerializer, JobSerializer
+from enquiries.serializers import EnquirySerializer
+from offers.serializers import OfferSerializer
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from .cache import get_or_fill, model_label, touch
+from .home import HOME_MODELS
+from .hyperloglog import HyperLogLog
+from .test_runner import ProjectTestRunner
+
+SELECTED_COLUMN = re.compile(r'"(\w+)"\."(\w+)"')
+
+
+class GetOrFillTests(SimpleTestCase):
+    """
+    Single-flight and stale-while-revalidate behaviour of get_or_fill.
+    """
+    key = 'tests:get-or-fill'
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def slow_compute(self, value, delay=0.2):
+        def compute():
+            with self.calls_lock:
+                self.calls += 1
+            time.sleep(delay)
+            return value
+        return compute
+
+    def run_concurrently(self, func, workers=8):
+        barrier = threading.Barrier(workers)
+        results = [None] * workers
+
+        def worker(index):
+            barrier.wait()
+            results[index] = func()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_misses_compute_once(self):
+        compute = self.slow_compute('fresh')
+        results = self.run_concurrently(lambda: get_or_fill(self.key, compute, timeout=60))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ['fresh'] * 8)
+
+    def test_stale_value_served_while_one_worker_recomputes(self):
+        get_or_fill(self.key, lambda: 'old', timeout=0.05, stale_timeout=60)
+        time.sleep(0.1)
+
+        # The recomputation only finishes once every stale reader has returned
+        stale_served = threading.Event()
+        served = []
+
+        def compute():
+            with self.calls_lock:
+                self.calls += 1
+            finished_after_readers = stale_served.wait(timeout=5)
+            return 'new' if finished_after_readers else 'blocked'
+
+        def call():
+            value = get_or_fill(self.key, compute, timeout=60, stale_timeout=60)
+            if value == 'old':
+                with self.calls_lock:
+                    served.append(value)
+                    if len(served) == 7:
+                        stale_served.set()
+            return value
+
+        results = self.run_concurrently(call)
+        self.assertEqual(self.calls, 1)
+        # Stale readers did not wait for the recomputation
+        self.assertEqual(sorted(results), ['new'] + ['old'] * 7)
+        self.assertEqual(get_or_fill(self.key, compute, timeout=60), 'new')
+
+    def test_waiters_compute_after_wait_timeout(self):
+        compute = self.slow_compute('slow', delay=0.5)
+
+        def call():
+            return get_or_fill(self.key, compute, timeout=60, wait_timeout=0.1)
+
+        results = self.run_concurrently(call, workers=2)
+        self.assertEqual(results, ['slow', 'slow'])
+        self.assertEqual(self.calls, 2)
+
+    def test_none_is_not_cached(self):
+        self.assertIsNone(get_or_fill(self.key, lambda: None, timeout=60))
+        self.assertEqual(get_or_fill(self.key, lambda: 'value', timeout=60), 'value')
+
+
+class CachedResponseTests(TestCase):
+    """
+    Anonymous list GETs are served from cache until a rendered model changes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Review.objects.create(name='Reviewer', email='r@example.com', rating=5, comment='Great')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hit_until_write(self):
+        first = self.client.get('/api/v1/reviews/?rating=5&ordering=-created_at')
+        self.assertFalse(first.has_header('X-Cache'))
+        with self.assertNumQueries(0):
+            # Query params are normalized
+            hit = self.client.get('/api/v1/reviews/?ordering=-created_at&rating=5')
+        self.assertEqual((hit['X-Cache'], hit.content), ('HIT', first.content))
+
+        Review.objects.create(name='New', email='n@example.com', rating=5, comment='Wow')
+        response = self.client.get('/api/v1/reviews/?ordering=-created_at&rating=5')
+        self.assertFalse(response.has_header('X-Cache'))
+        self.assertEqual(response.json()['results'][0]['name'], 'New')
+
+    def test_credentials_bypass_cache(self):
+        self.client.get('/api/v1/reviews/')
+        response = self.client.get('/api/v1/reviews/', HTTP_AUTHORIZATION='Bearer invalid')
+        self.assertFalse(response.has_header('X-Cache'))
+
+
+def serialized_columns(serializer, columns=None):
+    """{table: {column}} of every model field the serializer outputs, nested included."""
+    columns = columns if columns is not None else {}
+    model = serializer.Meta.model
+    table = columns.setdefault(model._meta.db_table, {model._meta.pk.column})
+    for field in serializer.fields.values():
+        if field.write_only or not field.source_attrs:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except Exception:
+            continue
+        if model_field.concrete and not model_field.many_to_many:
+            table.add(model_field.column)
+        child = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(child, serializers.BaseSerializer):
+            serialized_columns(child, columns)
+    return columns
+
+
+class ProjectionTests(TestCase):
+    """
+    List endpoints must not fetch columns their serializers do not output.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            email='reader@example.com', username='reader', password='x',
+            first_name='Rea', last_name='Der', address='Somewhere'
+        )
+        category = Category.objects.create(name='Termites')
+        tag = Tag.objects.create(name='Wood')
+        posts = []
+        for index in range(2):
+            post = BlogPost.objects.create(
+                title=f'Post {index}', excerpt='Excerpt', content='Long body ' * 100,
+                author=cls.user, category=category, status='published', is_featured=True
+            )
+            post.tags.add(tag)
+            posts.append(post)
+        RelatedPost.objects.create(post=posts[0], related=posts[1], score=1.0)
+        cls.post = posts[0]
+        job = Job.objects.create(
+            title='Technician', location='Pune', experience='2 years', description='Spraying'
+        )
+        for index in range(2):
+            JobApplication.objects.create(
+                job=job, full_name=f'Applicant {index}', email='a@example.com', phone='1', experience='1 year'
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assert_projected(self, url, serializer, extra=None):
+        allowed = serialized_columns(serializer)
+        for table, columns in (extra or {}).items():
+            allowed.setdefault(table, set()).update(columns)
+        through_tables = {BlogPost.tags.through._meta.db_table}
+
+        self.client.get(url)  # warm the slug resolver
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+
+        for query in queries:
+            select = query['sql'].split(' FROM ', 1)[0]
+            for table, column in SELECTED_COLUMN.findall(select):
+                if table in through_tables:
+                    continue
+                self.assertIn(table, allowed, f'{url} queried {table}: {query["sql"]}')
+                self.assertIn(column, allowed[table], f'{url} fetched {table}.{column}')
+
+    def test_blog_list_endpoints(self):
+        serializer = BlogPostListSerializer()
+        liked = {'blog_likes': {'post_id'}}
+        self.assert_projected('/api/v1/blog/posts/featured/', serializer, liked)
+        self.assert_projected(f'/api/v1/blog/posts/{self.post.slug}/related/', serializer, liked)
+        self.assert_projected('/api/v1/blog/posts/liked/', serializer, liked)
+        # The post list splices snapshots and checks them against updated_at
+        self.assert_projected('/api/v1/blog/posts/', serializer, {
+            **liked,
+            'blog_posts': {'updated_at'},
+            'blog_post_snapshots': {'post_id', 'card', 'source_updated_at'},
+        })
+
+    def test_other_list_endpoints(self):
+        self.assert_projected('/api/v1/reviews/', ReviewSerializer())
+        self.assert_projected('/api/v1/offers/', OfferSerializer())
+        self.assert_projected('/api/v1/careers/jobs/', JobSerializer())
+        self.assert_projected('/api/v1/careers/jobs/active/', JobSerializer())
+        self.assert_projected('/api/v1/careers/applications/', JobApplicationSerializer())
+        self.assert_projected('/api/v1/careers/applications/?fields=id,full_name', JobApplicationSerializer(
+            context={'request': mock.Mock(method='GET', query_params={'fields': 'id,full_name'})}
+        ))
+        self.assert_projected('/api/v1/enquiries/', EnquirySerializer())
+
+
+class SparseFieldsetTests(TestCase):
+    """
+    `?fields=`, `?omit=` and `?expand=` shape responses and the queries behind them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            email='reader@example.com', username='reader', password='x',
+            first_name='Rea', last_name='Der'
+        )
+        category = Category.objects.create(name='Termites')
+        tag = Tag.objects.create(name='Wood')
+        for index in range(2):
+            post = BlogPost.objects.create(
+                title=f'Post {index}', excerpt='Excerpt', content='Body',
+                author=cls.user, category=category, status='published', is_featured=True
+            )
+            post.tags.add(tag)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        cache.clear()
+        warm_lists()  # featured posts are served from the materialized list
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        results = response.json()
+        if isinstance(results, dict):
+            results = results['results']
+        return results, {table for query in queries for table, _ in SELECTED_COLUMN.findall(query['sql'])}
+
+    def test_fields_drop_relations_and_lookups(self):
+        fields = ['title', 'slug', 'featured_image', 'published_at']
+        for url in ('/api/v1/blog/posts/featured/', '/api/v1/blog/posts/'):
+            results, tables = self.get(f'{url}?fields={",".join(fields)}')
+            self.assertEqual([list(item) for item in results], [fields, fields], url)
+            self.assertFalse(tables & {'users', 'blog_tags', 'blog_likes'}, url)
+
+    def test_nested_fields_and_omit(self):
+        results, _ = self.get('/api/v1/blog/posts/featured/?fields=title,author.full_name')
+        self.assertEqual(results[0], {'title': results[0]['title'], 'author': {'full_name': 'Rea Der'}})
+
+        results, tables = self.get('/api/v1/blog/posts/featured/?omit=tags,is_liked')
+        self.assertNotIn('tags', results[0])
+        self.assertNotIn('is_liked', results[0])
+        self.assertFalse(tables & {'blog_tags', 'blog_likes'})
+
+    def test_expand(self):
+        results, _ = self.get('/api/v1/blog/posts/')
+        self.assertNotIn('content', results[0])
+        for url in ('/api/v1/blog/posts/', '/api/v1/blog/posts/featured/'):
+            results, _ = self.get(f'{url}?expand=content&fields=id,content')
+            self.assertEqual(results[0]['content'], 'Body', url)
+
+
+class HomeTests(TestCase):
+    """
+    The homepage payload re-renders only the sections whose models changed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        author = User.objects.create_user(email='author@example.com', username='author', password='x')
+        category = Category.objects.create(name='Termites')
+        for index in range(3):
+            BlogPost.objects.create(
+                title=f'Post {index}', excerpt='Excerpt', content='Body',
+                author=author, category=category, status='published', is_featured=True
+            )
+        for index in range(3):
+            Review.objects.create(
+                name=f'Reviewer {index}', email='r@example.com', rating=5, comment='Great',
+                display_location='home'
+            )
+        Review.objects.create(
+            name='Elsewhere', email='r@example.com', rating=4, comment='Fine',
+            display_location='community'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_home(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/home/')
+        self.assertEqual(response.status_code, 200)
+        tables = {table for query in queries for table, _ in SELECTED_COLUMN.findall(query['sql'])}
+        return response.json(), tables
+
+    @override_settings(HOME_SECTION_LIMITS={'featured_posts': 2})
+    def test_sections_and_limits(self):
+        payload, _ = self.get_home()
+        self.assertEqual(set(payload), {'featured_posts', 'categories', 'reviews', 'offers', 'jobs'})
+        self.assertEqual(len(payload['featured_posts']), 2)
+        self.assertEqual(len(payload['reviews']), 3)
+        self.assertNotIn('Elsewhere', [review['name'] for review in payload['reviews']])
+
+    def test_sections_invalidate_independently(self):
+        self.get_home()
+        _, tables = self.get_home()
+        self.assertEqual(tables, set())
+
+        Review.objects.create(name='New', email='n@example.com', rating=5, comment='Wow')
+        payload, tables = self.get_home()
+        self.assertEqual(tables, {'reviews_review'})
+        self.assertEqual(payload['reviews'][0]['name'], 'New')
+
+        BlogLike.objects.create(post=BlogPost.objects.first(), user=get_user_model().objects.get())
+        _, tables = self.get_home()
+        self.assertIn('blog_posts', tables)
+        self.assertNotIn('reviews_review', tables)
+
+    def test_last_modified_never_hides_a_same_second_edit(self):
+        labels = [model_label(model) for model in HOME_MODELS]
+
+        def get(now, **headers):
+            with mock.patch('apps.common.mixins.time.time', return_value=now):
+                return self.client.get('/api/v1/home/', **headers)
+
+        with mock.patch('apps.common.cache.time.time', return_value=1000.3):
+            touch(*labels)
+        # Within the second of the last write there is no Last-Modified
+        self.assertFalse(get(1000.6).has_header('Last-Modified'))
+        last_modified = get(1001.2)['Last-Modified']
+        self.assertEqual(get(1001.4, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        with mock.patch('apps.common.cache.time.time', return_value=1001.5):
+            touch(model_label(Review))
+        self.assertEqual(get(1002.1, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 200)
+
+
+class ProjectTestRunnerTests(SimpleTestCase):
+    """
+    Every result class the runner picks drops pending buffer increments.
+    """
+
+    def test_result_classes_discard_buffers(self):
+        buffer = like_count_buffer
+        for options, base in (({}, unittest.TextTestResult), ({'debug_sql': True}, DebugSQLTextTestResult)):
+            resultclass = ProjectTestRunner(**options).get_resultclass()
+            self.assertTrue(issubclass(resultclass, base))
+            result = resultclass(io.StringIO(), False, 0)
+            result.startTest(self)
+            buffer.add(1)
+            result.stopTest(self)
+            self.assertEqual(buffer.metrics()['buffer_depth'], 0)
+
+
+class HyperLogLogTests(SimpleTestCase):
+    """
+    Memory, accuracy and merging of HyperLogLog sketches.
+    """
+
+    def sketch_of(self, values):
+        sketch = HyperLogLog()
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def test_memory_is_fixed(self):
+        small = self.sketch_of(['a'])
+        large = self.sketch_of(f'visitor-{i}' for i in range(50000))
+        self.assertEqual(len(small.to_bytes()), 4096)
+        self.assertEqual(len(large.to_bytes()), 4096)
+
+    def test_accuracy(self):
+        # Standard error at p=12 is ~1.6%; allow three of them
+        for cardinality in (10, 1000, 20000, 100000):
+            estimate = self.sketch_of(f'visitor-{i}' for i in range(cardinality)).count()
+            self.assertLessEqual(abs(estimate - cardinality), max(1, 0.05 * cardinality), cardinality)
+
+    def test_duplicates_are_not_counted(self):
+        sketch = self.sketch_of(['a', 'b', 'c'])
+        self.assertFalse(sketch.add('a'))
+        self.assertEqual(sketch.count(), 3)
+
+    def test_merge_counts_union(self):
+        monday = self.sketch_of(f'visitor-{i}' for i in range(0, 6000))
+        tuesday = self.sketch_of(f'visitor-{i}' for i in range(4000, 10000))
+        week = HyperLogLog.from_bytes(monday.to_bytes()).merge(tuesday)
+        self.assertLessEqual(abs(week.count() - 10000), 500)
+        self.assertEqual(week.registers, self.sketch_of(f'visitor-{i}' for i in range(10000)).registers)
+
+    def test_precision_mismatch(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(p=12).merge(HyperLogLog(p=10))
+        with self.assertRaises(ValueError):
+            HyperLogLog(p=12, registers=b'\0' * 100)
@@ -0,0 +1,34 @@
+"""
+Views for the common app.
+"""
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+from apps.blog.models import BlogLike
+from .home import HOME_MODELS, HomeSerializer, get_home_payload
+from .mixins import ConditionalGetMixin
+
+
+class HomeView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    Everything the landing page renders, in one response.
+    """
+    change_stamp_models = HOME_MODELS
+    vary_on_user = True
+    serializer_class = HomeSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the cached sections with the requester's liked state overlaid."""
+        payload = get_home_payload(request)
+        posts = payload['featured_posts']
+        if request.user.is_authenticated and posts:
+            liked_post_ids = set(
+                BlogLike.objects.filter(
+                    user=request.user,
+                    post_id__in=[post['id'] for post in posts]
+                ).values_list('post_id', flat=True)
+            )
+            payload['featured_posts'] = [
+                {**post, 'is_liked': post['id'] in liked_post_ids} for post in posts
+            ]
+        return Response(payload)
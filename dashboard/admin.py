@@ -1,3 +1,21 @@
-from django.contrib import admin
-
-# Register your models here.
+from django.contrib import admin
+from .models import DailyRollup, RollupWatermark, RouteHits
+
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['source', 'day', 'dimension', 'value', 'count']
+    list_filter = ['source', 'dimension']
+    date_hierarchy = 'day'
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['source', 'last_id', 'updated_at']
+
+
+@admin.register(RouteHits)
+class RouteHitsAdmin(admin.ModelAdmin):
+    list_display = ['route', 'day', 'hits']
+    search_fields = ['route']
+    date_hierarchy = 'day'
@@ -0,0 +1,22 @@
+"""
+Recompute the dashboard rollups from the source tables.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from dashboard.rollups import ROLLUP_SOURCES, backfill_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily dashboard rollups from scratch to fill or repair them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'sources', nargs='*', help=f'Only rebuild these sources ({", ".join(ROLLUP_SOURCES)}).'
+        )
+
+    def handle(self, *args, **options):
+        sources = options['sources'] or list(ROLLUP_SOURCES)
+        unknown = set(sources) - set(ROLLUP_SOURCES)
+        if unknown:
+            raise CommandError(f'Unknown rollup sources: {", ".join(sorted(unknown))}')
+        for name, last_id in backfill_rollups(sources).items():
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {name} rollups up to #{last_id}.'))
@@ -0,0 +1,23 @@
+"""
+Count rows created since the last run into the dashboard rollups.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from dashboard.rollups import ROLLUP_SOURCES, process_new_rows
+
+
+class Command(BaseCommand):
+    help = 'Add rows above each source\'s watermark to the daily dashboard rollups.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'sources', nargs='*', help=f'Only update these sources ({", ".join(ROLLUP_SOURCES)}).'
+        )
+
+    def handle(self, *args, **options):
+        sources = options['sources'] or list(ROLLUP_SOURCES)
+        unknown = set(sources) - set(ROLLUP_SOURCES)
+        if unknown:
+            raise CommandError(f'Unknown rollup sources: {", ".join(sorted(unknown))}')
+        for name in sources:
+            processed = process_new_rows(name)
+            self.stdout.write(self.style.SUCCESS(f'Counted {processed} new {name} rows.'))
@@ -0,0 +1,21 @@
+"""
+Middleware for the dashboard app.
+"""
+from .traffic import record_hit, route_name
+
+
+class RouteMetricsMiddleware:
+    """
+    Counts each request that resolved to a route, by route name and day.
+    The count is buffered in memory; see traffic.py.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            record_hit(route_name(match))
+        return response
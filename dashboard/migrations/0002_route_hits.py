@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RouteHits',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('route', models.CharField(max_length=200)),
+                ('day', models.DateField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Route Hits',
+                'verbose_name_plural': 'Route Hits',
+                'db_table': 'dashboard_route_hits',
+                'indexes': [models.Index(fields=['day'], name='dashboard_r_day_15bd0d_idx')],
+                'unique_together': {('route', 'day')},
+            },
+        ),
+    ]
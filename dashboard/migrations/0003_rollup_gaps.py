@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-17 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_route_hits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupGap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=20)),
+                ('row_id', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Gap',
+                'verbose_name_plural': 'Rollup Gaps',
+                'db_table': 'dashboard_rollup_gaps',
+                'unique_together': {('source', 'row_id')},
+            },
+        ),
+    ]
@@ -1,3 +1,87 @@
-from django.db import models
-
-# Create your models here.
+"""
+Models for the dashboard app.
+"""
+from django.db import models
+
+
+class DailyRollup(models.Model):
+    """
+    Number of `source` rows created on `day` with `value` for one dimension.
+    The empty dimension holds the day's total.
+    """
+    source = models.CharField(max_length=20)
+    dimension = models.CharField(max_length=30, blank=True)
+    value = models.CharField(max_length=100, blank=True)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'dashboard_daily_rollups'
+        unique_together = ['source', 'dimension', 'value', 'day']
+        indexes = [
+            models.Index(fields=['source', 'dimension', 'day']),
+        ]
+        verbose_name = 'Daily Rollup'
+        verbose_name_plural = 'Daily Rollups'
+
+    def __str__(self):
+        return f"{self.source} {self.dimension}={self.value} on {self.day}: {self.count}"
+
+
+class RollupWatermark(models.Model):
+    """
+    Highest primary key of a source table already counted in the rollups.
+    """
+    source = models.CharField(max_length=20, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dashboard_rollup_watermarks'
+        verbose_name = 'Rollup Watermark'
+        verbose_name_plural = 'Rollup Watermarks'
+
+    def __str__(self):
+        return f"{self.source} up to #{self.last_id}"
+
+
+class RouteHits(models.Model):
+    """
+    Requests served by one named route on one day, written in batches by the
+    route metrics buffer.
+    """
+    route = models.CharField(max_length=200)
+    day = models.DateField()
+    hits = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'dashboard_route_hits'
+        unique_together = ['route', 'day']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+        verbose_name = 'Route Hits'
+        verbose_name_plural = 'Route Hits'
+
+    def __str__(self):
+        return f"{self.hits} hits of {self.route} on {self.day}"
+
+
+class RollupGap(models.Model):
+    """
+    An id just below a source's watermark that had no visible row when the
+    watermark passed it (an insert not yet committed, or a rolled-back or
+    deleted one). It is counted if the row shows up, and expires otherwise.
+    """
+    source = models.CharField(max_length=20)
+    row_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'dashboard_rollup_gaps'
+        unique_together = ['source', 'row_id']
+        verbose_name = 'Rollup Gap'
+        verbose_name_plural = 'Rollup Gaps'
+
+    def __str__(self):
+        return f"{self.source} #{self.row_id} not yet counted"
@@ -0,0 +1,251 @@
+"""
+Daily rollups of enquiries, reviews, user signups and blog posts.
+
+Every source table is summarised into `DailyRollup` rows: per local day of
+creation, the number of rows in total and per value of each dimension
+(e.g. enquiries by service_type, status and type). Dashboard charts read
+these rows instead of rescanning the source tables.
+
+New rows are counted by `process_new_rows()`, which only reads rows above
+the source's `RollupWatermark` (by primary key) and then advances it. Ids
+near the top of the table that are passed without a visible row (inserts
+whose transaction commits after a higher id) are kept as `RollupGap`s and
+counted when the row appears; gaps of rolled-back inserts expire. A row is
+counted exactly when it is at or below the watermark and not a gap.
+
+It runs from a background flush after inserts commit (never on the request
+thread) and from the update_dashboard_rollups command, which also picks up
+rows inserted without signals (bulk_create). Changes to the dimensions of,
+or deletions of, counted rows are applied as deltas by signal handlers.
+backfill_dashboard_rollups recomputes everything from scratch.
+"""
+from collections import Counter, defaultdict, namedtuple
+
+import datetime
+
+from django.db import transaction
+from django.db.models import Exists, Max, Q, Subquery
+from django.utils import timezone
+from apps.common.buffers import BufferedCounter
+from apps.common.counters import increment_rows
+from apps.blog.models import BlogPost
+from apps.users.models import User
+from enquiries.models import Enquiry
+from reviews.models import Review
+from .models import DailyRollup, RollupGap, RollupWatermark
+
+# Rows read per watermark step, and rollup rows per UPDATE statement
+ROLLUP_BATCH_SIZE = 2000
+DELTA_CHUNK_SIZE = 500
+
+# Missing ids within this distance of the table's highest id are kept as
+# gaps (older ones are deleted rows), and gaps are dropped after this long
+GAP_WINDOW = 1000
+GAP_TIMEOUT = datetime.timedelta(days=1)
+
+# model, creation timestamp field, fields read, and a function of a row's
+# values returning its [(dimension, value)] pairs, or None to leave it out
+RollupSource = namedtuple('RollupSource', ['model', 'date_field', 'fields', 'dimensions'])
+
+
+def _enquiry_dimensions(row):
+    return [('service_type', row['service_type']), ('status', row['status']), ('type', row['type'])]
+
+
+def _review_dimensions(row):
+    dimensions = [('rating', row['rating'])]
+    if row['is_approved']:
+        dimensions.append(('approved_rating', row['rating']))
+    return dimensions
+
+
+def _post_dimensions(row):
+    if row['is_deleted']:
+        return None
+    return [('status', row['status'])]
+
+
+ROLLUP_SOURCES = {
+    'enquiries': RollupSource(
+        Enquiry, 'created_at', ('service_type', 'status', 'type'), _enquiry_dimensions
+    ),
+    'reviews': RollupSource(Review, 'created_at', ('rating', 'is_approved'), _review_dimensions),
+    'users': RollupSource(User, 'date_joined', (), lambda row: []),
+    'posts': RollupSource(BlogPost, 'created_at', ('status', 'is_deleted'), _post_dimensions),
+}
+
+
+def source_for_model(model):
+    """(name, source) of the rollup source reading `model`, or (None, None)."""
+    for name, source in ROLLUP_SOURCES.items():
+        if source.model is model:
+            return name, source
+    return None, None
+
+
+def row_values(source, instance):
+    """The values of an instance that the rollups read."""
+    return {name: getattr(instance, name) for name in (source.date_field,) + source.fields}
+
+
+def row_buckets(source, rows):
+    """Counter of {(day, dimension, value): rows} for the given value dicts."""
+    buckets = Counter()
+    for row in rows:
+        dimensions = source.dimensions(row)
+        if dimensions is None:
+            continue
+        day = timezone.localdate(row[source.date_field])
+        buckets[day, '', ''] += 1
+        for dimension, value in dimensions:
+            buckets[day, dimension, '' if value is None else str(value)] += 1
+    return buckets
+
+
+def apply_rollup_deltas(name, deltas):
+    """Add a {(day, dimension, value): delta} batch to a source's rollups."""
+    increment_rows(
+        DailyRollup, 'count', deltas, ('day', 'dimension', 'value'), chunk_size=DELTA_CHUNK_SIZE, source=name
+    )
+
+
+def _gaps(ids, low, high, top):
+    """Ids in (low, high] missing from `ids` and within GAP_WINDOW of `top`."""
+    return [pk for pk in range(max(low, top - GAP_WINDOW) + 1, high) if pk not in ids]
+
+
+def _count_gaps(name):
+    """Count gap rows that have become visible and drop expired gaps."""
+    source = ROLLUP_SOURCES[name]
+    with transaction.atomic():
+        RollupWatermark.objects.select_for_update().get(source=name)
+        gaps = RollupGap.objects.filter(source=name)
+        gaps.filter(created_at__lt=timezone.now() - GAP_TIMEOUT).delete()
+        rows = list(source.model._default_manager.filter(pk__in=gaps.values('row_id')).values(
+            'pk', source.date_field, *source.fields
+        ))
+        if rows:
+            apply_rollup_deltas(name, row_buckets(source, rows))
+            gaps.filter(row_id__in=[row['pk'] for row in rows]).delete()
+    return len(rows)
+
+
+def process_new_rows(name, batch_size=ROLLUP_BATCH_SIZE):
+    """
+    Count a source's rows above its watermark (advancing it) and gap rows
+    that have committed since. Returns the rows counted.
+    """
+    source = ROLLUP_SOURCES[name]
+    RollupWatermark.objects.get_or_create(source=name)
+    processed = _count_gaps(name)
+    top = source.model._default_manager.aggregate(top=Max('pk'))['top'] or 0
+    while True:
+        with transaction.atomic():
+            watermark = RollupWatermark.objects.select_for_update().get(source=name)
+            rows = list(
+                source.model._default_manager.filter(pk__gt=watermark.last_id).order_by('pk').values(
+                    'pk', source.date_field, *source.fields
+                )[:batch_size]
+            )
+            if not rows:
+                return processed
+            apply_rollup_deltas(name, row_buckets(source, rows))
+            last_id = rows[-1]['pk']
+            RollupGap.objects.bulk_create(
+                [RollupGap(source=name, row_id=pk)
+                 for pk in _gaps({row['pk'] for row in rows}, watermark.last_id, last_id, top)],
+                ignore_conflicts=True
+            )
+            watermark.last_id = last_id
+            watermark.save(update_fields=['last_id', 'updated_at'])
+        processed += len(rows)
+
+
+def backfill_rollups(names=None):
+    """Recompute the given (default: all) sources' rollups and watermarks from scratch."""
+    counted = {}
+    for name in names or ROLLUP_SOURCES:
+        source = ROLLUP_SOURCES[name]
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(source=name)
+            rows = source.model._default_manager.order_by('pk').values(
+                'pk', source.date_field, *source.fields
+            )
+            buckets = Counter()
+            recent_ids = set()
+            last_id = 0
+            for row in rows.iterator(chunk_size=ROLLUP_BATCH_SIZE):
+                buckets.update(row_buckets(source, [row]))
+                last_id = row['pk']
+                recent_ids.add(last_id)
+                if len(recent_ids) > 2 * GAP_WINDOW:
+                    recent_ids = {pk for pk in recent_ids if pk > last_id - GAP_WINDOW}
+            DailyRollup.objects.filter(source=name).delete()
+            DailyRollup.objects.bulk_create(
+                [DailyRollup(source=name, day=day, dimension=dimension, value=value, count=count)
+                 for (day, dimension, value), count in buckets.items()],
+                batch_size=DELTA_CHUNK_SIZE
+            )
+            RollupGap.objects.filter(source=name).delete()
+            RollupGap.objects.bulk_create(
+                [RollupGap(source=name, row_id=pk) for pk in _gaps(recent_ids, 0, last_id, last_id)]
+            )
+            watermark.last_id = last_id
+            watermark.save(update_fields=['last_id', 'updated_at'])
+        counted[name] = last_id
+    return counted
+
+
+def _counted(name, pk):
+    """Condition on a row id: at or below the watermark and not a gap."""
+    watermark = RollupWatermark.objects.filter(source=name).values('last_id')[:1]
+    return Q(**{'pk__lte': Subquery(watermark)}) & ~Exists(
+        RollupGap.objects.filter(source=name, row_id=pk)
+    )
+
+
+def counted_values(name, instance):
+    """
+    The stored values of an instance if the rollups have counted it, else
+    None. One query.
+    """
+    source = ROLLUP_SOURCES[name]
+    return source.model._default_manager.filter(
+        _counted(name, instance.pk), pk=instance.pk
+    ).values(source.date_field, *source.fields).first()
+
+
+def is_counted(name, pk):
+    """Whether the rollups have counted the row with this id."""
+    return RollupWatermark.objects.filter(source=name, last_id__gte=pk).exclude(
+        Exists(RollupGap.objects.filter(source=name, row_id=pk))
+    ).exists()
+
+
+def rollup_change(name, old, new):
+    """Apply the move of a counted row from `old` to `new` values (either may be None)."""
+    source = ROLLUP_SOURCES[name]
+    deltas = defaultdict(int)
+    for key, count in row_buckets(source, [new] if new else []).items():
+        deltas[key] += count
+    for key, count in row_buckets(source, [old] if old else []).items():
+        deltas[key] -= count
+    apply_rollup_deltas(name, deltas)
+
+
+class RollupBuffer(BufferedCounter):
+    """
+    Collects the names of sources that had rows inserted and runs
+    process_new_rows() for them from the flush thread only.
+    """
+    name = 'dashboard-rollups'
+    max_size_setting = 'DASHBOARD_ROLLUP_MAX_SIZE'
+    flush_interval_setting = 'DASHBOARD_ROLLUP_FLUSH_INTERVAL'
+    background_flush = True
+
+    def write(self, batch):
+        for name in batch:
+            process_new_rows(name)
+
+
+rollup_buffer = RollupBuffer()
@@ -0,0 +1,48 @@
+"""
+Signal handlers keeping the dashboard rollups current.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from .rollups import (
+    ROLLUP_SOURCES,
+    counted_values,
+    is_counted,
+    rollup_buffer,
+    rollup_change,
+    row_values,
+    source_for_model,
+)
+
+
+def rollup_pre_save(sender, instance, **kwargs):
+    """Remember the counted values of a row about to be updated."""
+    name, _ = source_for_model(sender)
+    instance._rollup_counted = None if instance._state.adding else counted_values(name, instance)
+
+
+def rollup_saved(sender, instance, created, **kwargs):
+    """Queue new rows for counting once they commit; move updated rows between dimension values."""
+    name, source = source_for_model(sender)
+    if created:
+        # Counted by the rollup buffer's flush thread, not on the request
+        transaction.on_commit(lambda: rollup_buffer.add(name))
+        return
+    old = getattr(instance, '_rollup_counted', None)
+    if old is not None:
+        instance._rollup_counted = None
+        rollup_change(name, old, row_values(source, instance))
+
+
+def rollup_deleted(sender, instance, **kwargs):
+    """Uncount deleted rows."""
+    name, source = source_for_model(sender)
+    if is_counted(name, instance.pk):
+        rollup_change(name, row_values(source, instance), None)
+
+
+for _name, _source in ROLLUP_SOURCES.items():
+    post_save.connect(rollup_saved, sender=_source.model, dispatch_uid=f'dashboard_{_name}_saved_rollup')
+    post_delete.connect(rollup_deleted, sender=_source.model, dispatch_uid=f'dashboard_{_name}_deleted_rollup')
+    if _source.fields:
+        # Sources without dimensions never move between rollup rows
+        pre_save.connect(rollup_pre_save, sender=_source.model, dispatch_uid=f'dashboard_{_name}_pre_save_rollup')
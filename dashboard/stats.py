@@ -0,0 +1,106 @@
+"""
+Aggregate queries behind the admin dashboard.
+
+Charts of enquiries, reviews, signups and posts come from the daily rollups
+(see rollups.py) rather than the source tables; the headline totals stay
+exact, one conditional-aggregate query per table.
+"""
+import calendar
+import datetime
+
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from apps.blog.models import BlogPost
+from apps.users.models import User
+from enquiries.models import Enquiry
+from offers.models import Offer
+from reviews.models import Review
+from .models import DailyRollup
+
+DEFAULT_CHART_MONTHS = 6
+MAX_CHART_MONTHS = 60
+
+
+def rollup_totals(sources):
+    """{(source, dimension, value): all-time count} for the given sources, in one query."""
+    rows = DailyRollup.objects.filter(source__in=sources).values(
+        'source', 'dimension', 'value'
+    ).order_by().annotate(total=Sum('count')).values_list('source', 'dimension', 'value', 'total')
+    return {(source, dimension, value): total for source, dimension, value, total in rows}
+
+
+def scalar_stats():
+    """Headline counts: one conditional-aggregate query per table."""
+    users = User.objects.aggregate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(is_active=True)),
+    )
+    enquiries = Enquiry.objects.aggregate(
+        total=Count('pk'),
+        new=Count('pk', filter=Q(status='new')),
+    )
+    reviews = Review.objects.aggregate(
+        total=Count('pk'),
+        approved=Count('pk', filter=Q(is_approved=True)),
+        avg_rating=Avg('rating', filter=Q(is_approved=True)),
+    )
+    offers = Offer.objects.aggregate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(status='active')),
+    )
+    posts = BlogPost.objects.filter(is_deleted=False).aggregate(
+        total=Count('pk'),
+        published=Count('pk', filter=Q(status='published')),
+    )
+    return {
+        'total_users': users['total'],
+        'active_users': users['active'],
+        'total_enquiries': enquiries['total'],
+        'new_enquiries': enquiries['new'],
+        'total_reviews': reviews['total'],
+        'approved_reviews': reviews['approved'],
+        'avg_rating': reviews['avg_rating'] or 0,
+        'total_offers': offers['total'],
+        'active_offers': offers['active'],
+        'total_posts': posts['total'],
+        'published_posts': posts['published'],
+    }
+
+
+def month_starts(months, now=None):
+    """First days of the last `months` local calendar months, oldest first."""
+    today = timezone.localdate(now)
+    year, month = today.year, today.month
+    starts = []
+    for _ in range(months):
+        starts.append(datetime.date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+def monthly_counts(source, months, now=None, dimension='', value=''):
+    """
+    [(label, count)] of a source's rows per calendar month over the last
+    `months` months (the total, or one dimension value), from one TruncMonth group-by
+    of its rollups; months without rows are 0.
+    """
+    starts = month_starts(months, now)
+    rows = DailyRollup.objects.filter(
+        source=source, dimension=dimension, value=value, day__gte=starts[0]
+    ).annotate(month=TruncMonth('day')).order_by().values('month').annotate(
+        total=Sum('count')
+    ).values_list('month', 'total')
+    counts = {(month.year, month.month): total for month, total in rows}
+    return [
+        (f'{calendar.month_abbr[start.month]} {start.year}', counts.get((start.year, start.month), 0))
+        for start in starts
+    ]
+
+
+def top_values(source, dimension, limit):
+    """[(value, count)] of a source's most common non-blank values of a dimension."""
+    rows = DailyRollup.objects.filter(source=source, dimension=dimension).exclude(value='').values(
+        'value'
+    ).order_by().annotate(total=Sum('count')).filter(total__gt=0).order_by('-total', 'value')
+    return list(rows.values_list('value', 'total')[:limit])
@@ -1,3 +1,177 @@
-from django.test import TestCase
-
-# Create your tests here.
+"""
+Tests for the dashboard app.
+"""
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.users.models import User
+from enquiries.models import Enquiry
+from .models import DailyRollup, RouteHits
+from .rollups import backfill_rollups, is_counted, process_new_rows, rollup_buffer
+from .stats import month_starts, monthly_counts, rollup_totals
+from .traffic import route_hits_buffer
+
+
+def create_enquiry(**fields):
+    return Enquiry.objects.create(
+        subject='Termites', customer_name='Asha', email='asha@example.com',
+        phone='123', service_type=fields.pop('service_type', 'termite'), message='Help', **fields
+    )
+
+
+class DashboardStatsTests(TestCase):
+    """
+    Monthly chart series and scalar stats.
+    """
+
+    def enquiry(self, created_at):
+        enquiry = create_enquiry()
+        Enquiry.objects.filter(pk=enquiry.pk).update(created_at=created_at)
+
+    def test_month_starts_are_calendar_months(self):
+        now = timezone.make_aware(datetime.datetime(2025, 3, 31, 12))
+        labels = [(start.year, start.month, start.day) for start in month_starts(4, now)]
+        self.assertEqual(labels, [(2024, 12, 1), (2025, 1, 1), (2025, 2, 1), (2025, 3, 1)])
+
+    def test_monthly_counts_zero_fill(self):
+        now = timezone.make_aware(datetime.datetime(2025, 3, 31, 12))
+        self.enquiry(timezone.make_aware(datetime.datetime(2025, 1, 31, 23, 30)))
+        self.enquiry(timezone.make_aware(datetime.datetime(2025, 3, 1, 0, 30)))
+        self.enquiry(timezone.make_aware(datetime.datetime(2025, 3, 15)))
+        self.enquiry(timezone.make_aware(datetime.datetime(2024, 11, 30)))
+        backfill_rollups(['enquiries'])
+        with self.assertNumQueries(1):
+            series = monthly_counts('enquiries', 4, now)
+        self.assertEqual(series, [('Dec 2024', 0), ('Jan 2025', 1), ('Feb 2025', 0), ('Mar 2025', 2)])
+
+    def test_query_count_independent_of_months(self):
+        create_enquiry()
+        process_new_rows('enquiries')
+        with self.assertNumQueries(11):
+            response = self.client.get('/api/v1/dashboard/stats/')
+        self.assertEqual(len(response.data['charts']['revenue']['data']), 6)
+        with self.assertNumQueries(11):
+            response = self.client.get('/api/v1/dashboard/stats/', {'months': 24})
+        self.assertEqual(response.data['charts']['revenue']['data'][-1], 500)
+        self.assertEqual(response.data['stats']['total_enquiries'], 1)
+        self.assertEqual(response.data['charts']['services']['labels'][0], 'Termite')
+        self.assertEqual(self.client.get('/api/v1/dashboard/stats/', {'months': 0}).status_code, 400)
+
+
+class RollupTests(TestCase):
+    """
+    Daily rollups follow inserts, updates and deletes of their sources.
+    """
+
+    def totals(self):
+        return {key: count for key, count in rollup_totals(['enquiries']).items() if count}
+
+    def create(self, **fields):
+        """Create an enquiry and run the background count its commit queues."""
+        with self.captureOnCommitCallbacks(execute=True):
+            enquiry = create_enquiry(**fields)
+        rollup_buffer.flush()
+        return enquiry
+
+    def test_incremental_updates_match_backfill(self):
+        first = self.create()
+        self.create(service_type='rodent', status='contacted')
+        first.status = 'completed'
+        first.service_type = 'rodent'
+        first.save()
+        self.create().delete()
+        # Inserted without signals: counted by the next watermark run
+        Enquiry.objects.bulk_create([
+            Enquiry(subject='Ants', customer_name='Ravi', email='ravi@example.com',
+                    phone='456', service_type='ants', message='Help')
+        ])
+        self.assertEqual(process_new_rows('enquiries'), 1)
+
+        incremental = self.totals()
+        self.assertEqual(incremental[('enquiries', '', '')], 3)
+        self.assertEqual(incremental[('enquiries', 'service_type', 'rodent')], 2)
+        self.assertEqual(incremental[('enquiries', 'status', 'completed')], 1)
+        self.assertNotIn(('enquiries', 'service_type', 'termite'), incremental)
+        backfill_rollups(['enquiries'])
+        self.assertEqual(self.totals(), incremental)
+
+    def test_late_commit_counted_once(self):
+        create_enquiry(pk=10)
+        create_enquiry(pk=12)
+        self.assertEqual(process_new_rows('enquiries'), 2)
+        # id 11 commits after 12 was counted: it is a gap, not a counted row
+        late = create_enquiry(pk=11, status='new')
+        self.assertFalse(is_counted('enquiries', 11))
+        late.status = 'completed'
+        late.save()
+        create_enquiry(pk=13).delete()
+        self.assertEqual(process_new_rows('enquiries'), 1)
+        self.assertTrue(is_counted('enquiries', 11))
+
+        incremental = self.totals()
+        self.assertEqual(incremental[('enquiries', '', '')], 3)
+        self.assertEqual(incremental[('enquiries', 'status', 'completed')], 1)
+        self.assertFalse(DailyRollup.objects.filter(count__lt=0).exists())
+        backfill_rollups(['enquiries'])
+        self.assertEqual(self.totals(), incremental)
+
+    def test_watermark_skips_counted_rows(self):
+        self.create()
+        self.assertEqual(process_new_rows('enquiries'), 0)
+        self.assertEqual(
+            DailyRollup.objects.get(source='enquiries', dimension='', day=timezone.localdate()).count, 1
+        )
+
+
+class TrafficTests(TestCase):
+    """
+    Requests are counted per route and day, written only by buffer flushes.
+    """
+
+    def setUp(self):
+        route_hits_buffer.flush()
+        RouteHits.objects.all().delete()
+
+    def test_requests_counted_per_route(self):
+        with self.assertNumQueries(11):
+            self.client.get('/api/v1/dashboard/stats/')
+        self.client.get('/api/v1/dashboard/stats/', {'months': 3})
+        self.client.get('/api/v1/home/')
+        self.client.get('/no-such-page/')
+        self.assertFalse(RouteHits.objects.exists())
+
+        route_hits_buffer.flush()
+        hits = dict(RouteHits.objects.values_list('route', 'hits'))
+        self.assertEqual(hits, {'dashboard_stats': 2, 'common:home': 1})
+        self.assertEqual(RouteHits.objects.get(route='dashboard_stats').day, timezone.localdate())
+
+        # Later flushes add to the same rows
+        self.client.get('/api/v1/dashboard/stats/')
+        route_hits_buffer.flush()
+        self.assertEqual(RouteHits.objects.get(route='dashboard_stats').hits, 3)
+
+    def test_traffic_chart_and_report(self):
+        today = timezone.localdate()
+        RouteHits.objects.bulk_create([
+            RouteHits(route='blog:post-list', day=today, hits=5),
+            RouteHits(route='common:home', day=today, hits=2),
+            RouteHits(route='blog:post-list', day=today - datetime.timedelta(days=3), hits=4),
+            RouteHits(route='blog:post-list', day=today - datetime.timedelta(days=30), hits=100),
+        ])
+        traffic = self.client.get('/api/v1/dashboard/stats/').data['charts']['traffic']
+        self.assertEqual(traffic['data'], [0, 0, 0, 4, 0, 0, 7])
+        self.assertEqual(len(traffic['labels']), 7)
+
+        admin = APIClient()
+        admin.force_authenticate(User.objects.create_user(
+            email='admin@example.com', username='admin', password='x', is_staff=True
+        ))
+        report = admin.get('/api/v1/dashboard/traffic/').data
+        self.assertEqual(report['total_hits'], 11)
+        self.assertEqual(report['routes'], [
+            {'route': 'blog:post-list', 'hits': 9}, {'route': 'common:home', 'hits': 2}
+        ])
+        self.assertEqual(admin.get('/api/v1/dashboard/traffic/', {'days': 31}).data['total_hits'], 111)
+        self.assertEqual(self.client.get('/api/v1/dashboard/traffic/').status_code, 401)
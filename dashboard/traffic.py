@@ -0,0 +1,86 @@
+"""
+Website traffic counted per route and day.
+
+RouteMetricsMiddleware adds one increment per resolved request to an
+in-process buffer keyed by (route name, local day). The buffer's flush
+thread writes batches to `RouteHits` every ROUTE_METRICS_FLUSH_INTERVAL
+seconds as `INSERT ... ON CONFLICT DO NOTHING` plus one `UPDATE ... SET
+hits = hits + CASE ... END` per day and chunk; a full buffer wakes the
+thread early. No request ever waits on a database write.
+"""
+import datetime
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from apps.common.buffers import BufferedCounter
+from apps.common.counters import increment_rows
+from .models import RouteHits
+
+# Route rows per UPDATE statement
+HITS_CHUNK_SIZE = 500
+
+
+def route_name(match):
+    """Stable name of a resolved route: its namespaced URL name, else its pattern."""
+    name = match.view_name if match.url_name else match.route or match.view_name
+    return name[:200]
+
+
+def add_route_hits(deltas):
+    """Add a {(route, day): hits} batch to the counters table, one increment_rows() pass per day."""
+    by_day = defaultdict(dict)
+    for (route, day), amount in deltas.items():
+        if amount:
+            by_day[day][(route,)] = amount
+
+    with transaction.atomic():
+        for day, amounts in by_day.items():
+            increment_rows(RouteHits, 'hits', amounts, ('route',), chunk_size=HITS_CHUNK_SIZE, day=day)
+
+
+class RouteHitsBuffer(BufferedCounter):
+    """
+    Collects request counts in process, keyed by (route, day), and writes
+    them from the flush thread only.
+    """
+    name = 'route-hits'
+    max_size_setting = 'ROUTE_METRICS_MAX_SIZE'
+    flush_interval_setting = 'ROUTE_METRICS_FLUSH_INTERVAL'
+    background_flush = True
+
+    def write(self, batch):
+        add_route_hits(batch)
+
+
+route_hits_buffer = RouteHitsBuffer()
+
+
+def record_hit(route):
+    """Count a request to the given route without writing on the request path."""
+    route_hits_buffer.add((route, timezone.localdate()))
+
+
+def daily_traffic(days, today=None):
+    """[(day, hits)] of every route over the last `days` days, oldest first; quiet days are 0."""
+    today = today or timezone.localdate()
+    start = today - datetime.timedelta(days=days - 1)
+    rows = RouteHits.objects.filter(day__gte=start, day__lte=today).values('day').order_by().annotate(
+        total=Sum('hits')
+    ).values_list('day', 'total')
+    totals = dict(rows)
+    return [
+        (start + datetime.timedelta(days=offset), totals.get(start + datetime.timedelta(days=offset), 0))
+        for offset in range(days)
+    ]
+
+
+def route_report(days, limit=None, today=None):
+    """[{'route', 'hits'}] over the last `days` days, busiest first."""
+    today = today or timezone.localdate()
+    start = today - datetime.timedelta(days=days - 1)
+    rows = RouteHits.objects.filter(day__gte=start, day__lte=today).values('route').order_by().annotate(
+        hits=Sum('hits')
+    ).order_by('-hits', 'route')
+    return list(rows[:limit] if limit else rows)
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import dashboard_stats
+from .views import dashboard_stats, traffic_report
 
 urlpatterns = [
     path('stats/', dashboard_stats, name='dashboard_stats'),
+    path('traffic/', traffic_report, name='dashboard_traffic'),
 ]
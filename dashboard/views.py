@@ -1,31 +1,35 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny  # Changed for testing - should be IsAdminUser in production
-from django.db.models import Count, Sum, Avg
-from django.utils import timezone
-from datetime import timedelta
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAdminUser  # Changed for testing - should be IsAdminUser in production
 import calendar
-from apps.blog.models import BlogPost
 from apps.users.models import User
 from enquiries.models import Enquiry
-from offers.models import Offer
 from reviews.models import Review
+from .stats import DEFAULT_CHART_MONTHS, MAX_CHART_MONTHS, monthly_counts, scalar_stats, top_values
+from .traffic import daily_traffic, route_report
+
+# Longest ?days= window of the traffic report
+MAX_TRAFFIC_DAYS = 366
 
 @api_view(['GET'])
 @permission_classes([AllowAny])  # TODO: Change to IsAdminUser in production
 def dashboard_stats(request):
+    """Dashboard stats, recent activity and charts; `?months=` sets the revenue chart range (default 6)."""
+
+    try:
+        months = int(request.GET.get('months', DEFAULT_CHART_MONTHS))
+    except (TypeError, ValueError):
+        months = 0
+    if not 1 <= months <= MAX_CHART_MONTHS:
+        return Response(
+            {'error': f'months must be an integer between 1 and {MAX_CHART_MONTHS}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
     # Basic stats
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-    total_enquiries = Enquiry.objects.count()
-    new_enquiries = Enquiry.objects.filter(status='new').count()
-    total_reviews = Review.objects.count()
-    approved_reviews = Review.objects.filter(is_approved=True).count()
-    total_offers = Offer.objects.count()
-    active_offers = Offer.objects.filter(status='active').count()
-    total_posts = BlogPost.objects.filter(is_deleted=False).count()
-    published_posts = BlogPost.objects.filter(status='published', is_deleted=False).count()
+    stats = scalar_stats()
+    active_offers = stats['active_offers']
 
     # Revenue calculation (using offer usage as proxy for revenue)
     # In a real app, this would come from actual transaction data
@@ -33,16 +37,13 @@ def dashboard_stats(request):
     revenue_change = 12.5  # This would be calculated from historical data
 
     # Customer satisfaction from approved reviews
-    avg_rating = Review.objects.filter(is_approved=True).aggregate(
-        avg_rating=Avg('rating')
-    )['avg_rating'] or 0
-    customer_satisfaction = round(avg_rating * 20, 1)  # Convert 5-star to percentage
+    customer_satisfaction = round(stats['avg_rating'] * 20, 1)  # Convert 5-star to percentage
 
     # Recent activities (last 10 activities)
     activities = []
 
     # Recent enquiries
-    recent_enquiries = Enquiry.objects.order_by('-created_at')[:3]
+    recent_enquiries = Enquiry.objects.only('customer_name', 'created_at').order_by('-created_at')[:3]
     for enquiry in recent_enquiries:
         activities.append({
             'action': f'New service request from {enquiry.customer_name}',
@@ -51,7 +52,7 @@ def dashboard_stats(request):
         })
 
     # Recent reviews
-    recent_reviews = Review.objects.order_by('-created_at')[:3]
+    recent_reviews = Review.objects.only('name', 'created_at').order_by('-created_at')[:3]
     for review in recent_reviews:
         activities.append({
             'action': f'New review from {review.name}',
@@ -60,7 +61,7 @@ def dashboard_stats(request):
         })
 
     # Recent users
-    recent_users = User.objects.order_by('-date_joined')[:2]
+    recent_users = User.objects.only('username', 'first_name', 'last_name', 'date_joined').order_by('-date_joined')[:2]
     for user in recent_users:
         activities.append({
             'action': f'New user registration: {user.get_full_name() if user.get_full_name() else user.username}',
@@ -72,44 +73,21 @@ def dashboard_stats(request):
     activities.sort(key=lambda x: x['time'], reverse=True)
     activities = activities[:5]
 
-    # Chart data - Revenue over last 6 months
-    now = timezone.now()
+    # Chart data - Revenue over the last `months` calendar months
+    # Count enquiries per month as proxy for revenue
     revenue_labels = []
     revenue_data = []
-
-    for i in range(5, -1, -1):
-        month_date = now - timedelta(days=30*i)
-        month_name = calendar.month_abbr[month_date.month]
-        year = month_date.year
-        label = f"{month_name} {year}"
-
-        # Count enquiries in this month as proxy for revenue
-        month_start = month_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if i == 0:
-            month_end = now
-        else:
-            next_month = month_date.replace(day=28, hour=23, minute=59, second=59, microsecond=999999) + timedelta(days=4)
-            month_end = next_month.replace(day=1) - timedelta(days=1)
-
-        month_enquiries = Enquiry.objects.filter(
-            created_at__gte=month_start,
-            created_at__lte=month_end
-        ).count()
-
+    for label, month_enquiries in monthly_counts('enquiries', months):
         revenue_labels.append(label)
         revenue_data.append(month_enquiries * 500)  # Mock revenue calculation
 
     # Services distribution
-    service_counts = Enquiry.objects.values('service_type').annotate(
-        count=Count('service_type')
-    ).order_by('-count')[:4]
-
     services_labels = []
     services_data = []
 
-    for service in service_counts:
-        services_labels.append(service['service_type'].title())
-        services_data.append(service['count'])
+    for service_type, count in top_values('enquiries', 'service_type', 4):
+        services_labels.append(service_type.title())
+        services_data.append(count)
 
     # Fill with defaults if not enough data
     default_services = ['Pest Control', 'Termite', 'Rodent', 'Inspection']
@@ -123,21 +101,24 @@ def dashboard_stats(request):
                 if len(services_labels) >= 4:
                     break
 
-    # Website traffic (mock data for now - would come from analytics)
-    traffic_labels = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    traffic_data = [120, 190, 300, 500, 200, 300, 450]
+    # Website traffic - requests per day over the last week
+    traffic_labels = []
+    traffic_data = []
+    for day, hits in daily_traffic(7):
+        traffic_labels.append(calendar.day_abbr[day.weekday()])
+        traffic_data.append(hits)
 
     return Response({
         'stats': {
             'total_revenue': total_revenue,
             'revenue_change': revenue_change,
-            'active_users': active_users,
-            'total_enquiries': total_enquiries,
-            'new_enquiries': new_enquiries,
+            'active_users': stats['active_users'],
+            'total_enquiries': stats['total_enquiries'],
+            'new_enquiries': stats['new_enquiries'],
             'customer_satisfaction': customer_satisfaction,
-            'total_reviews': total_reviews,
-            'total_offers': total_offers,
-            'total_posts': total_posts
+            'total_reviews': stats['total_reviews'],
+            'total_offers': stats['total_offers'],
+            'total_posts': stats['total_posts']
         },
         'recent_activities': activities,
         'charts': {
@@ -155,3 +136,25 @@ def dashboard_stats(request):
             }
         }
     })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def traffic_report(request):
+    """Requests per route over the last `?days=` days (default 7), busiest first."""
+    try:
+        days = int(request.GET.get('days', 7))
+    except (TypeError, ValueError):
+        days = 0
+    if not 1 <= days <= MAX_TRAFFIC_DAYS:
+        return Response(
+            {'error': f'days must be an integer between 1 and {MAX_TRAFFIC_DAYS}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    routes = route_report(days)
+    return Response({
+        'days': days,
+        'total_hits': sum(route['hits'] for route in routes),
+        'routes': routes,
+        'daily': [{'day': day, 'hits': hits} for day, hits in daily_traffic(days)],
+    })
@@ -4,10 +4,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from apps.common.mixins import ProjectionMixin
 from .models import Enquiry
 from .serializers import EnquirySerializer
 
-class EnquiryViewSet(viewsets.ModelViewSet):
+class EnquiryViewSet(ProjectionMixin, viewsets.ModelViewSet):
     queryset = Enquiry.objects.all()
     serializer_class = EnquirySerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
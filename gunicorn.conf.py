@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for pestozap_backend.
+
+Loaded automatically when gunicorn is started from the project root
+(see Procfile and Dockerfile).
+"""
+import os
+
+
+def on_starting(server):
+    """Refuse to run several workers on a process-local cache (see the common.E001 check)."""
+    if server.cfg.workers <= 1:
+        return
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pestozap_backend.settings')
+    from apps.common.cache import cache_is_process_local
+    if cache_is_process_local():
+        raise RuntimeError(
+            f'{server.cfg.workers} workers cannot share a process-local cache: set REDIS_URL '
+            'so change stamps and cached responses are shared between them.'
+        )
+
+
+def worker_exit(server, worker):
+    """Flush write-behind buffers (e.g. blog view counts) before a worker exits."""
+    from apps.common.buffers import flush_all
+    flush_all()
+
+
+def post_worker_init(worker):
+    """Fill the materialized blog lists so the first requests after a deploy hit the cache."""
+    from apps.blog.materialized import warm_lists
+    try:
+        warm_lists()
+    except Exception:
+        worker.log.exception('Warming the blog post lists failed')
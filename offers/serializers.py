@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from apps.common.serializers import DynamicFieldsMixin
 from .models import Offer
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Offer
         fields = '__all__'
@@ -1,10 +1,13 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from apps.common.mixins import CachedResponseMixin, ProjectionMixin
 from .models import Offer
 from .serializers import OfferSerializer
 
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(CachedResponseMixin, ProjectionMixin, viewsets.ModelViewSet):
     serializer_class = OfferSerializer
+    change_stamp_models = (Offer,)
+    cache_actions = ('list',)
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get_queryset(self):
@@ -58,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'dashboard.middleware.RouteMetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'pestozap_backend.urls'
@@ -132,6 +133,34 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache: Redis when REDIS_URL is set (shared by all workers, required in
+# production for response caching and change stamps), local memory otherwise
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'pestozap',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Anonymous GET responses of public list endpoints are cached for this many
+# seconds; writes to the models they render invalidate them immediately. An
+# expired response is still served for RESPONSE_CACHE_STALE_TIMEOUT seconds
+# while a single request re-renders it.
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int)
+RESPONSE_CACHE_STALE_TIMEOUT = config('RESPONSE_CACHE_STALE_TIMEOUT', default=30, cast=int)
+
+# Test runner: write-behind buffers only write on explicit flush() in tests
+TEST_RUNNER = 'apps.common.test_runner.ProjectTestRunner'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -155,6 +184,84 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Blog view counting: views are buffered per worker and flushed in batches by
+# a background thread every BLOG_VIEW_BUFFER_FLUSH_INTERVAL seconds, or sooner
+# once BLOG_VIEW_BUFFER_MAX_SIZE (post, day, visitor) keys are pending.
+BLOG_VIEW_BUFFER_FLUSH_INTERVAL = config('BLOG_VIEW_BUFFER_FLUSH_INTERVAL', default=10, cast=float)
+BLOG_VIEW_BUFFER_MAX_SIZE = config('BLOG_VIEW_BUFFER_MAX_SIZE', default=500, cast=int)
+
+# Blog likes: rows in blog_likes are written immediately; likes_count deltas
+# are buffered the same way as views. `reconcile_blog_likes` repairs drift.
+BLOG_LIKE_BUFFER_FLUSH_INTERVAL = config('BLOG_LIKE_BUFFER_FLUSH_INTERVAL', default=5, cast=float)
+BLOG_LIKE_BUFFER_MAX_SIZE = config('BLOG_LIKE_BUFFER_MAX_SIZE', default=500, cast=int)
+
+# Blog comment threads: reply levels and replies per comment inlined in
+# comment listings; the rest are paginated via .../comments/<id>/replies/
+BLOG_COMMENT_MAX_DEPTH = config('BLOG_COMMENT_MAX_DEPTH', default=3, cast=int)
+BLOG_COMMENT_MAX_REPLIES = config('BLOG_COMMENT_MAX_REPLIES', default=10, cast=int)
+
+# Blog slug resolution: slug -> post id/status lookups are cached per process
+# (BLOG_SLUG_CACHE_SIZE entries for BLOG_SLUG_CACHE_LOCAL_TTL seconds) and in
+# the shared cache for BLOG_SLUG_CACHE_TIMEOUT seconds
+BLOG_SLUG_CACHE_SIZE = config('BLOG_SLUG_CACHE_SIZE', default=1024, cast=int)
+BLOG_SLUG_CACHE_LOCAL_TTL = config('BLOG_SLUG_CACHE_LOCAL_TTL', default=5, cast=float)
+BLOG_SLUG_CACHE_TIMEOUT = config('BLOG_SLUG_CACHE_TIMEOUT', default=300, cast=int)
+
+# Public blog statistics are cached for this many seconds and dropped early
+# whenever a post, category, tag or comment changes
+BLOG_STATS_CACHE_TIMEOUT = config('BLOG_STATS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Featured/latest post lists are materialized in the cache (ids plus cards)
+# and recomputed when posts enter or leave them; BLOG_LIST_CACHE_TIMEOUT
+# only bounds how long an unused list is kept
+BLOG_LIST_LIMITS = {
+    'featured': config('BLOG_FEATURED_LIST_LIMIT', default=6, cast=int),
+    'latest': config('BLOG_LATEST_LIST_LIMIT', default=6, cast=int),
+}
+BLOG_LIST_CACHE_TIMEOUT = config('BLOG_LIST_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Trending posts: buffered views are also written to daily buckets, kept for
+# BLOG_VIEW_BUCKET_RETENTION_DAYS (see prune_blog_view_buckets). Posts are
+# ranked by the last BLOG_TRENDING_WINDOW_DAYS of buckets, each day's views
+# counting half as much every BLOG_TRENDING_HALF_LIFE_DAYS
+BLOG_VIEW_BUCKET_RETENTION_DAYS = config('BLOG_VIEW_BUCKET_RETENTION_DAYS', default=90, cast=int)
+BLOG_TRENDING_WINDOW_DAYS = config('BLOG_TRENDING_WINDOW_DAYS', default=14, cast=int)
+BLOG_TRENDING_HALF_LIFE_DAYS = config('BLOG_TRENDING_HALF_LIFE_DAYS', default=2, cast=float)
+BLOG_TRENDING_LIMIT = config('BLOG_TRENDING_LIMIT', default=10, cast=int)
+BLOG_TRENDING_CACHE_TIMEOUT = config('BLOG_TRENDING_CACHE_TIMEOUT', default=300, cast=int)
+
+# Homepage aggregate (/api/v1/home/): items per section, and how long the
+# rendered sections are kept; a section is re-rendered as soon as a model it
+# shows changes
+HOME_SECTION_LIMITS = {
+    'featured_posts': config('HOME_FEATURED_POSTS_LIMIT', default=6, cast=int),
+    'categories': config('HOME_CATEGORIES_LIMIT', default=12, cast=int),
+    'reviews': config('HOME_REVIEWS_LIMIT', default=6, cast=int),
+    'offers': config('HOME_OFFERS_LIMIT', default=4, cast=int),
+    'jobs': config('HOME_JOBS_LIMIT', default=5, cast=int),
+}
+HOME_CACHE_TIMEOUT = config('HOME_CACHE_TIMEOUT', default=300, cast=int)
+
+# Admin dashboard counts: default "recent" window in days (?days= overrides)
+# and how long each window's counts are cached; writes start a fresh entry
+DASHBOARD_RECENT_DAYS = config('DASHBOARD_RECENT_DAYS', default=30, cast=int)
+DASHBOARD_STATS_CACHE_TIMEOUT = config('DASHBOARD_STATS_CACHE_TIMEOUT', default=60, cast=int)
+
+# Dashboard rollups: sources with new rows are counted by a background thread
+# every DASHBOARD_ROLLUP_FLUSH_INTERVAL seconds
+DASHBOARD_ROLLUP_FLUSH_INTERVAL = config('DASHBOARD_ROLLUP_FLUSH_INTERVAL', default=10, cast=float)
+DASHBOARD_ROLLUP_MAX_SIZE = config('DASHBOARD_ROLLUP_MAX_SIZE', default=10, cast=int)
+
+# Website traffic: requests are counted per route and day in memory and
+# written by a background thread every ROUTE_METRICS_FLUSH_INTERVAL seconds,
+# or sooner once ROUTE_METRICS_MAX_SIZE route/day pairs are pending
+ROUTE_METRICS_FLUSH_INTERVAL = config('ROUTE_METRICS_FLUSH_INTERVAL', default=10, cast=float)
+ROUTE_METRICS_MAX_SIZE = config('ROUTE_METRICS_MAX_SIZE', default=500, cast=int)
+
+# Reverse proxies in front of the app that append to X-Forwarded-For; the
+# header is ignored (client address = REMOTE_ADDR) while this is 0
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', default=0, cast=int)
+
 # JWT Configuration
 from datetime import timedelta
 
@@ -35,6 +35,7 @@ urlpatterns = [
     path('api/v1/', include([
         path('auth/', include('djoser.urls')),
         path('auth/', include('djoser.urls.jwt')),
+        path('home/', include('apps.common.urls')),
         path('users/', include('apps.users.urls')),
         path('blog/', include('apps.blog.urls')),
         path('admin/', include('apps.blog.admin_urls')),
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from apps.common.serializers import DynamicFieldsMixin
 from .models import Review
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = '__all__'
@@ -6,11 +6,14 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Avg
+from apps.common.mixins import CachedResponseMixin, ProjectionMixin
 from .models import Review
 from .serializers import ReviewSerializer
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CachedResponseMixin, ProjectionMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
+    change_stamp_models = (Review,)
+    cache_actions = ('list',)
     serializer_class = ReviewSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['rating', 'is_approved']